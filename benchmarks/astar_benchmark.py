@@ -0,0 +1,137 @@
+# benchmarks/astar_benchmark.py
+#
+# Compares the original A* (no closed set, string ids) with the reworked engine.
+# Run from the repository root:
+#   python -m benchmarks.astar_benchmark --sizes 1000 5000 10000 50000
+
+import argparse
+import heapq
+import json
+import math
+import random
+import time
+import numpy as np
+from src.algorithms.astar import AStar
+from src.utils.csr_graph import CSRGraph
+from src.utils.graph import Graph
+from src.utils.graph_builder import ImplicitCompleteGraph
+
+
+def legacy_find_path(graph, positions, start, goal):
+    """
+    The A* implementation before the rework, kept as the baseline.
+    """
+    def heuristic(a, b):
+        return graph.euclidean_distance(positions[a], positions[b])
+
+    open_set = [(0, start)]
+    came_from = {}
+    g_score = {start: 0}
+    f_score = {start: heuristic(start, goal)}
+
+    while open_set:
+        _, current = heapq.heappop(open_set)
+        if current == goal:
+            return g_score[current]
+        for neighbor, cost in graph.get_neighbors(current):
+            tentative_g = g_score[current] + cost
+            if neighbor not in g_score or tentative_g < g_score[neighbor]:
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g
+                f_score[neighbor] = tentative_g + heuristic(neighbor, goal)
+                heapq.heappush(open_set, (f_score[neighbor], neighbor))
+    return float('inf')
+
+
+def grid_graphs(size: int, rng: random.Random):
+    """
+    Builds a side x side 4-connected grid with jittered coordinates, as both a Graph and a CSRGraph.
+    """
+    side = max(2, int(round(math.sqrt(size))))
+    positions = {}
+    for r in range(side):
+        for c in range(side):
+            positions[f"N{r}_{c}"] = (c + rng.uniform(-0.2, 0.2), r + rng.uniform(-0.2, 0.2))
+
+    graph = Graph()
+    for node_id in positions:
+        graph.add_node(node_id)
+    node_ids = list(positions)
+    index = {node_id: i for i, node_id in enumerate(node_ids)}
+    sources, targets, costs = [], [], []
+    for r in range(side):
+        for c in range(side):
+            for dr, dc in ((0, 1), (1, 0)):
+                if r + dr < side and c + dc < side:
+                    a, b = f"N{r}_{c}", f"N{r + dr}_{c + dc}"
+                    cost = graph.euclidean_distance(positions[a], positions[b])
+                    graph.add_edge(a, b, cost)
+                    sources.append(index[a])
+                    targets.append(index[b])
+                    costs.append(cost)
+    csr = CSRGraph.from_edges(node_ids, sources, targets, costs, np.array([positions[n] for n in node_ids]))
+    return positions, graph, csr
+
+
+def complete_graph(size: int, rng: random.Random):
+    """
+    Builds an implicit complete graph over random points (explicit storage would not fit at 50k nodes).
+    """
+    positions = {f"N{i}": (rng.uniform(0, 10000), rng.uniform(0, 10000)) for i in range(size)}
+    graph = ImplicitCompleteGraph(positions)
+    return positions, graph, graph
+
+
+def time_queries(find, queries):
+    """
+    Runs all queries and returns (total seconds, costs).
+    """
+    start = time.perf_counter()
+    costs = [find(s, t) for s, t in queries]
+    return time.perf_counter() - start, costs
+
+
+def run(sizes, query_count, seed, include_legacy=True):
+    results = []
+    for kind, builder in (("grid", grid_graphs), ("complete", complete_graph)):
+        for size in sizes:
+            rng = random.Random(seed)
+            positions, legacy_graph, graph = builder(size, rng)
+            node_ids = list(positions)
+            queries = [(rng.choice(node_ids), rng.choice(node_ids)) for _ in range(query_count)]
+
+            row = {"graph": kind, "nodes": len(node_ids), "queries": query_count}
+            engine = AStar(graph, positions, cache_size=0)
+            engine.refresh()
+            row["astar_sec"], costs = time_queries(lambda s, t: engine.search(s, t, bidirectional=False)[0], queries)
+            row["bidirectional_sec"], bi_costs = time_queries(lambda s, t: engine.search(s, t, bidirectional=True)[0], queries)
+            assert all(math.isclose(a, b, rel_tol=1e-9) for a, b in zip(costs, bi_costs))
+
+            if include_legacy:
+                row["legacy_sec"], legacy_costs = time_queries(
+                    lambda s, t: legacy_find_path(legacy_graph, positions, s, t), queries)
+                assert all(math.isclose(a, b, rel_tol=1e-9) for a, b in zip(costs, legacy_costs))
+                row["speedup"] = row["legacy_sec"] / max(min(row["astar_sec"], row["bidirectional_sec"]), 1e-12)
+
+            results.append(row)
+            print(" | ".join(f"{k}={v:.4f}" if isinstance(v, float) else f"{k}={v}" for k, v in row.items()))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="A* benchmark on grid and complete graphs")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 10000, 50000])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-legacy", action="store_true", help="Skip the (slow) original implementation")
+    parser.add_argument("--json", help="Optional path to write results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.queries, args.seed, include_legacy=not args.no_legacy)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# benchmarks/scenario_benchmark.py
+#
+# Scaling benchmark on seeded synthetic scenarios (see generate_random_scenario).
+# Measures wall time, peak traced memory and solution quality of the hot paths
+# and writes JSON that can be compared between commits. Run from the repository root:
+#   python -m benchmarks.scenario_benchmark --scales 5x50 20x500 50x2000 --json after.json
+#   python -m benchmarks.scenario_benchmark --compare before.json after.json
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+import numpy as np
+from src.algorithms.assignment import AssignmentSolver
+from src.algorithms.astar import AStar
+from src.algorithms.csp import CSP
+from src.algorithms.genetic import GeneticOptimizer
+from src.utils.generator import generate_random_scenario
+from src.utils.graph_builder import ImplicitCompleteGraph, build_positions, build_visibility_graph
+
+
+def measure(func, memory=True):
+    """
+    Calls func() and returns (result, wall seconds, peak traced MB or None).
+    Memory is traced in a second call so tracing does not distort the timing.
+    """
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1] / 1e6
+        finally:
+            tracemalloc.stop()
+    return result, seconds, peak
+
+
+def record(rows, scale, name, seconds, peak, **extra):
+    row = {"scale": scale, "benchmark": name, "sec": seconds, "peak_mb": peak, **extra}
+    rows.append(row)
+    print(" | ".join(f"{k}={v:.4f}" if isinstance(v, float) else f"{k}={v}" for k, v in row.items()))
+
+
+def run_scale(n_drones, n_deliveries, n_zones, seed, queries, generations, population_size, memory=True):
+    """
+    Runs every benchmark on one scenario size and returns the result rows.
+    """
+    scale = f"{n_drones}x{n_deliveries}"
+    rows = []
+    drones, deliveries, noflyzones = generate_random_scenario(n_drones, n_deliveries, n_zones, seed=seed)
+    current_time = 60
+
+    # Graph construction
+    positions, seconds, peak = measure(lambda: build_positions(drones, deliveries), memory)
+    graph, seconds, peak = measure(lambda: ImplicitCompleteGraph(positions), memory)
+    record(rows, scale, "graph_complete", seconds, peak, nodes=len(positions))
+    sparse, seconds, peak = measure(
+        lambda: build_visibility_graph(positions, k=8, noflyzones=noflyzones, current_time=current_time), memory)
+    record(rows, scale, "graph_visibility_k8", seconds, peak, nodes=len(positions))
+
+    # A* point-to-point queries on the sparse graph (on the complete graph every path is one edge)
+    rng = random.Random(seed)
+    drone_ids = [f"DR{drone.id}" for drone in drones]
+    delivery_ids = [f"D{delivery.id + 80}" for delivery in deliveries]
+    pairs = [(rng.choice(drone_ids), rng.choice(delivery_ids)) for _ in range(queries)]
+
+    def astar_queries():
+        astar = AStar(sparse, positions, cache_size=0)
+        return [astar.find_path(start, goal)[0] for start, goal in pairs]
+
+    costs, seconds, peak = measure(astar_queries, memory)
+    reachable = [cost for cost in costs if cost != float("inf")]
+    record(rows, scale, "astar_find_path", seconds, peak, queries=queries,
+           reachable=len(reachable), mean_cost=float(np.mean(reachable)) if reachable else None)
+
+    # CSP: scalar checks of every pair against the bulk matrix
+    csp = CSP(drones, deliveries, noflyzones)
+
+    def scalar_checks():
+        return sum(csp.is_delivery_valid(drone, delivery, current_time) for drone in drones for delivery in deliveries)
+
+    feasible_count, seconds, peak = measure(scalar_checks, memory)
+    record(rows, scale, "csp_is_delivery_valid", seconds, peak, pairs=n_drones * n_deliveries, feasible=int(feasible_count))
+    matrix, seconds, peak = measure(lambda: csp.feasibility_matrix(drones, deliveries, current_time)[0], memory)
+    record(rows, scale, "csp_feasibility_matrix", seconds, peak, pairs=n_drones * n_deliveries, feasible=int(matrix.sum()))
+
+    def pruned_checks():
+        pair_rows, pair_cols = csp.candidate_pairs(drones, deliveries)
+        return int(csp.feasibility_pairs(drones, deliveries, pair_rows, pair_cols, current_time)[0].sum()), len(pair_rows)
+
+    (feasible_count, candidates), seconds, peak = measure(pruned_checks, memory)
+    record(rows, scale, "csp_candidate_pairs", seconds, peak, pairs=candidates, feasible=feasible_count)
+
+    # Optimality baseline for the GA's solution quality
+    solver = AssignmentSolver(drones, deliveries, noflyzones, graph, positions, current_time, method="hungarian")
+    optimum_solution, seconds, peak = measure(solver.run, memory)
+    optimum = solver.table.fitness(optimum_solution)
+    record(rows, scale, "assignment_hungarian", seconds, peak, fitness=optimum)
+
+    for engine in GeneticOptimizer.engines:
+        def ga_run():
+            optimizer = GeneticOptimizer(drones, deliveries, noflyzones, graph, positions, current_time,
+                                         engine=engine, seed=seed)
+            solution = optimizer.run(generations, population_size)
+            return optimizer.table.fitness(solution)
+
+        fitness, seconds, peak = measure(ga_run, memory)
+        # A ratio of a non-positive (net-loss or infeasible) result to the optimum says nothing, report None
+        record(rows, scale, f"ga_{engine}", seconds, peak, generations=generations, population=population_size,
+               fitness=fitness, optimality=fitness / optimum if optimum > 0 and fitness > 0 else None)
+    return rows
+
+
+def metadata(args) -> dict:
+    """
+    Identifies the run (commit, versions, parameters) so result files can be compared.
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "seed": args.seed,
+        "scales": args.scales,
+        "zones": args.zones,
+        "queries": args.queries,
+        "generations": args.generations,
+        "population": args.population,
+    }
+
+
+def compare(before_path: str, after_path: str):
+    """
+    Prints time, memory and quality ratios (after / before) per scale and benchmark.
+    """
+    with open(before_path, "r", encoding="utf-8") as f:
+        before = json.load(f)
+    with open(after_path, "r", encoding="utf-8") as f:
+        after = json.load(f)
+    old_rows = {(row["scale"], row["benchmark"]): row for row in before["results"]}
+    print(f"{before['meta'].get('commit')} → {after['meta'].get('commit')}")
+    for row in after["results"]:
+        old = old_rows.get((row["scale"], row["benchmark"]))
+        if old is None:
+            continue
+        parts = [f"{row['scale']:>10} {row['benchmark']:<24}", f"time x{row['sec'] / max(old['sec'], 1e-12):.2f}"]
+        if row.get("peak_mb") is not None and old.get("peak_mb"):
+            parts.append(f"memory x{row['peak_mb'] / old['peak_mb']:.2f}")
+        if row.get("fitness") is not None and old.get("fitness") is not None:
+            parts.append(f"fitness {old['fitness']:.2f} → {row['fitness']:.2f}")
+        print(" | ".join(parts))
+
+
+def parse_scale(text: str) -> tuple:
+    drones, deliveries = text.lower().split("x")
+    return int(drones), int(deliveries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling benchmark on synthetic scenarios")
+    parser.add_argument("--scales", nargs="+", default=["5x50", "20x500", "50x2000"],
+                        help="Scenario sizes as <drones>x<deliveries>")
+    parser.add_argument("--zones", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--generations", type=int, default=30)
+    parser.add_argument("--population", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the traced second run of each benchmark")
+    parser.add_argument("--json", help="Optional path to write results as JSON")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="Compare two result files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    results = []
+    for text in args.scales:
+        n_drones, n_deliveries = parse_scale(text)
+        results += run_scale(n_drones, n_deliveries, args.zones, args.seed, args.queries,
+                             args.generations, args.population, memory=not args.no_memory)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"meta": metadata(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
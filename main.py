@@ -1,14 +1,23 @@
+import os
 import time
 from src.utils.generator import (
     generate_drones_from_file,
     generate_deliveries_from_file,
     generate_noflyzones_from_file
 )
-from src.utils.graph import Graph
+from src.utils.graph_builder import ImplicitCompleteGraph, build_positions
+from src.utils.csr_graph import CSRGraph
 from src.algorithms.genetic import GeneticOptimizer
-from src.utils.visualizer import plot_delivery_routes
+from src.algorithms.rolling import RollingHorizonPlanner
+from src.utils.visualizer import plot_delivery_routes, plot_slots
 from src.algorithms.astar import AStar
 
+# Optional directory holding a prebuilt CSRGraph (see CSRGraph.save), memory-mapped instead of building the graph
+GRAPH_CACHE_DIR = None
+
+# Plan the whole day in time slots (RollingHorizonPlanner) instead of a single current_time
+ROLLING_HORIZON = False
+
 
 def main():
     # 1. Load data
@@ -17,33 +26,32 @@ def main():
     noflyzones = generate_noflyzones_from_file()
 
     # 2. Prepare position map (ID -> (x, y))
-    positions = {f"DR{drone.id}": drone.start_pos for drone in drones}
-    positions.update({f"D{delivery.id + 80}": delivery.pos for delivery in deliveries})
+    positions = build_positions(drones, deliveries)
 
-    # 3. Build graph
-    graph = Graph()
-    for node_id in positions:
-        graph.add_node(node_id)
-    for i in positions:
-        for j in positions:
-            if i != j:
-                cost = graph.euclidean_distance(positions[i], positions[j])
-                graph.add_edge(i, j, cost)
+    # 3. Build graph (complete graph, edges computed on demand from positions)
+    if GRAPH_CACHE_DIR and os.path.isdir(GRAPH_CACHE_DIR):
+        graph = CSRGraph.load(GRAPH_CACHE_DIR)
+        positions = {**graph.positions(), **positions}
+    else:
+        graph = ImplicitCompleteGraph(positions)
 
     # 4. Genetic Algorithm
-    optimizer = GeneticOptimizer(
-        drones=drones,
-        deliveries=deliveries,
-        noflyzones=noflyzones,
-        graph=graph,
-        positions=positions,
-        current_time="00:30",
-        verbose=True
-    )
-
     print("\n⏱ Running Genetic Algorithm...")
     start_ga = time.time()
-    raw_solution = optimizer.run()
+    if ROLLING_HORIZON:
+        planner = RollingHorizonPlanner(drones, deliveries, noflyzones, verbose=True)
+        raw_solution = planner.run()
+    else:
+        optimizer = GeneticOptimizer(
+            drones=drones,
+            deliveries=deliveries,
+            noflyzones=noflyzones,
+            graph=graph,
+            positions=positions,
+            current_time="00:30",
+            verbose=True
+        )
+        raw_solution = optimizer.run()
     end_ga = time.time()
     print(f"✅ Genetic Algorithm runtime: {end_ga - start_ga:.4f} sec")
 
@@ -72,7 +80,10 @@ def main():
         for drone_id, delivery_id in best_solution:
             print(f"  {drone_id} → {delivery_id}")
 
-    # 8. Visualize
+    # 8. Visualize (without a display the map is saved under visualization/)
+    if ROLLING_HORIZON:
+        plot_slots(drones, deliveries, positions, planner.slots, noflyzones=noflyzones)
+        return
     plot_delivery_routes(
         drones=drones,
         deliveries=deliveries,
@@ -0,0 +1,290 @@
+# run_batch.py
+#
+# Headless batch runner: runs the load → graph → optimize pipeline for many
+# scenarios on a process pool and appends the results to a JSON Lines or SQLite
+# store. Scenarios whose inputs and settings hash to a result already in the
+# store are skipped. Examples:
+#   python run_batch.py scenarios/ --store results.jsonl --workers 8
+#   python run_batch.py manifest.jsonl --store results.sqlite --method assignment
+#
+# A scenario directory holds drones, deliveries and noflyzones files (.json or
+# .jsonl), like data/. SOURCE is either one such directory, a directory of them,
+# or a manifest (.json list or .jsonl) of entries such as
+#   {"name": "rush", "dir": "scenarios/rush", "current_time": "08:30", "engine": "numpy"}
+#   {"name": "big", "generate": {"n_drones": 50, "n_deliveries": 2000, "n_zones": 10, "seed": 1}}
+# Entry keys override the command-line defaults (method, engine, current_time,
+# generations, population, seed).
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sqlite3
+import time
+from src.algorithms.assignment import AssignmentSolver
+from src.algorithms.genetic import GeneticOptimizer
+from src.algorithms.rolling import RollingHorizonPlanner
+from src.utils.generator import generate_random_scenario
+from src.utils.graph_builder import ImplicitCompleteGraph, build_positions
+from src.utils.loader import iter_json_records, load_deliveries, load_drones, load_noflyzones
+from src.utils.timeutils import to_minutes
+
+INPUTS = ("drones", "deliveries", "noflyzones")
+METHODS = ("ga", "assignment", "rolling")
+SETTINGS = ("method", "engine", "current_time", "generations", "population", "seed")
+# Settings each method actually reads; only these go into the content hash
+METHOD_SETTINGS = {
+    "assignment": ("method", "current_time"),
+    "ga": ("method", "engine", "current_time", "generations", "population", "seed"),
+    "rolling": ("method", "engine", "generations", "population", "seed"),
+}
+
+
+def input_files(directory: str) -> dict:
+    """
+    Returns {"drones": path, ...} for a scenario directory, or None if a file is missing.
+    """
+    files = {}
+    for name in INPUTS:
+        for extension in (".json", ".jsonl"):
+            path = os.path.join(directory, name + extension)
+            if os.path.isfile(path):
+                files[name] = path
+                break
+        else:
+            return None
+    return files
+
+
+def discover(source: str, defaults: dict) -> list:
+    """
+    Expands SOURCE (scenario directory, directory of scenario directories, or manifest)
+    into scenario dicts with a name, inputs (files or generate parameters) and settings.
+    """
+    if os.path.isdir(source):
+        files = input_files(source)
+        if files is not None:
+            entries = [{"name": os.path.basename(os.path.normpath(source)), "files": files}]
+        else:
+            entries = []
+            for name in sorted(os.listdir(source)):
+                files = input_files(os.path.join(source, name))
+                if files is not None:
+                    entries.append({"name": name, "files": files})
+    else:
+        base = os.path.dirname(os.path.abspath(source))
+        entries = []
+        for k, entry in enumerate(iter_json_records(source)):
+            entry = dict(entry)
+            if "dir" in entry:
+                directory = os.path.join(base, entry.pop("dir"))
+                entry["files"] = input_files(directory)
+                if entry["files"] is None:
+                    raise FileNotFoundError(f"Scenario directory {directory} is missing one of {INPUTS}")
+            elif "generate" not in entry:
+                entry["files"] = {name: os.path.join(base, entry.pop(name)) for name in INPUTS}
+            entry.setdefault("name", f"scenario-{k}")
+            entries.append(entry)
+
+    scenarios = []
+    for entry in entries:
+        scenario = {key: entry.get(key, defaults[key]) for key in SETTINGS}
+        scenario["name"] = entry["name"]
+        scenario["files"] = entry.get("files")
+        scenario["generate"] = entry.get("generate")
+        if scenario["method"] not in METHODS:
+            raise ValueError(f"Unknown method {scenario['method']!r} in {scenario['name']}, expected one of {METHODS}")
+        scenario["hash"] = content_hash(scenario)
+        scenarios.append(scenario)
+    return scenarios
+
+
+def content_hash(scenario: dict) -> str:
+    """
+    SHA-256 over the input file contents (or generator parameters) and the settings the
+    scenario's method uses, so renamed or moved copies of a scenario hash the same.
+    current_time is hashed in minutes ("00:30" and 30 are the same run).
+    """
+    settings = {key: scenario[key] for key in METHOD_SETTINGS[scenario["method"]]}
+    if "current_time" in settings:
+        settings["current_time"] = to_minutes(settings["current_time"])
+    digest = hashlib.sha256()
+    digest.update(json.dumps(settings, sort_keys=True).encode())
+    if scenario["files"] is not None:
+        for name in INPUTS:
+            digest.update(name.encode())
+            with open(scenario["files"][name], "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+    else:
+        digest.update(json.dumps(scenario["generate"], sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def run_scenario(scenario: dict) -> dict:
+    """
+    Runs the full pipeline for one scenario and returns its result record.
+    Errors are returned as records with status "error" instead of stopping the batch.
+    """
+    record = {"hash": scenario["hash"], "name": scenario["name"],
+              **{key: scenario[key] for key in SETTINGS}}
+    timings = {}
+    try:
+        start = time.perf_counter()
+        if scenario["files"] is not None:
+            files = scenario["files"]
+            drones = load_drones(files["drones"])
+            deliveries = load_deliveries(files["deliveries"])
+            noflyzones = load_noflyzones(files["noflyzones"])
+        else:
+            drones, deliveries, noflyzones = generate_random_scenario(**scenario["generate"])
+        timings["load"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        positions = build_positions(drones, deliveries)
+        graph = ImplicitCompleteGraph(positions)
+        timings["graph"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if scenario["method"] == "rolling":
+            planner = RollingHorizonPlanner(drones, deliveries, noflyzones, engine=scenario["engine"],
+                                            seed=scenario["seed"], generations=scenario["generations"],
+                                            population_size=scenario["population"])
+            assignments = planner.run()
+            fitness = None  # Slots are scored at different times, there is no single table
+            record["slots"] = len(planner.slots)
+        elif scenario["method"] == "assignment":
+            solver = AssignmentSolver(drones, deliveries, noflyzones, graph, positions, scenario["current_time"])
+            assignments = solver.run()
+            fitness = solver.table.fitness(assignments)
+        else:
+            optimizer = GeneticOptimizer(drones, deliveries, noflyzones, graph, positions, scenario["current_time"],
+                                         engine=scenario["engine"], seed=scenario["seed"])
+            assignments = optimizer.run(scenario["generations"], scenario["population"])
+            fitness = optimizer.table.fitness(assignments)
+        timings["optimize"] = time.perf_counter() - start
+
+        record.update(status="ok", drones=len(drones), deliveries=len(deliveries), zones=len(noflyzones),
+                      assignments=[list(pair) for pair in assignments], fitness=fitness)
+    except Exception as error:  # Reported in the store, the batch goes on
+        record.update(status="error", error=f"{type(error).__name__}: {error}")
+    record["timings"] = timings
+    return record
+
+
+class ResultStore:
+    """
+    Append-only result store: SQLite for paths ending in .sqlite / .db, JSON Lines otherwise.
+    Records are written in bulk (one write or one transaction per flush).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.sqlite = path.endswith((".sqlite", ".db"))
+        if self.sqlite:
+            self.connection = sqlite3.connect(path)
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS results (hash TEXT, name TEXT, status TEXT, fitness REAL, record TEXT)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS results_hash ON results (hash)")
+            self.connection.commit()
+
+    def completed(self) -> set:
+        """
+        Hashes of the scenarios already stored with status "ok".
+        """
+        if self.sqlite:
+            return {row[0] for row in self.connection.execute("SELECT hash FROM results WHERE status = 'ok'")}
+        if not os.path.exists(self.path):
+            return set()
+        with open(self.path, "r", encoding="utf-8") as f:
+            records = (json.loads(line) for line in f if line.strip())
+            return {record["hash"] for record in records if record.get("status") == "ok"}
+
+    def write(self, records: list):
+        if not records:
+            return
+        if self.sqlite:
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT INTO results VALUES (?, ?, ?, ?, ?)",
+                    [(r["hash"], r["name"], r["status"], r.get("fitness"), json.dumps(r, separators=(",", ":")))
+                     for r in records])
+        else:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records))
+
+    def close(self):
+        if self.sqlite:
+            self.connection.close()
+
+
+def run_batch(scenarios: list, store: ResultStore, workers=None, flush_every=100, force=False) -> dict:
+    """
+    Runs the scenarios not yet in the store on a process pool and writes their results in bulk.
+
+    :param force: Re-run scenarios whose hash is already stored
+    :return: Counts of run, skipped and failed scenarios
+    """
+    done = set() if force else store.completed()
+    todo, seen = [], set()
+    for scenario in scenarios:
+        if scenario["hash"] in done or scenario["hash"] in seen:
+            continue
+        seen.add(scenario["hash"])
+        todo.append(scenario)
+    summary = {"scenarios": len(scenarios), "skipped": len(scenarios) - len(todo), "run": 0, "failed": 0}
+
+    workers = workers or multiprocessing.cpu_count()
+    buffer = []
+    with multiprocessing.Pool(processes=min(workers, max(len(todo), 1))) as pool:
+        for record in pool.imap_unordered(run_scenario, todo):
+            summary["run"] += 1
+            summary["failed"] += record["status"] != "ok"
+            buffer.append(record)
+            print(f"{'✅' if record['status'] == 'ok' else '❌'} {record['name']} "
+                  f"({summary['run']}/{len(todo)})" + (f": {record['error']}" if record["status"] != "ok" else ""))
+            if len(buffer) >= flush_every:
+                store.write(buffer)
+                buffer = []
+    store.write(buffer)
+    return summary
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Command-line options; --time is normalized to minutes.
+    """
+    parser = argparse.ArgumentParser(description="Run many scenarios headless and store the results")
+    parser.add_argument("source", help="Scenario directory, directory of scenario directories, or manifest (.json/.jsonl)")
+    parser.add_argument("--store", default="results.jsonl", help="Result store (.jsonl, or .sqlite/.db)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--method", choices=METHODS, default="ga")
+    parser.add_argument("--engine", choices=GeneticOptimizer.engines, default="python")
+    parser.add_argument("--time", dest="current_time", type=to_minutes, default="00:30",
+                        help="Planning time (minutes or HH:MM)")
+    parser.add_argument("--generations", type=int, default=30)
+    parser.add_argument("--population", type=int, default=10)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--flush-every", type=int, default=100, help="Records per bulk write")
+    parser.add_argument("--force", action="store_true", help="Re-run scenarios already in the store")
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+
+    defaults = {key: getattr(args, key) for key in SETTINGS}
+    scenarios = discover(args.source, defaults)
+    store = ResultStore(args.store)
+    try:
+        start = time.perf_counter()
+        summary = run_batch(scenarios, store, args.workers, args.flush_every, args.force)
+    finally:
+        store.close()
+    print(f"\n⏱ {summary['run']} run, {summary['skipped']} skipped, {summary['failed']} failed "
+          f"in {time.perf_counter() - start:.2f} sec → {args.store}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+# src/algorithms/assignment.py
+
+import numpy as np
+from src.algorithms.astar import AStar
+from src.algorithms.csp import CSP
+from src.algorithms.evaluation import FitnessTable
+from src.utils.timeutils import to_minutes
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # SciPy is optional, the NumPy Hungarian below is used instead
+    linear_sum_assignment = None
+
+
+def hungarian(cost: np.ndarray) -> tuple:
+    """
+    Minimum-cost assignment of a rectangular cost matrix (shortest augmenting
+    paths with potentials, O(n² m)). Same result format as
+    scipy.optimize.linear_sum_assignment: (row_indices, col_indices).
+    """
+    cost = np.asarray(cost, dtype=float)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+    if n == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    # 1-based arrays; column 0 is a virtual column used to start each augmentation
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    owner = np.zeros(m + 1, dtype=np.int64)  # Row matched to each column, 0 if free
+    way = np.zeros(m + 1, dtype=np.int64)
+
+    for i in range(1, n + 1):
+        owner[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = owner[j0]
+            free = ~used[1:]
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = j0
+
+            slack = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(slack)) + 1
+            delta = slack[j1 - 1]
+            u[owner[used]] += delta
+            v[used] -= delta
+            minv[1:][free] -= delta
+            j0 = j1
+            if owner[j0] == 0:
+                break
+
+        # Flip the augmenting path
+        while j0:
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+
+    cols = np.nonzero(owner[1:])[0]
+    rows = owner[1:][cols] - 1
+    if transposed:
+        rows, cols = cols, rows
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+class AssignmentSolver:
+    """
+    Solves the one-delivery-per-drone problem directly as a weighted bipartite matching.
+
+    Pair scores are the same as the GA's (priority reward - energy penalty, see
+    FitnessTable); infeasible pairs (CSP) and pairs that do not pay off are never
+    matched, so a drone may stay idle. Methods:
+    - "hungarian": exact, SciPy's linear_sum_assignment if installed, a NumPy Hungarian otherwise
+    - "auction": Bertsekas' auction algorithm, within n_drones * epsilon of the optimum
+    - "greedy": best remaining pair first, for very large instances
+    - "auto": hungarian up to exact_limit table cells, auction above
+    """
+
+    methods = ("auto", "hungarian", "auction", "greedy")
+    exact_limit = 4_000_000  # drones × deliveries cells solved exactly by "auto"
+
+    def __init__(self, drones, deliveries, noflyzones, graph, positions, current_time, method="auto",
+                 verbose=False, epsilon=None):
+        """
+        :param method: One of methods
+        :param epsilon: Auction bid increment; defaults to 1e-3 of the largest pair score
+        """
+        if method not in self.methods:
+            raise ValueError(f"Unknown method {method!r}, expected one of {self.methods}")
+        self.drones = drones
+        self.deliveries = deliveries
+        self.noflyzones = noflyzones
+        self.current_time = to_minutes(current_time)
+        self.method = method
+        self.verbose = verbose
+        self.epsilon = epsilon
+        self.astar = AStar(graph, positions)
+        self.csp = CSP(drones, deliveries, noflyzones)
+        self.table = FitnessTable(drones, deliveries, self.csp, self.astar, self.current_time)
+
+    def profit_matrix(self) -> np.ndarray:
+        """
+        Returns the drone × delivery score matrix with infeasible or unprofitable pairs set to 0.
+        """
+        valid, score = self.table.as_arrays()
+        return np.where(valid & (score > 0), score, 0.0)
+
+    def run(self) -> list:
+        """
+        Returns the best [(drone_id, delivery_id), ...] assignment, in the format of GeneticOptimizer.run.
+        """
+        profit = self.profit_matrix()
+        method = self.method
+        if method == "auto":
+            method = "hungarian" if profit.size <= self.exact_limit else "auction"
+
+        if profit.size == 0:
+            rows, cols = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        elif method == "hungarian":
+            solve = linear_sum_assignment if linear_sum_assignment is not None else hungarian
+            rows, cols = solve(-profit)
+        elif method == "auction":
+            rows, cols = self.auction(profit)
+        else:
+            rows, cols = self.greedy(profit)
+
+        # Zero-profit matches stand for "drone stays idle"
+        keep = profit[rows, cols] > 0
+        result = [(self.drones[i].id, self.deliveries[j].id) for i, j in zip(rows[keep].tolist(), cols[keep].tolist())]
+
+        if self.verbose:
+            print(f"\n[!] Atama çözümü (yöntem: {method}, toplam skor: {self.table.fitness(result):.2f}, atanan: {len(result)}/{len(self.drones)})")
+        return result
+
+    @staticmethod
+    def greedy(profit: np.ndarray) -> tuple:
+        """
+        Takes positive pairs in decreasing profit order while both sides are free.
+        """
+        rows, cols = np.nonzero(profit > 0)
+        order = np.argsort(-profit[rows, cols], kind="stable")
+        used_rows = np.zeros(profit.shape[0], dtype=bool)
+        used_cols = np.zeros(profit.shape[1], dtype=bool)
+        chosen = []
+        remaining = profit.shape[0]
+        for i, j in zip(rows[order].tolist(), cols[order].tolist()):
+            if used_rows[i] or used_cols[j]:
+                continue
+            used_rows[i] = used_cols[j] = True
+            chosen.append((i, j))
+            remaining -= 1
+            if remaining == 0:
+                break
+        if not chosen:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        rows, cols = np.array(chosen, dtype=np.int64).T
+        return rows, cols
+
+    def auction(self, profit: np.ndarray) -> tuple:
+        """
+        Forward auction: unassigned drones bid for their most valuable delivery
+        (value = profit - price, staying idle is worth 0) and raise its price by
+        the gap to their second-best option plus epsilon.
+        """
+        n, m = profit.shape
+        epsilon = self.epsilon
+        if epsilon is None:
+            epsilon = max(float(profit.max(initial=0.0)), 1.0) * 1e-3
+        masked = np.where(profit > 0, profit, -np.inf)
+        prices = np.zeros(m)
+        owner = np.full(m, -1, dtype=np.int64)
+        assigned = np.full(n, -1, dtype=np.int64)
+        queue = list(range(n))
+
+        while queue:
+            i = queue.pop()
+            values = masked[i] - prices
+            if m > 1:
+                top2 = np.argpartition(-values, 1)[:2]
+                first, second = (top2[0], top2[1]) if values[top2[0]] >= values[top2[1]] else (top2[1], top2[0])
+                second_value = max(values[second], 0.0)
+            else:
+                first, second_value = 0, 0.0
+            best = values[first]
+            if not best > 0:
+                continue  # Staying idle is at least as good
+
+            prices[first] += best - second_value + epsilon
+            previous = owner[first]
+            if previous >= 0:
+                assigned[previous] = -1
+                queue.append(int(previous))
+            owner[first] = i
+            assigned[i] = first
+
+        rows = np.nonzero(assigned >= 0)[0]
+        return rows, assigned[rows]
@@ -1,20 +1,124 @@
 # src/algorithms/astar.py
 
 import heapq
+import math
+from collections import OrderedDict
+import numpy as np
 from src.utils.graph import Graph
+from src.utils.timeutils import to_minutes
 
 class AStar:
     """
     Implements the A* pathfinding algorithm on a weighted graph.
+
+    Node ids are interned to integer indices and coordinates are kept in flat
+    arrays for the heuristic. Searches keep a closed set and skip stale heap
+    entries (lazy deletion). Dense graphs (e.g. complete graphs) are expanded
+    with NumPy, sparse ones with plain Python.
+
+    Results are kept in an LRU-bounded cache keyed by (start, goal, zone_state),
+    and costs_from() answers one-to-many queries with a single Dijkstra search.
+    find_path_timed() routes around no-fly zones active at traversal time.
     """
 
-    def __init__(self, graph: Graph, node_positions: dict):
+    dense_degree = 64  # Average degree above which neighbours are expanded with NumPy
+    dense_fraction = 0.25  # One-to-many searches use the O(n)-per-step array Dijkstra above this degree / nodes
+    time_bucket = 15  # Minutes per bucket of the zone-clear edge cache used by find_path_timed
+
+    def __init__(self, graph: Graph, node_positions: dict, cache_size=65536, bidirectional=False, stats=None):
         """
         :param graph: The Graph object containing nodes and weighted edges
         :param node_positions: Dictionary mapping node_id to (x, y) coordinates
+        :param cache_size: Maximum number of cached paths (0 disables caching)
+        :param bidirectional: Use bidirectional A* for point-to-point queries on sparse undirected graphs;
+                              dense graphs always use the vectorized unidirectional search
+        :param stats: Optional Instrumentation receiving cache and expansion counters
         """
         self.graph = graph
         self.positions = node_positions  # Needed for heuristic calculation
+        self.cache_size = cache_size
+        self.bidirectional = bidirectional
+        # Identifies the no-fly-zone situation the graph reflects; part of every cache key.
+        # Set by CSP for its router whenever its zones change (CSP.zone_state)
+        self.zone_state = None
+        self._path_cache = OrderedDict()
+        self._prepared_size = None
+        self.stats = stats
+        self._closed = ()  # Closed set of the last search, read by _record_search
+
+        # Caches for find_path_timed, valid for one NoFlyZoneIndex
+        self._zone_index = None
+        self._edge_zones = {}   # (u, v) -> indices of zones the edge crosses
+        self._clear_edges = {}  # (bucket, speed) -> {(u, v): no crossed zone active in the bucket}
+
+    def refresh(self):
+        """
+        Rebuilds the node index, coordinate arrays and integer adjacency, e.g. after
+        nodes or edges were added or nodes moved.
+        """
+        graph = self.graph
+        if hasattr(graph, "neighbor_indices"):
+            # Share the graph's own interning so neighbour arrays can be used as-is
+            self._ids = graph.node_ids
+            self._index = graph.index
+            self._indexed = True
+            if hasattr(graph, "offsets"):
+                degree = len(graph.neighbors) / max(len(graph.node_ids), 1)
+            else:
+                degree = len(graph.node_ids) - 1
+        else:
+            self._ids = list(graph.adjacency_list)
+            self._index = {node_id: i for i, node_id in enumerate(self._ids)}
+            self._indexed = False
+            degree = sum(len(edges) for edges in graph.adjacency_list.values()) / max(len(self._ids), 1)
+
+        coords = [self.positions[node_id] for node_id in self._ids]
+        self._coords = np.array(coords, dtype=float).reshape(-1, 2)
+        self._xs = self._coords[:, 0].tolist()
+        self._ys = self._coords[:, 1].tolist()
+        self._dense = self._indexed and degree >= self.dense_degree
+        self._degree = degree
+        self._prepared_size = len(self._ids)
+
+        # Sparse graphs are expanded in pure Python, so keep integer adjacency as flat lists
+        self._adjacency = None
+        if not self._dense:
+            if hasattr(graph, "offsets"):
+                self._adjacency = (graph.offsets.tolist(), graph.neighbors.tolist(), graph.costs.tolist())
+            elif not self._indexed:
+                index = self._index
+                offsets, neighbors, costs = [0], [], []
+                for node_id in self._ids:
+                    for neighbor, cost in graph.adjacency_list[node_id]:
+                        neighbors.append(index[neighbor])
+                        costs.append(cost)
+                    offsets.append(len(neighbors))
+                self._adjacency = (offsets, neighbors, costs)
+
+    def _prepare(self):
+        """
+        Refreshes the index when the number of nodes changed since the last search.
+        Moved nodes and new edges between existing nodes are not detected; call refresh() then.
+        """
+        if self._prepared_size != self._graph_size():
+            self.refresh()
+
+    def _graph_size(self) -> int:
+        graph = self.graph
+        if hasattr(graph, "node_ids"):
+            return len(graph.node_ids)
+        return len(graph.adjacency_list)
+
+    def _neighbors(self, u: int) -> tuple:
+        """
+        Returns (neighbor_indices, costs) as Python lists for node index u.
+        """
+        if self._adjacency is not None:
+            offsets, neighbors, costs = self._adjacency
+            start, end = offsets[u], offsets[u + 1]
+            return neighbors[start:end], costs[start:end]
+        neighbors, costs = self.graph.neighbor_indices(u)
+        return neighbors.tolist(), costs.tolist()
 
     def heuristic(self, current: int, goal: int) -> float:
         """
@@ -22,43 +126,448 @@ class AStar:
         """
         return self.graph.euclidean_distance(self.positions[current], self.positions[goal])
 
-    def find_path(self, start: int, goal: int) -> tuple:
+    def find_path(self, start: int, goal: int, bidirectional=None) -> tuple:
         """
         Finds the optimal path from start to goal using A*.
 
+        :param bidirectional: Overrides the instance setting for this query
         :return: (total_cost, path_list) if path found, else (float('inf'), [])
         """
-        open_set = []
-        heapq.heappush(open_set, (0, start))
+        key = (start, goal, self.zone_state)
+        cached = self._path_cache.get(key)
+        if cached is not None:
+            self._path_cache.move_to_end(key)
+            if self.stats is not None:
+                self.stats.count("astar.cache_hits")
+            return cached[0], list(cached[1])
+
+        if self.stats is not None:
+            self.stats.count("astar.cache_misses")
+            with self.stats.timer("astar.search"):
+                cost, path = self.search(start, goal, bidirectional)
+        else:
+            cost, path = self.search(start, goal, bidirectional)
+        self.cache_path(key, cost, path)
+        return cost, path
+
+    def search(self, start: int, goal: int, bidirectional=None) -> tuple:
+        """
+        Runs the A* search without consulting the cache.
+        """
+        self._prepare()
+        s = self._index.get(start)
+        t = self._index.get(goal)
+        if s is None or t is None:
+            return float('inf'), []
+        if s == t:
+            return 0, [start]
+
+        if bidirectional is None:
+            bidirectional = self.bidirectional
+        if self._dense:
+            cost, path = self._astar_dense(s, t)
+        elif bidirectional:
+            cost, path = self._astar_bidirectional(s, t)
+        else:
+            cost, path = self._astar(s, t)
+        if self.stats is not None:
+            self._record_search()
+        return cost, [self._ids[i] for i in path]
+
+    def _record_search(self):
+        """
+        Counts one search and the nodes it expanded (the size of its closed set).
+        """
+        closed = self._closed
+        if isinstance(closed, np.ndarray):
+            expanded = int(closed.sum())
+        elif isinstance(closed, tuple):
+            expanded = sum(len(side) for side in closed)
+        else:
+            expanded = len(closed)
+        self.stats.count("astar.searches")
+        self.stats.count("astar.expansions", expanded)
 
+    def _astar(self, s: int, t: int) -> tuple:
+        """
+        Unidirectional A* over integer node indices.
+        """
+        xs, ys = self._xs, self._ys
+        tx, ty = xs[t], ys[t]
+        hypot = math.hypot
+        inf = float('inf')
+
+        g_score = {s: 0.0}
         came_from = {}
-        g_score = {start: 0}
-        f_score = {start: self.heuristic(start, goal)}
+        closed = set()
+        open_set = [(hypot(xs[s] - tx, ys[s] - ty), s)]
 
         while open_set:
             _, current = heapq.heappop(open_set)
+            if current in closed:
+                continue  # Stale entry
+            if current == t:
+                self._closed = closed
+                return g_score[current], self._reconstruct_indices(came_from, current)
+            closed.add(current)
 
-            if current == goal:
-                return g_score[current], self.reconstruct_path(came_from, current)
-
-            for neighbor, cost in self.graph.get_neighbors(current):
-                tentative_g = g_score[current] + cost
-
-                if neighbor not in g_score or tentative_g < g_score[neighbor]:
+            g_current = g_score[current]
+            neighbors, costs = self._neighbors(current)
+            for neighbor, cost in zip(neighbors, costs):
+                if neighbor in closed:
+                    continue
+                tentative_g = g_current + cost
+                if tentative_g < g_score.get(neighbor, inf):
                     came_from[neighbor] = current
                     g_score[neighbor] = tentative_g
-                    f_score[neighbor] = tentative_g + self.heuristic(neighbor, goal)
-                    heapq.heappush(open_set, (f_score[neighbor], neighbor))
+                    heapq.heappush(open_set, (tentative_g + hypot(xs[neighbor] - tx, ys[neighbor] - ty), neighbor))
+
+        self._closed = closed
+        return inf, []
+
+    def _astar_dense(self, s: int, t: int) -> tuple:
+        """
+        A* for dense graphs: each expansion relaxes all neighbours with one NumPy operation.
+        """
+        n = len(self._ids)
+        target = self._coords[t]
+        h = np.hypot(self._coords[:, 0] - target[0], self._coords[:, 1] - target[1])
+        g_score = np.full(n, np.inf)
+        g_score[s] = 0.0
+        came_from = np.full(n, -1, dtype=np.int64)
+        closed = np.zeros(n, dtype=bool)
+        open_set = [(h[s], s)]
+
+        while open_set:
+            _, current = heapq.heappop(open_set)
+            if closed[current]:
+                continue  # Stale entry
+            if current == t:
+                self._closed = closed
+                return float(g_score[t]), self._reconstruct_array(came_from, t)
+            closed[current] = True
+
+            neighbors, costs = self.graph.neighbor_indices(current)
+            tentative = g_score[current] + costs
+            better = (tentative < g_score[neighbors]) & ~closed[neighbors]
+            improved = neighbors[better]
+            g_score[improved] = tentative[better]
+            came_from[improved] = current
+            for f, neighbor in zip((tentative[better] + h[improved]).tolist(), improved.tolist()):
+                heapq.heappush(open_set, (f, neighbor))
 
+        self._closed = closed
         return float('inf'), []
 
-    def reconstruct_path(self, came_from: dict, current: int) -> list:
+    def _astar_bidirectional(self, s: int, t: int) -> tuple:
         """
-        Reconstructs the path from the came_from map.
+        Bidirectional A* with average potentials p(v) = (h(v, t) - h(s, v)) / 2.
+
+        The forward search uses keys g + p, the backward search g - p; both are
+        consistent, so the search stops once top_f + top_b >= best path cost.
         """
+        xs, ys = self._xs, self._ys
+        sx, sy, tx, ty = xs[s], ys[s], xs[t], ys[t]
+        hypot = math.hypot
+        inf = float('inf')
+
+        def potential(v):
+            return 0.5 * (hypot(xs[v] - tx, ys[v] - ty) - hypot(xs[v] - sx, ys[v] - sy))
+
+        g = ({s: 0.0}, {t: 0.0})
+        came_from = ({}, {})
+        closed = (set(), set())
+        heaps = ([(potential(s), s)], [(-potential(t), t)])
+        signs = (1.0, -1.0)
+        best, meeting = inf, None
+
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            g_side, g_other = g[side], g[1 - side]
+
+            _, current = heapq.heappop(heaps[side])
+            if current in closed[side]:
+                continue  # Stale entry
+            closed[side].add(current)
+
+            g_current = g_side[current]
+            neighbors, costs = self._neighbors(current)
+            for neighbor, cost in zip(neighbors, costs):
+                if neighbor in closed[side]:
+                    continue
+                tentative_g = g_current + cost
+                if tentative_g < g_side.get(neighbor, inf):
+                    g_side[neighbor] = tentative_g
+                    came_from[side][neighbor] = current
+                    heapq.heappush(heaps[side], (tentative_g + signs[side] * potential(neighbor), neighbor))
+                    if neighbor in g_other and tentative_g + g_other[neighbor] < best:
+                        best, meeting = tentative_g + g_other[neighbor], neighbor
+
+        self._closed = closed
+        if meeting is None:
+            return inf, []
+        forward = self._reconstruct_indices(came_from[0], meeting)
+        backward = self._reconstruct_indices(came_from[1], meeting)
+        return best, forward + backward[-2::-1]
+
+    def find_path_timed(self, start, goal, depart_time, speed: float, zone_index, max_wait=float('inf')) -> tuple:
+        """
+        Time-dependent A*: finds the earliest-arrival route from start to goal for a
+        drone leaving at depart_time and flying at speed (m/s). An edge may only be
+        flown while none of the zones it crosses is active; otherwise the drone waits
+        at the node until the zones switch off, or takes a detour.
+
+        :param depart_time: Departure time in minutes ("HH:MM" strings are accepted)
+        :param zone_index: NoFlyZoneIndex of the zones to avoid
+        :param max_wait: Longest wait (minutes) allowed before a single edge
+        :return: (distance, path_list, arrival_minute), or (float('inf'), [], float('inf'))
+        """
+        self._prepare()
+        inf = float('inf')
+        s = self._index.get(start)
+        t = self._index.get(goal)
+        depart = to_minutes(depart_time)
+        if s is None or t is None or speed <= 0:
+            return inf, [], inf
+        if s == t:
+            return 0, [start], depart
+
+        if zone_index is not self._zone_index:
+            self._zone_index = zone_index
+            self._edge_zones = {}
+            self._clear_edges = {}
+
+        xs, ys = self._xs, self._ys
+        tx, ty = xs[t], ys[t]
+        hypot = math.hypot
+        minutes_per_meter = 1.0 / (speed * 60.0)
+
+        arrival = {s: float(depart)}
+        distance = {s: 0.0}
+        came_from = {}
+        closed = set()
+        open_set = [(depart + hypot(xs[s] - tx, ys[s] - ty) * minutes_per_meter, s)]
+
+        while open_set:
+            _, current = heapq.heappop(open_set)
+            if current in closed:
+                continue  # Stale entry
+            if current == t:
+                if self.stats is not None:
+                    self._closed = closed
+                    self._record_search()
+                path = [self._ids[i] for i in self._reconstruct_indices(came_from, current)]
+                return distance[current], path, arrival[current]
+            closed.add(current)
+
+            now = arrival[current]
+            bucket = int(now // self.time_bucket)
+            clear = self._clear_edges.setdefault((bucket, speed), {})
+            neighbors, costs = self._neighbors(current)
+            crossed = self._crossed_zones(current, neighbors, zone_index)
+
+            for neighbor, cost, zones in zip(neighbors, costs, crossed):
+                if neighbor in closed:
+                    continue
+                duration = cost * minutes_per_meter
+                leave = now
+                if zones:
+                    edge = (current, neighbor)
+                    if edge not in clear:
+                        bucket_start = bucket * self.time_bucket
+                        clear[edge] = not zone_index.overlaps(zones, bucket_start, bucket_start + self.time_bucket + duration)
+                    if not clear[edge]:
+                        leave = zone_index.earliest_departure(zones, now, duration)
+                        if leave - now > max_wait:
+                            continue
+
+                arrive = leave + duration
+                if arrive < arrival.get(neighbor, inf):
+                    arrival[neighbor] = arrive
+                    distance[neighbor] = distance[current] + cost
+                    came_from[neighbor] = current
+                    heapq.heappush(open_set, (arrive + hypot(xs[neighbor] - tx, ys[neighbor] - ty) * minutes_per_meter, neighbor))
+
+        if self.stats is not None:
+            self._closed = closed
+            self._record_search()
+        return inf, [], inf
+
+    def _crossed_zones(self, u: int, neighbors: list, zone_index) -> list:
+        """
+        Returns the zones crossed by each edge u -> neighbor, computing unseen edges in one bulk query.
+        """
+        cache = self._edge_zones
+        missing = [v for v in neighbors if (u, v) not in cache]
+        if missing:
+            starts = [(self._xs[u], self._ys[u])] * len(missing)
+            ends = [(self._xs[v], self._ys[v]) for v in missing]
+            for v, zones in zip(missing, zone_index.segment_zones(starts, ends)):
+                cache[(u, v)] = zones
+                cache[(v, u)] = zones
+        return [cache[(u, v)] for v in neighbors]
+
+    def costs_from(self, start: int, goals=None) -> dict:
+        """
+        One-to-many search: a single Dijkstra run from start. On a straight-line complete
+        graph (ImplicitCompleteGraph) every cost is the direct distance, computed in one call.
+
+        :param goals: Iterable of target node ids; the search stops once all are settled.
+                      None settles every reachable node.
+        :return: Dictionary goal -> cost (float('inf') if unreachable). Paths to the
+                 requested goals are added to the path cache.
+        """
+        self._prepare()
+        s = self._index.get(start)
+        goals = list(goals) if goals is not None else None
+        if s is None:
+            return {goal: float('inf') for goal in goals} if goals is not None else {}
+
+        targets = None
+        if goals is not None:
+            targets = {self._index[goal] for goal in goals if goal in self._index}
+
+        if getattr(self.graph, "straight_line", False):
+            settled, came_from = self._direct_costs(s, targets)
+        elif self._dense and self._degree >= self.dense_fraction * len(self._ids):
+            settled, came_from = self._dijkstra_dense(s, targets)
+        else:
+            settled, came_from = self._dijkstra(s, targets)
+        if self.stats is not None:
+            self._closed = settled
+            self._record_search()
+
+        ids = self._ids
+        if goals is None:
+            return {ids[i]: cost for i, cost in settled.items()}
+
+        costs = {}
+        for goal in goals:
+            i = self._index.get(goal)
+            if i in settled:
+                costs[goal] = settled[i]
+                path = [ids[k] for k in self._reconstruct_indices(came_from, i)]
+                self.cache_path((start, goal, self.zone_state), settled[i], path)
+            else:
+                costs[goal] = float('inf')
+        return costs
+
+    def _direct_costs(self, s: int, targets) -> tuple:
+        """
+        Settles the targets (every node if None) at their direct-edge distance; returns (costs, came_from).
+        """
+        distances = self.graph.distances_from(s)
+        nodes = range(len(distances)) if targets is None else sorted(targets | {s})
+        settled = {i: float(distances[i]) for i in nodes}
+        settled[s] = 0.0
+        came_from = {i: s for i in settled if i != s}
+        return settled, came_from
+
+    def _dijkstra(self, s: int, targets) -> tuple:
+        """
+        Dijkstra over integer indices; returns (settled costs, came_from).
+        """
+        remaining = set(targets) if targets is not None else None
+        dist = {s: 0.0}
+        came_from = {}
+        settled = {}
+        open_set = [(0.0, s)]
+        inf = float('inf')
+
+        while open_set:
+            d, current = heapq.heappop(open_set)
+            if current in settled:
+                continue
+            settled[current] = d
+
+            if remaining is not None:
+                remaining.discard(current)
+                if not remaining:
+                    break
+
+            neighbors, costs = self._neighbors(current)
+            for neighbor, cost in zip(neighbors, costs):
+                tentative = d + cost
+                if neighbor not in settled and tentative < dist.get(neighbor, inf):
+                    dist[neighbor] = tentative
+                    came_from[neighbor] = current
+                    heapq.heappush(open_set, (tentative, neighbor))
+
+        return settled, came_from
+
+    def _dijkstra_dense(self, s: int, targets) -> tuple:
+        """
+        Array-based Dijkstra for dense graphs: O(n) argmin per step instead of a heap.
+        """
+        remaining = set(targets) if targets is not None else None
+        n = len(self._ids)
+        dist = np.full(n, np.inf)
+        dist[s] = 0.0
+        parent = np.full(n, -1, dtype=np.int64)
+        done = np.zeros(n, dtype=bool)
+        settled = {}
+
+        while True:
+            current = int(np.argmin(np.where(done, np.inf, dist)))
+            if done[current] or dist[current] == np.inf:
+                break
+            done[current] = True
+            settled[current] = float(dist[current])
+
+            if remaining is not None:
+                remaining.discard(current)
+                if not remaining:
+                    break
+
+            neighbors, costs = self.graph.neighbor_indices(current)
+            tentative = dist[current] + costs
+            better = (tentative < dist[neighbors]) & ~done[neighbors]
+            dist[neighbors[better]] = tentative[better]
+            parent[neighbors[better]] = current
+
+        came_from = {i: int(parent[i]) for i in settled if parent[i] >= 0}
+        return settled, came_from
+
+    def cache_path(self, key: tuple, cost: float, path: list):
+        """
+        Stores a search result, evicting the least recently used entry when full.
+        """
+        if self.cache_size <= 0:
+            return
+        self._path_cache[key] = (cost, tuple(path))
+        self._path_cache.move_to_end(key)
+        while len(self._path_cache) > self.cache_size:
+            self._path_cache.popitem(last=False)
+
+    def clear_cache(self):
+        """
+        Drops all cached paths and zone-crossing data, e.g. after the graph changes.
+        """
+        self._path_cache.clear()
+        self._zone_index = None
+        self._edge_zones = {}
+        self._clear_edges = {}
+
+    def _reconstruct_indices(self, came_from: dict, current: int) -> list:
         path = [current]
         while current in came_from:
             current = came_from[current]
             path.append(current)
         path.reverse()
-        return path
\ No newline at end of file
+        return path
+
+    def _reconstruct_array(self, came_from: np.ndarray, current: int) -> list:
+        path = [current]
+        while came_from[current] >= 0:
+            current = int(came_from[current])
+            path.append(current)
+        path.reverse()
+        return path
+
+    def reconstruct_path(self, came_from: dict, current: int) -> list:
+        """
+        Reconstructs the path from the came_from map.
+        """
+        return self._reconstruct_indices(came_from, current)
@@ -1,7 +1,9 @@
-from datetime import datetime
-from shapely.geometry import LineString, Polygon
+import numpy as np
 from src.models.delivery import Delivery
 from src.models.noflyzone import NoFlyZone
+from src.utils.kdtree import KDTree
+from src.utils.spatial import NoFlyZoneIndex
+from src.utils.timeutils import format_window, minutes_to_timestr, to_minutes, to_minutes_window
 
 
 class CSP:
@@ -9,78 +11,320 @@ class CSP:
     Enforces constraints for assigning deliveries to drones.
     """
 
-    def __init__(self, drones: list, deliveries: list, noflyzones: list):
+    # Constraint names in the order is_delivery_valid checks them
+    constraints = ("weight", "noflyzone", "time_window", "arrival", "battery")
+    max_weight_classes = 8  # Separate candidate trees per distinct drone max_weight up to this many
+
+    def __init__(self, drones: list, deliveries: list, noflyzones: list, router=None, stats=None):
+        """
+        :param router: Optional AStar; when set, drones route around active no-fly zones
+                       (detour or wait) instead of being rejected for a blocked straight line
+        :param stats: Optional Instrumentation counting checks by the constraint that failed
+        """
         self.drones = drones
         self.deliveries = deliveries
         self.noflyzones = noflyzones
+        self.zone_index = NoFlyZoneIndex(noflyzones)
         self.mAh_per_meter = 5  # Energy consumption per meter
+        self.router = router
+        self.stats = stats
+        self._route_cache = {}
+        self.zone_state = None
+        self._update_zone_state()
 
-    def is_delivery_valid(self, drone, delivery: Delivery, current_time: str, verbose=False) -> bool:
+    def is_delivery_valid(self, drone, delivery: Delivery, current_time, verbose=False) -> bool:
         """
         Checks if a drone can perform the delivery without violating constraints:
         - max_weight is not exceeded
         - no-fly zones are avoided
         - time window is respected
         - battery capacity is sufficient for the path
+
+        current_time is given in minutes since midnight ("HH:MM" strings are also accepted).
         """
+        current_time = to_minutes(current_time)
+        if self.stats is not None:
+            self.stats.count("csp.checks")
+
         if delivery.weight > drone.max_weight:
             if verbose:
                 print(f"[X] Ağırlık Yetersiz → Drone#{drone.id} taşıma sınırı: {drone.max_weight}kg < Delivery#{delivery.id} ({delivery.weight}kg)")
+            if self.stats is not None:
+                self.stats.count("csp.failed.weight")
             return False
 
-        if self.intersects_no_fly_zone(drone.start_pos, delivery.pos, current_time):
+        if self.router is None:
+            if self.intersects_no_fly_zone(drone.start_pos, delivery.pos, current_time):
+                if verbose:
+                    print(f"[X] No-Fly Zone Engeli → Drone#{drone.id} → Delivery#{delivery.id} yolu yasak bölgeyle kesişiyor.")
+                if self.stats is not None:
+                    self.stats.count("csp.failed.noflyzone")
+                return False
+            distance = self.euclidean_distance(drone.start_pos, delivery.pos)
+        else:
+            distance, _, arrival = self.route(drone, delivery, current_time)
+            if distance == float('inf'):
+                if verbose:
+                    print(f"[X] No-Fly Zone Engeli → Drone#{drone.id} → Delivery#{delivery.id} için yasak bölgelerden kaçınan rota bulunamadı.")
+                if self.stats is not None:
+                    self.stats.count("csp.failed.noflyzone")
+                return False
+
+        if not self.in_time_window(delivery.time_window, current_time):
             if verbose:
-                print(f"[X] No-Fly Zone Engeli → Drone#{drone.id} → Delivery#{delivery.id} yolu yasak bölgeyle kesişiyor.")
+                print(f"[X] Zaman Uyuşmazlığı → Şu an: {minutes_to_timestr(current_time)}, Delivery#{delivery.id} için geçerli zaman aralığı: {format_window(delivery.time_window)}")
+            if self.stats is not None:
+                self.stats.count("csp.failed.time_window")
             return False
 
-        if not self.in_time_window(delivery.time_window, current_time):
+        if self.router is not None and arrival > delivery.time_window[1]:
             if verbose:
-                print(f"[X] Zaman Uyuşmazlığı → Şu an: {current_time}, Delivery#{delivery.id} için geçerli zaman aralığı: {delivery.time_window[0]} – {delivery.time_window[1]}")
+                print(f"[X] Zaman Uyuşmazlığı → Drone#{drone.id} varış: {minutes_to_timestr(int(arrival))}, Delivery#{delivery.id} için geçerli zaman aralığı: {format_window(delivery.time_window)}")
+            if self.stats is not None:
+                self.stats.count("csp.failed.arrival")
             return False
 
-        # Battery capacity check
-        distance = self.euclidean_distance(drone.start_pos, delivery.pos)
+        # Battery capacity check (routed distance when routing around zones)
         required_energy = distance * self.mAh_per_meter
 
         if required_energy > drone.remaining_battery:
             if verbose:
                 print(f"[X] Batarya Yetersiz → Drone#{drone.id}: {drone.remaining_battery}mAh < Gerekli: {int(required_energy)}mAh")
+            if self.stats is not None:
+                self.stats.count("csp.failed.battery")
             return False
 
+        if self.stats is not None:
+            self.stats.count("csp.passed")
         if verbose:
             print(f"[✓] Uygun Eşleşme → Drone#{drone.id} → Delivery#{delivery.id}")
         return True
 
-    def in_time_window(self, time_window: tuple, now: str) -> bool:
+    def feasibility_matrix(self, drones, deliveries, current_time) -> tuple:
         """
-        Checks if current time is within delivery's acceptable time range.
+        Bulk version of is_delivery_valid for every drone × delivery pair.
+
+        :param drones: List of drones (or a DroneFleet)
+        :param deliveries: List of deliveries (or a DeliveryBatch)
+        :return: (feasible, reasons): feasible is an (n_drones, n_deliveries) boolean array,
+                 reasons maps each name in constraints to a boolean array of the pairs passing it.
+                 As in is_delivery_valid, no-fly zones (and routes) are only evaluated for pairs
+                 passing the weight check; other pairs count as passing them.
         """
-        fmt = "%H:%M"
-        now_time = datetime.strptime(now, fmt)
-        start_time = datetime.strptime(time_window[0], fmt)
-        end_time = datetime.strptime(time_window[1], fmt)
-        return start_time <= now_time <= end_time
+        shape = (len(drones), len(deliveries))
+        rows, cols = np.indices(shape).reshape(2, -1)
+        feasible, reasons = self.feasibility_pairs(drones, deliveries, rows, cols, current_time)
+        return feasible.reshape(shape), {name: passed.reshape(shape) for name, passed in reasons.items()}
 
-    def intersects_no_fly_zone(self, start: tuple, end: tuple, current_time: str) -> bool:
+    def feasibility_pairs(self, drones, deliveries, rows, cols, current_time) -> tuple:
         """
-        Checks if the straight path between start and end intersects any active no-fly zone.
+        feasibility_matrix restricted to the given (row, column) pairs, e.g. those of candidate_pairs.
+
+        :return: (feasible, reasons) as in feasibility_matrix, one entry per pair
+        """
+        current_time = to_minutes(current_time)
+        max_weight, remaining, start = _drone_columns(drones)
+        weight, pos, window = _delivery_columns(deliveries)
+        rows, cols = np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)
+
+        reasons = {"weight": weight[cols] <= max_weight[rows]}
+        reasons["time_window"] = (window[cols, 0] <= current_time) & (current_time <= window[cols, 1])
+        heavy_ok = np.nonzero(reasons["weight"])[0]
+
+        if self.router is None:
+            gap = start[rows] - pos[cols]
+            distance = np.sqrt((gap ** 2).sum(axis=1))
+            reasons["noflyzone"] = np.ones(len(rows), dtype=bool)
+            if self.noflyzones and len(heavy_ok):
+                blocked = self.zone_index.intersects_many(start[rows[heavy_ok]], pos[cols[heavy_ok]], current_time)
+                reasons["noflyzone"][heavy_ok[blocked]] = False
+            reasons["arrival"] = np.ones(len(rows), dtype=bool)
+        else:
+            distance = np.zeros(len(rows))
+            arrival = np.zeros(len(rows))
+            drone_list, delivery_list = list(drones), list(deliveries)
+            for k in heavy_ok.tolist():
+                distance[k], _, arrival[k] = self.route(drone_list[rows[k]], delivery_list[cols[k]], current_time)
+            reasons["noflyzone"] = ~np.isinf(distance)
+            reasons["arrival"] = arrival <= window[cols, 1]
+
+        reasons["battery"] = distance * self.mAh_per_meter <= remaining[rows]
+        feasible = np.logical_and.reduce([reasons[name] for name in self.constraints])
+        if self.stats is not None:
+            self._record_bulk(feasible, reasons)
+        return feasible, reasons
+
+    def candidate_pairs(self, drones, deliveries) -> tuple:
+        """
+        Returns (rows, cols) of the pairs that pass the weight check and lie within the
+        drone's straight-line battery radius (remaining_battery / mAh_per_meter), sorted
+        by row then column. Routes are never shorter than the straight line, so every
+        feasible pair is among them; the rest can skip the other checks.
+
+        Delivery positions go into one KDTree per weight class (distinct max_weight of
+        the fleet, up to max_weight_classes; above that one tree plus a weight filter).
+        """
+        max_weight, remaining, start = _drone_columns(drones)
+        weight, pos, _ = _delivery_columns(deliveries)
+        radius = np.maximum(remaining, 0.0) / self.mAh_per_meter
+        radius = radius * (1 + 1e-9) + 1e-9  # Boundary pairs are settled by the exact battery check
+
+        per_class = len(np.unique(max_weight)) <= self.max_weight_classes
+        heaviest = float(max_weight.max(initial=0.0))
+        trees = {}
+        rows, cols = [], []
+        for i in range(len(max_weight)):
+            limit = float(max_weight[i]) if per_class else heaviest
+            if limit not in trees:
+                members = np.nonzero(weight <= limit)[0]
+                trees[limit] = (members, KDTree(pos[members]))
+            members, tree = trees[limit]
+            found = members[tree.query_radius(start[i], radius[i])]
+            found = found[weight[found] <= max_weight[i]]
+            rows.append(np.full(len(found), i, dtype=np.int64))
+            cols.append(found)
+
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+        if self.stats is not None:
+            self.stats.count("csp.pruned", len(max_weight) * len(weight) - len(rows))
+        return rows, cols
+
+    def _record_bulk(self, feasible, reasons: dict):
+        """
+        Adds a feasibility_matrix call to the counters, attributing each pair to its first failed constraint.
+        """
+        self.stats.count("csp.checks", feasible.size)
+        self.stats.count("csp.passed", int(feasible.sum()))
+        pending = np.ones(feasible.shape, dtype=bool)
+        for name in self.constraints:
+            failed = pending & ~reasons[name]
+            self.stats.count(f"csp.failed.{name}", int(failed.sum()))
+            pending &= reasons[name]
+
+    def reason_messages(self, drones, deliveries, reasons: dict, current_time, pairs=None) -> list:
+        """
+        Builds is_delivery_valid's verbose message for each pair from feasibility_matrix
+        reasons, without re-checking the constraints.
+
+        :param pairs: (row, column) pairs to describe; every pair when None
+        """
+        current_time = to_minutes(current_time)
+        drones, deliveries = list(drones), list(deliveries)
+        if pairs is None:
+            pairs = [(i, j) for i in range(len(drones)) for j in range(len(deliveries))]
+
+        messages = []
+        for i, j in pairs:
+            drone, delivery = drones[i], deliveries[j]
+            failed = next((name for name in self.constraints if not reasons[name][i, j]), None)
+            if failed == "weight":
+                messages.append(f"[X] Ağırlık Yetersiz → Drone#{drone.id} taşıma sınırı: {drone.max_weight}kg < Delivery#{delivery.id} ({delivery.weight}kg)")
+            elif failed == "noflyzone" and self.router is None:
+                messages.append(f"[X] No-Fly Zone Engeli → Drone#{drone.id} → Delivery#{delivery.id} yolu yasak bölgeyle kesişiyor.")
+            elif failed == "noflyzone":
+                messages.append(f"[X] No-Fly Zone Engeli → Drone#{drone.id} → Delivery#{delivery.id} için yasak bölgelerden kaçınan rota bulunamadı.")
+            elif failed == "time_window":
+                messages.append(f"[X] Zaman Uyuşmazlığı → Şu an: {minutes_to_timestr(current_time)}, Delivery#{delivery.id} için geçerli zaman aralığı: {format_window(delivery.time_window)}")
+            elif failed == "arrival":
+                arrival = self.route(drone, delivery, current_time)[2]
+                messages.append(f"[X] Zaman Uyuşmazlığı → Drone#{drone.id} varış: {minutes_to_timestr(int(arrival))}, Delivery#{delivery.id} için geçerli zaman aralığı: {format_window(delivery.time_window)}")
+            elif failed == "battery":
+                if self.router is None:
+                    distance = self.euclidean_distance(drone.start_pos, delivery.pos)
+                else:
+                    distance = self.route(drone, delivery, current_time)[0]
+                messages.append(f"[X] Batarya Yetersiz → Drone#{drone.id}: {drone.remaining_battery}mAh < Gerekli: {int(distance * self.mAh_per_meter)}mAh")
+            else:
+                messages.append(f"[✓] Uygun Eşleşme → Drone#{drone.id} → Delivery#{delivery.id}")
+        return messages
+
+    def route(self, drone, delivery: Delivery, current_time) -> tuple:
         """
-        line = LineString([start, end])
-        now = datetime.strptime(current_time, "%H:%M")
+        Zone-aware route from the drone's start to the delivery, cached per (drone, delivery, time).
 
-        for zone in self.noflyzones:
-            poly = Polygon(zone.coordinates)
-            start_time = datetime.strptime(zone.active_time[0], "%H:%M")
-            end_time = datetime.strptime(zone.active_time[1], "%H:%M")
+        :return: (distance, path_list, arrival_minute) from router.find_path_timed
+        """
+        key = (drone.id, delivery.id, current_time)
+        if key not in self._route_cache:
+            self._route_cache[key] = self.router.find_path_timed(
+                f"DR{drone.id}", f"D{delivery.id + 80}", current_time, drone.speed, self.zone_index)
+        return self._route_cache[key]
 
-            if start_time <= now <= end_time and line.intersects(poly):
-                return True
+    def add_noflyzone(self, zone: NoFlyZone):
+        """
+        Registers a new no-fly zone and rebuilds the zone index.
+        """
+        self.noflyzones.append(zone)
+        self.zone_index = NoFlyZoneIndex(self.noflyzones)
+        self.clear_route_cache()
+        self._update_zone_state()
 
-        return False
+    def _update_zone_state(self):
+        """
+        Recomputes the fingerprint of the zone set and hands it to the router, whose path
+        cache is keyed by it, so paths cached under other zones are not reused.
+        """
+        self.zone_state = hash(tuple((zone.id, tuple(zone.active_time), tuple(map(tuple, zone.coordinates)))
+                                     for zone in self.noflyzones))
+        if self.router is not None:
+            self.router.zone_state = self.zone_state
+
+    def clear_route_cache(self):
+        """
+        Drops cached routes, e.g. after drones moved or zones changed.
+        """
+        self._route_cache.clear()
+
+    def in_time_window(self, time_window: tuple, now) -> bool:
+        """
+        Checks if current time is within delivery's acceptable time range.
+        Times are minutes since midnight; "HH:MM" strings are also accepted.
+        """
+        now = to_minutes(now)
+        return to_minutes(time_window[0]) <= now <= to_minutes(time_window[1])
+
+    def intersects_no_fly_zone(self, start: tuple, end: tuple, current_time) -> bool:
+        """
+        Checks if the straight path between start and end intersects any active no-fly zone.
+        """
+        return self.zone_index.intersects(start, end, current_time)
+
+    def intersects_no_fly_zone_many(self, starts, ends, current_time):
+        """
+        Bulk version of intersects_no_fly_zone; returns a boolean array, one entry per segment.
+        """
+        return self.zone_index.intersects_many(starts, ends, current_time)
 
     @staticmethod
     def euclidean_distance(pos1: tuple, pos2: tuple) -> float:
         """
         Calculates Euclidean distance between two coordinate points.
         """
-        return ((pos1[0] - pos2[0]) ** 2 + (pos1[1] - pos2[1]) ** 2) ** 0.5
\ No newline at end of file
+        return ((pos1[0] - pos2[0]) ** 2 + (pos1[1] - pos2[1]) ** 2) ** 0.5
+
+
+def _drone_columns(drones) -> tuple:
+    """
+    Returns (max_weight, remaining_battery, start_pos) arrays, using a DroneFleet's arrays directly.
+    """
+    if hasattr(drones, "remaining_battery"):
+        return drones.max_weight, drones.remaining_battery, drones.start_pos
+    return (
+        np.array([drone.max_weight for drone in drones], dtype=float),
+        np.array([drone.remaining_battery for drone in drones], dtype=float),
+        np.array([drone.start_pos for drone in drones], dtype=float).reshape(-1, 2)
+    )
+
+
+def _delivery_columns(deliveries) -> tuple:
+    """
+    Returns (weight, pos, time_window) arrays, using a DeliveryBatch's arrays directly.
+    """
+    if hasattr(deliveries, "time_window"):
+        return deliveries.weight, deliveries.pos, deliveries.time_window
+    return (
+        np.array([delivery.weight for delivery in deliveries], dtype=float),
+        np.array([delivery.pos for delivery in deliveries], dtype=float).reshape(-1, 2),
+        np.array([to_minutes_window(delivery.time_window) for delivery in deliveries], dtype=np.int64).reshape(-1, 2)
+    )
@@ -0,0 +1,295 @@
+# src/algorithms/evaluation.py
+
+import math
+import numpy as np
+from src.algorithms.astar import AStar
+from src.algorithms.csp import CSP
+from src.utils.spatial import NoFlyZoneIndex
+from src.utils.timeutils import minutes_to_timestr, to_minutes
+
+
+class FitnessTable:
+    """
+    Precomputed drone × delivery lookup tables used to score GA solutions.
+
+    The table is built once for a fixed current_time: validity comes from CSP,
+    path costs from A*, and fitness becomes a sum of table lookups.
+    """
+
+    mAh_per_meter = 5
+    penalty_factor = 0.1
+    priority_weight = 10  # Each priority point is multiplied by 10
+    infeasible = -math.inf  # Fitness of a solution breaking a constraint, below every feasible one
+
+    def __init__(self, drones: list, deliveries: list, csp: CSP, astar: AStar, current_time):
+        """
+        :param drones: List of Drone objects (rows of the table)
+        :param deliveries: List of Delivery objects (columns of the table)
+        :param csp: CSP instance used for the validity matrix
+        :param astar: AStar instance used for path costs
+        :param current_time: Time the table is valid for, in minutes since midnight
+        """
+        self._setup(drones, deliveries, csp, astar, current_time)
+
+        # Only pairs within weight and battery radius (CSP.candidate_pairs) go through the full checks
+        rows, cols = csp.candidate_pairs(drones, deliveries)
+        feasible = csp.feasibility_pairs(drones, deliveries, rows, cols, self.current_time)[0]
+        # Inactive drones get all-invalid rows, as in refresh_drone()
+        active = np.array([drone.active for drone in drones], dtype=bool)
+        feasible &= active[rows]
+        valid = np.zeros((len(drones), len(deliveries)), dtype=bool)
+        valid[rows[feasible], cols[feasible]] = True
+        self.valid = valid.tolist()
+
+        # Path costs are filled on first use, only valid pairs are ever searched
+        self.cost = [[None] * len(deliveries) for _ in drones]
+        self._arrays = None
+        # Pairs come sorted by row, so each drone's feasible columns are one slice
+        bounds = np.searchsorted(rows[feasible], np.arange(len(drones) + 1))
+        feasible_cols = cols[feasible].tolist()
+        self._candidates = [feasible_cols[a:b] for a, b in zip(bounds[:-1].tolist(), bounds[1:].tolist())]
+
+    @classmethod
+    def from_state(cls, drones: list, deliveries: list, csp: CSP, astar: AStar, state: dict):
+        """
+        Builds a table from export_state() output for the same drones and deliveries,
+        without repeating the validity checks or path searches.
+        """
+        table = cls.__new__(cls)
+        table._setup(drones, deliveries, csp, astar, state["current_time"])
+        table.load_state(state)
+        return table
+
+    def _setup(self, drones, deliveries, csp, astar, current_time):
+        self.drones = drones
+        self.deliveries = deliveries
+        self.csp = csp
+        self.astar = astar
+        self.current_time = to_minutes(current_time)
+
+        # id -> object / id -> row or column index
+        self.drone_by_id = {drone.id: drone for drone in drones}
+        self.delivery_by_id = {delivery.id: delivery for delivery in deliveries}
+        self.drone_index = {drone.id: i for i, drone in enumerate(drones)}
+        self.delivery_index = {delivery.id: j for j, delivery in enumerate(deliveries)}
+        self.priority_score = [delivery.priority * self.priority_weight for delivery in deliveries]
+
+    @property
+    def candidates(self) -> list:
+        """
+        Feasible delivery columns of each drone row, for operators that sample instead of scanning.
+        """
+        if self._candidates is None:
+            self._candidates = [[j for j, ok in enumerate(row) if ok] for row in self.valid]
+        return self._candidates
+
+    def path_cost(self, i: int, j: int) -> float:
+        """
+        Returns the A* path cost between drone row i and delivery column j
+        (the zone-aware route distance when the CSP routes around no-fly zones).
+        """
+        cost = self.cost[i][j]
+        if cost is None:
+            if self.csp.router is not None:
+                cost = self.csp.route(self.drones[i], self.deliveries[j], self.current_time)[0]
+            else:
+                from_id = f"DR{self.drones[i].id}"
+                to_id = f"D{self.deliveries[j].id + 80}"
+                cost, _ = self.astar.find_path(from_id, to_id)
+            self.cost[i][j] = cost
+        return cost
+
+    def fill_costs(self):
+        """
+        Fills the path costs of all valid pairs with one one-to-many search per drone.
+        Zone-aware routes depend on each drone's speed and are searched per pair.
+        """
+        if self.csp.router is not None:
+            for i in range(len(self.drones)):
+                for j, ok in enumerate(self.valid[i]):
+                    if ok:
+                        self.path_cost(i, j)
+            return
+
+        for i in range(len(self.drones)):
+            self._fill_row(i)
+
+    def score(self, i: int, j: int) -> float:
+        """
+        Returns the fitness contribution of assigning delivery j to drone i.
+        """
+        return self.priority_score[j] - self.path_cost(i, j) * self.mAh_per_meter * self.penalty_factor
+
+    def as_arrays(self) -> tuple:
+        """
+        Returns (valid, score) as dense NumPy arrays of shape (n_drones, n_deliveries).
+        Path costs of all valid pairs are filled first; invalid pairs score 0.
+        """
+        if self._arrays is None:
+            self.fill_costs()
+            valid = np.array(self.valid, dtype=bool).reshape(len(self.drones), len(self.deliveries))
+            score = np.zeros(valid.shape, dtype=float)
+            for i, j in zip(*np.nonzero(valid)):
+                score[i, j] = self.score(i, j)
+            self._arrays = (valid, score)
+        return self._arrays
+
+    def export_state(self) -> dict:
+        """
+        Returns the computed validity, costs and arrays, so another process holding the
+        same problem can adopt them with load_state() instead of recomputing.
+        """
+        return {"current_time": self.current_time, "valid": self.valid, "cost": self.cost, "arrays": self._arrays}
+
+    def load_state(self, state: dict):
+        """
+        Adopts tables exported by export_state() for the same drones, deliveries and time.
+        """
+        if state["current_time"] != self.current_time:
+            raise ValueError("FitnessTable state was computed for a different current_time")
+        self.valid = state["valid"]
+        self.cost = state["cost"]
+        self._arrays = state["arrays"]
+        self._candidates = None
+
+    def add_delivery(self, delivery):
+        """
+        Appends a column for a new delivery. The deliveries list is shared with the
+        optimizer and CSP, so the delivery is appended to it here.
+        """
+        j = len(self.deliveries)
+        self.deliveries.append(delivery)
+        self.delivery_by_id[delivery.id] = delivery
+        self.delivery_index[delivery.id] = j
+        self.priority_score.append(delivery.priority * self.priority_weight)
+        column = self.csp.feasibility_matrix(self.drones, [delivery], self.current_time)[0][:, 0]
+        # Inactive drones keep all-invalid rows, as in refresh_drone()
+        column = (column & np.array([drone.active for drone in self.drones], dtype=bool)).tolist()
+        for i, ok in enumerate(column):
+            self.valid[i].append(ok)
+            self.cost[i].append(None)
+        self._candidates = None
+
+        if self._arrays is not None:
+            self._fill_column(j)
+            valid, score = self._arrays
+            column_valid = np.array([row[j] for row in self.valid], dtype=bool)
+            column_score = np.array([self.score(i, j) if ok else 0.0 for i, ok in enumerate(column_valid)])
+            self._arrays = (np.column_stack((valid, column_valid)), np.column_stack((score, column_score)))
+
+    def remove_delivery(self, delivery_id):
+        """
+        Drops a delivery's column (and removes it from the shared deliveries list).
+        """
+        j = self.delivery_index.pop(delivery_id)
+        del self.delivery_by_id[delivery_id]
+        del self.deliveries[j]
+        del self.priority_score[j]
+        for i in range(len(self.drones)):
+            del self.valid[i][j]
+            del self.cost[i][j]
+        for k in range(j, len(self.deliveries)):
+            self.delivery_index[self.deliveries[k].id] = k
+        self._candidates = None
+
+        if self._arrays is not None:
+            valid, score = self._arrays
+            self._arrays = (np.delete(valid, j, axis=1), np.delete(score, j, axis=1))
+
+    def refresh_drone(self, drone_id):
+        """
+        Recomputes a drone's row after its position, battery or load changed.
+        An inactive drone gets an all-invalid row.
+        """
+        i = self.drone_index[drone_id]
+        drone = self.drones[i]
+        row = self.csp.feasibility_matrix([drone], self.deliveries, self.current_time)[0][0]
+        self.valid[i] = (row & drone.active).tolist()
+        self.cost[i] = [None] * len(self.deliveries)
+        self._candidates = None
+
+        if self._arrays is not None:
+            if self.csp.router is None:
+                self._fill_row(i)
+            valid, score = self._arrays
+            valid[i] = self.valid[i]
+            score[i] = [self.score(i, j) if ok else 0.0 for j, ok in enumerate(self.valid[i])]
+
+    def apply_noflyzone(self, zone):
+        """
+        Invalidates pairs whose straight path crosses a newly added zone active at current_time.
+        (Zone-aware routing re-validates every pair instead, as routes may now detour.)
+        """
+        if self.csp.router is not None:
+            for drone in self.drones:
+                self.refresh_drone(drone.id)
+            return
+
+        pairs = [(i, j) for i in range(len(self.drones)) for j, ok in enumerate(self.valid[i]) if ok]
+        if not pairs:
+            return
+        blocked = NoFlyZoneIndex([zone]).intersects_many(
+            [self.drones[i].start_pos for i, _ in pairs],
+            [self.deliveries[j].pos for _, j in pairs],
+            self.current_time
+        )
+        for (i, j), hit in zip(pairs, blocked.tolist()):
+            if hit:
+                self.valid[i][j] = False
+                self._candidates = None
+                if self._arrays is not None:
+                    self._arrays[0][i, j] = False
+                    self._arrays[1][i, j] = 0.0
+
+    def _fill_row(self, i: int):
+        """
+        Fills a drone row's missing path costs with one one-to-many search from the drone.
+        """
+        pending = [j for j, ok in enumerate(self.valid[i]) if ok and self.cost[i][j] is None]
+        if not pending:
+            return
+        targets = {f"D{self.deliveries[j].id + 80}": j for j in pending}
+        for to_id, cost in self.astar.costs_from(f"DR{self.drones[i].id}", targets).items():
+            self.cost[i][targets[to_id]] = cost
+
+    def _fill_column(self, j: int):
+        """
+        Fills a delivery column's path costs with one search from the delivery (undirected graph).
+        """
+        rows = [i for i in range(len(self.drones)) if self.valid[i][j] and self.cost[i][j] is None]
+        if not rows or self.csp.router is not None:
+            return
+        sources = {f"DR{self.drones[i].id}": i for i in rows}
+        for from_id, cost in self.astar.costs_from(f"D{self.deliveries[j].id + 80}", sources).items():
+            self.cost[sources[from_id]][j] = cost
+
+    def fitness(self, solution) -> float:
+        """
+        Fitness = (total_priority_score) - (energy_cost * penalty_factor)
+
+        Returns FitnessTable.infeasible if a drone or a delivery is used twice or any
+        pair is invalid, so such a solution never outranks a feasible one (even a net-negative one).
+        """
+        total_energy = 0
+        total_priority_score = 0
+        seen_drones = set()
+        seen_deliveries = set()
+
+        for drone_id, delivery_id in solution:
+            if drone_id in seen_drones or delivery_id in seen_deliveries:
+                return self.infeasible
+            seen_drones.add(drone_id)
+            seen_deliveries.add(delivery_id)
+
+            i = self.drone_index[drone_id]
+            j = self.delivery_index[delivery_id]
+            if not self.valid[i][j]:
+                return self.infeasible
+
+            total_energy += self.path_cost(i, j) * self.mAh_per_meter
+            total_priority_score += self.priority_score[j]
+
+        return total_priority_score - total_energy * self.penalty_factor
+
+    def __repr__(self):
+        return f"<FitnessTable drones={len(self.drones)} deliveries={len(self.deliveries)} time={minutes_to_timestr(self.current_time)}>"
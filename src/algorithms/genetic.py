@@ -1,84 +1,174 @@
 import random
-from copy import deepcopy
+import threading
+import time
 from src.algorithms.astar import AStar
 from src.algorithms.csp import CSP
+from src.algorithms.evaluation import FitnessTable
+from src.algorithms.parallel import PopulationScorer
+from src.algorithms.vectorized import VectorizedGA
+from src.utils.timeutils import to_minutes
 
 
 class GeneticOptimizer:
     """
     Genetic Algorithm to optimize drone delivery assignments.
+
+    Two engines are available: "python" evolves lists of (drone_id, delivery_id)
+    tuples, "numpy" evolves the whole population as one array (see VectorizedGA).
     """
 
-    def __init__(self, drones, deliveries, noflyzones, graph, positions, current_time, verbose=False):
+    engines = ("python", "numpy")
+    elite_count = 1
+    parent_pool_size = 5
+
+    def __init__(self, drones, deliveries, noflyzones, graph, positions, current_time, verbose=False,
+                 engine="python", seed=None, zone_routing=False, stats=None):
+        if engine not in self.engines:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {self.engines}")
         self.drones = drones
         self.deliveries = deliveries
         self.noflyzones = noflyzones
         self.graph = graph
         self.positions = positions
-        self.current_time = current_time
+        self.current_time = to_minutes(current_time)  # Minutes since midnight
         self.verbose = verbose
-        self.csp = CSP(drones, deliveries, noflyzones)
-        self.astar = AStar(graph, positions)
+        self.engine = engine
+        self.seed = seed
+        # Without a seed the global random module is used, as before
+        self.rng = random.Random(seed) if seed is not None else random
+        self.zone_routing = zone_routing
+        # Optional Instrumentation shared with A* and CSP; None keeps every hook to one attribute check
+        self.stats = stats
+        self.astar = AStar(graph, positions, stats=stats)
+        # With zone_routing, drones detour around or wait out active no-fly zones (AStar.find_path_timed)
+        self.csp = CSP(drones, deliveries, noflyzones, router=self.astar if zone_routing else None, stats=stats)
         self.debug_print_limit = 10
         self.debug_print_count = 0
 
+        # Lookup tables are rebuilt whenever current_time changes
+        self._table = None
+        self._fitness_cache = {}
+        self._scorer = None
+        self.population = []  # Final population of the last run
+        self.best_so_far = ([], None)  # (solution, fitness), updated while run() is in progress
+        self._cancelled = threading.Event()
+
+    @property
+    def table(self) -> FitnessTable:
+        """
+        Returns the FitnessTable for the current time, building it on first use.
+        """
+        if self._table is None or self._table.current_time != to_minutes(self.current_time):
+            if self.stats is not None:
+                with self.stats.timer("ga.table"):
+                    self._table = FitnessTable(self.drones, self.deliveries, self.csp, self.astar, self.current_time)
+            else:
+                self._table = FitnessTable(self.drones, self.deliveries, self.csp, self.astar, self.current_time)
+            self._fitness_cache.clear()
+        return self._table
+
+    def load_table(self, state: dict):
+        """
+        Adopts a FitnessTable exported (FitnessTable.export_state) by another optimizer
+        for the same problem instead of building one.
+        """
+        self.current_time = state["current_time"]
+        self._table = FitnessTable.from_state(self.drones, self.deliveries, self.csp, self.astar, state)
+        self._fitness_cache.clear()
+
     def generate_initial_population(self, size=10):
+        """
+        Each individual visits deliveries in its own shuffled order and gives every
+        drone the first feasible delivery that is still free. Only column indices
+        are shuffled, and each drone only looks at its feasible candidates.
+        """
+        table = self.table
+        candidates = table.candidates
         population = []
         for _ in range(size):
             solution = []
-            available_deliveries = deepcopy(self.deliveries)
-            random.shuffle(available_deliveries)
-
-            for drone in self.drones:
-                for delivery in available_deliveries:
-                    if self.csp.is_delivery_valid(drone, delivery, self.current_time, verbose=False):
-                        solution.append((drone.id, delivery.id))
-                        available_deliveries.remove(delivery)
-                        break
+            order = list(range(len(self.deliveries)))
+            self.rng.shuffle(order)
+            rank = [0] * len(order)
+            for k, j in enumerate(order):
+                rank[j] = k
+            used = set()
+
+            for i, drone in enumerate(self.drones):
+                free = [j for j in candidates[i] if j not in used]
+                if free:
+                    j = min(free, key=rank.__getitem__)
+                    solution.append((drone.id, self.deliveries[j].id))
+                    used.add(j)
             population.append(solution)
         return population
 
     def fitness(self, solution):
         """
         Fitness = (total_priority_score) - (energy_cost * penalty_factor)
+
+        Scores are summed from the FitnessTable and memoized per chromosome.
         """
-        total_energy = 0
-        total_priority_score = 0
-        seen_drones = set()
-        mAh_per_meter = 5
-        penalty_factor = 0.1
-        priority_weight = 10  # ⬅️ Her priority puanı 10 ile çarpılıyor
+        key = tuple(solution)
+        if self.stats is not None:
+            self.stats.count("ga.fitness.calls")
+            self.stats.count("ga.fitness.cache_hits" if key in self._fitness_cache else "ga.fitness.cache_misses")
+        if key in self._fitness_cache:
+            return self._fitness_cache[key]
 
-        for drone_id, delivery_id in solution:
-            if drone_id in seen_drones:
-                return 0
-            seen_drones.add(drone_id)
+        table = self.table
+        value = table.fitness(solution)
+        if self.verbose:
+            self.print_solution_debug(solution)
 
-            drone = next(d for d in self.drones if d.id == drone_id)
-            delivery = next(d for d in self.deliveries if d.id == delivery_id)
+        self._fitness_cache[key] = value
+        return value
 
-            if not self.csp.is_delivery_valid(drone, delivery, self.current_time, verbose=False):
-                return 0
+    def invalidate(self):
+        """
+        Forgets memoized fitness values, e.g. after the FitnessTable was patched in place.
+        """
+        self._fitness_cache.clear()
 
-            from_id = f"DR{drone.id}"
-            to_id = f"D{delivery.id + 80}"
-            cost, _ = self.astar.find_path(from_id, to_id)
+    def score_population(self, population):
+        """
+        Fills the fitness cache for every unscored individual, on the worker pool if one is running.
+        """
+        if self._scorer is None:
+            for solution in population:
+                self.fitness(solution)
+            return
 
-            energy_used = cost * mAh_per_meter
-            total_energy += energy_used
-            total_priority_score += delivery.priority * priority_weight
+        self.table  # Clears the cache if current_time changed
+        pending = list({tuple(solution): solution for solution in population if tuple(solution) not in self._fitness_cache}.items())
+        scores = self._scorer.score([solution for _, solution in pending])
+        for (key, solution), value in zip(pending, scores):
+            self._fitness_cache[key] = value
+            if self.verbose:
+                self.print_solution_debug(solution)
 
+    def print_solution_debug(self, solution):
+        """
+        Prints distance and travel time for each valid gene, up to debug_print_limit lines.
+        """
+        table = self.table
+        for drone_id, delivery_id in solution:
+            if self.debug_print_count >= self.debug_print_limit:
+                return
+            i = table.drone_index[drone_id]
+            j = table.delivery_index[delivery_id]
+            if not table.valid[i][j]:
+                return
+
+            drone = table.drones[i]
+            cost = table.path_cost(i, j)
             if drone.speed > 0:
                 travel_time = cost / drone.speed
             else:
                 travel_time = float("inf")
 
-            if self.verbose and self.debug_print_count < self.debug_print_limit:
-                print(f"Drone#{drone.id} → Delivery#{delivery.id} | Distance: {cost:.2f} m | Speed: {drone.speed} m/s | Time: {travel_time:.2f} sec")
-                self.debug_print_count += 1
-
-        penalty = total_energy * penalty_factor
-        return total_priority_score - penalty
+            print(f"Drone#{drone.id} → Delivery#{delivery_id} | Distance: {cost:.2f} m | Speed: {drone.speed} m/s | Time: {travel_time:.2f} sec")
+            self.debug_print_count += 1
 
     def crossover(self, parent1, parent2):
         mid = len(parent1) // 2
@@ -86,40 +176,171 @@ class GeneticOptimizer:
         return child
 
     def mutate(self, solution, mutation_rate=0.2):
-        if random.random() < mutation_rate and solution:
-            i = random.randint(0, len(solution) - 1)
+        if self.rng.random() < mutation_rate and solution:
+            i = self.rng.randint(0, len(solution) - 1)
             drone_id, _ = solution[i]
-            drone = next(d for d in self.drones if d.id == drone_id)
-            assigned_ids = [dlv_id for _, dlv_id in solution]
-            unassigned = [d for d in self.deliveries if d.id not in assigned_ids]
-            random.shuffle(unassigned)
-
-            for new_delivery in unassigned:
-                if self.csp.is_delivery_valid(drone, new_delivery, self.current_time, verbose=False):
-                    solution[i] = (drone_id, new_delivery.id)
-                    break
+            table = self.table
+            assigned_ids = {dlv_id for _, dlv_id in solution}
+            options = [j for j in table.candidates[table.drone_index[drone_id]]
+                       if self.deliveries[j].id not in assigned_ids]
+            if options:
+                solution[i] = (drone_id, self.deliveries[self.rng.choice(options)].id)
         return solution
 
-    def run(self, generations=30, population_size=10):
-        population = self.generate_initial_population(population_size)
+    def evolve(self, generations=30, population_size=10, initial_population=None):
+        """
+        Runs the list-based engine and returns the best solution found.
+
+        :param initial_population: Optional solutions to warm-start from; the rest is generated
+        """
+        best = None
+        for _, best, _ in self._evolve_steps(generations, population_size, initial_population):
+            pass
+        return best
 
-        for _ in range(generations):
+    def _evolve_steps(self, generations, population_size, initial_population=None):
+        """
+        List engine as a generator: yields (generation, best_solution, best_fitness) of each
+        scored population, ending with the final one. generations=None runs until the consumer stops.
+        """
+        population = [list(solution) for solution in (initial_population or [])][:population_size]
+        population += self.generate_initial_population(population_size - len(population))
+        self.population = population
+
+        generation = 0
+        while generations is None or generation < generations:
+            start = time.perf_counter()
+            self.score_population(population)
             population.sort(key=self.fitness, reverse=True)
-            new_population = [population[0]]  # Elitism
+            best = population[0]
+            if self.stats is not None:
+                values = [self._fitness_cache[tuple(solution)] for solution in population]
+                feasible = [value for value in values if value > FitnessTable.infeasible] or [FitnessTable.infeasible]
+                self.stats.emit("generation", engine="python", generation=generation,
+                                best=values[0], mean=sum(feasible) / len(feasible))
+            new_population = population[:self.elite_count]  # Elitism
             while len(new_population) < population_size:
-                p1, p2 = random.sample(population[:5], 2)
+                p1, p2 = self.rng.sample(population[:self.parent_pool_size], 2)
                 child = self.crossover(p1, p2)
                 child = self.mutate(child)
                 new_population.append(child)
             population = new_population
+            self.population = population
+            if self.stats is not None:
+                self.stats.add_time("ga.generation", time.perf_counter() - start)
+            yield generation, list(best), self._fitness_cache[tuple(best)]
+            generation += 1
 
+        self.score_population(population)
         best = max(population, key=self.fitness)
+        yield generation, list(best), self._fitness_cache[tuple(best)]
+
+    def iterate(self, generations=30, population_size=10, workers=None, initial_population=None):
+        """
+        Anytime interface: yields (generation, best_solution, best_fitness) after every
+        generation, the best so far included. Stop early by breaking out of the loop;
+        generations=None keeps evolving until then.
+
+        :param workers: Number of processes used to score populations (python engine only)
+        :param initial_population: Optional solutions to warm-start from, e.g. a previous best
+        """
+        self._fitness_cache.clear()
+        if self.engine == "numpy":
+            engine = VectorizedGA(self.table, seed=self.seed)
+            if self.stats is not None:
+                engine.on_generation = self._observe_vectorized
+            initial = engine.encode_population(initial_population) if initial_population else None
+            steps = engine.steps(generations, population_size, self.elite_count, self.parent_pool_size, initial=initial)
+            try:
+                for generation, genome, value in steps:
+                    yield generation, engine.decode(genome), value
+            finally:
+                steps.close()
+                self.population = [engine.decode(row) for row in engine.top(self.parent_pool_size)]
+        elif workers and workers > 1:
+            with PopulationScorer(workers, self.drones, self.deliveries, self.noflyzones,
+                                  self.graph, self.positions, self.current_time, self.zone_routing) as scorer:
+                self._scorer = scorer
+                try:
+                    yield from self._evolve_steps(generations, population_size, initial_population)
+                finally:
+                    self._scorer = None
+        else:
+            yield from self._evolve_steps(generations, population_size, initial_population)
+
+    def cancel(self):
+        """
+        Asks run() to stop after the current generation; safe to call from another thread.
+        run() then returns the best solution found so far. A cancel issued before run()
+        starts stops it after its first generation; the request is cleared when run() returns.
+        """
+        self._cancelled.set()
+
+    def run(self, generations=30, population_size=10, workers=None, initial_population=None,
+            time_budget=None, patience=None, on_improvement=None):
+        """
+        Runs the selected engine and returns the best [(drone_id, delivery_id), ...] assignment.
+        The final population is kept in self.population (the top individuals for the numpy engine).
+
+        :param workers: Number of processes used to score populations (python engine only);
+                        None or 1 scores in this process. Results are identical either way.
+        :param initial_population: Optional solutions to warm-start from, e.g. a previous best
+        :param time_budget: Wall-clock limit in seconds, checked after every generation;
+                            with a budget, generations=None runs until the budget is spent
+        :param patience: Stop after this many generations without improvement of the best fitness
+        :param on_improvement: Optional callback(generation, solution, fitness) called whenever
+                               the best solution improves; the latest is also in self.best_so_far
+        """
+        run_start = time.perf_counter()
+        deadline = run_start + time_budget if time_budget is not None else None
+        if generations is None and deadline is None and patience is None:
+            raise ValueError("generations=None needs a time_budget or patience to stop")
+
+        best, best_value, stale = [], None, 0
+        self.best_so_far = (best, best_value)
+        steps = self.iterate(generations, population_size, workers, initial_population)
+        try:
+            for generation, solution, value in steps:
+                if best_value is None or value > best_value:
+                    best, best_value, stale = solution, value, 0
+                    self.best_so_far = (best, best_value)
+                    if on_improvement is not None:
+                        on_improvement(generation, best, best_value)
+                else:
+                    stale += 1
+
+                if self._cancelled.is_set():
+                    break
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+                if patience is not None and stale >= patience:
+                    break
+        finally:
+            steps.close()
+            self._cancelled.clear()
+
+        if self.stats is not None:
+            self.stats.add_time("ga.run", time.perf_counter() - run_start)
+            self.stats.emit("run_end", engine=self.engine, generations=generation, best=best_value)
 
         if self.verbose:
             print("\n[!] En iyi çözüme ait eşleşme detayları:")
-            for drone_id, delivery_id in best:
-                drone = next(d for d in self.drones if d.id == drone_id)
-                delivery = next(d for d in self.deliveries if d.id == delivery_id)
-                self.csp.is_delivery_valid(drone, delivery, self.current_time, verbose=True)
+            table = self.table
+            drones = [table.drone_by_id[drone_id] for drone_id, _ in best]
+            deliveries = [table.delivery_by_id[delivery_id] for _, delivery_id in best]
+            _, reasons = self.csp.feasibility_matrix(drones, deliveries, self.current_time)
+            pairs = [(k, k) for k in range(len(best))]
+            for message in self.csp.reason_messages(drones, deliveries, reasons, self.current_time, pairs):
+                print(message)
 
-        return best
\ No newline at end of file
+        return best
+
+    def _observe_vectorized(self, generation, population, fitness, seconds):
+        """
+        VectorizedGA per-generation hook, forwarded to the instrumentation.
+        """
+        self.stats.add_time("ga.generation", seconds)
+        self.stats.count("ga.fitness.calls", len(population))
+        feasible = fitness[fitness > FitnessTable.infeasible]
+        self.stats.emit("generation", engine="numpy", generation=generation, best=float(fitness.max()),
+                        mean=float(feasible.mean()) if len(feasible) else FitnessTable.infeasible)
@@ -0,0 +1,177 @@
+# src/algorithms/islands.py
+
+import multiprocessing
+import random
+from src.algorithms.genetic import GeneticOptimizer
+from src.algorithms.vectorized import VectorizedGA
+
+# Per-process optimizer, built once by the pool initializer
+_worker_optimizer = None
+
+
+def _init_worker(drones, deliveries, noflyzones, graph, positions, current_time, engine, zone_routing, table_state):
+    """
+    Pool initializer: receives the static problem data and the parent's FitnessTable once,
+    so workers never repeat the validity checks or path searches.
+    """
+    global _worker_optimizer
+    _worker_optimizer = GeneticOptimizer(drones, deliveries, noflyzones, graph, positions, current_time,
+                                         engine=engine, zone_routing=zone_routing)
+    _worker_optimizer.load_table(table_state)
+
+
+def _evolve_island(task):
+    """
+    Evolves one island for one epoch and returns its population sorted by decreasing fitness,
+    with the matching fitness values.
+    """
+    population, generations, seed = task
+    optimizer = _worker_optimizer
+    optimizer.invalidate()
+    table = optimizer.table
+
+    if optimizer.engine == "numpy":
+        engine = VectorizedGA(table, seed=seed)
+        initial = engine.encode_population(population)
+        engine.run(generations, len(population), optimizer.elite_count, optimizer.parent_pool_size, initial=initial)
+        population = [engine.decode(row) for row in engine.population]
+    else:
+        optimizer.rng = random.Random(seed)
+        optimizer.evolve(generations, len(population), population)
+        population = optimizer.population
+
+    scored = sorted(((table.fitness(solution), solution) for solution in population), key=lambda item: -item[0])
+    return [solution for _, solution in scored], [value for value, _ in scored]
+
+
+class IslandModel:
+    """
+    Island-model Genetic Algorithm over a process pool.
+
+    Each island is an independent sub-population evolved by GeneticOptimizer
+    (either engine). Every migration_interval generations the islands' best
+    individuals migrate along the topology and replace the worst individuals of
+    the receiving island. Problem data and the parent's precomputed FitnessTable
+    are handed to each worker once through the pool initializer; only populations
+    cross process boundaries afterwards. Every island
+    epoch gets its own seed, so results do not depend on the number of workers.
+
+    Topologies:
+    - "ring": island i sends to island i + 1
+    - "complete": every island sends to every other island
+    - "random": each island sends to one random other island per epoch
+    """
+
+    topologies = ("ring", "complete", "random")
+
+    def __init__(self, drones, deliveries, noflyzones, graph, positions, current_time, islands=4,
+                 migration_interval=5, migrants=1, topology="ring", engine="python", seed=None,
+                 workers=None, zone_routing=False, verbose=False):
+        """
+        :param islands: Number of sub-populations
+        :param migration_interval: Generations between migrations
+        :param migrants: Individuals each island sends per migration
+        :param workers: Worker processes; defaults to min(islands, cpu_count)
+        """
+        if topology not in self.topologies:
+            raise ValueError(f"Unknown topology {topology!r}, expected one of {self.topologies}")
+        if engine not in GeneticOptimizer.engines:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {GeneticOptimizer.engines}")
+        self.islands = islands
+        self.migration_interval = max(1, migration_interval)
+        self.migrants = migrants
+        self.topology = topology
+        self.engine = engine
+        self.seed = seed
+        self.verbose = verbose
+        self.workers = workers or min(islands, multiprocessing.cpu_count())
+        self.rng = random.Random(seed)
+        self._initargs = (drones, deliveries, noflyzones, graph, positions, current_time, engine, zone_routing)
+
+        # Used to seed islands and score results in this process
+        self.optimizer = GeneticOptimizer(drones, deliveries, noflyzones, graph, positions, current_time,
+                                          engine=engine, seed=seed, zone_routing=zone_routing)
+        self.populations = []
+        self.history = []  # Best fitness per island after each epoch
+
+    def destinations(self, island: int) -> list:
+        """
+        Islands receiving island's migrants in the current epoch.
+        """
+        others = [k for k in range(self.islands) if k != island]
+        if not others:
+            return []
+        if self.topology == "ring":
+            return [(island + 1) % self.islands]
+        if self.topology == "complete":
+            return others
+        return [self.rng.choice(others)]
+
+    def migrate(self, populations: list, fitness: list):
+        """
+        Replaces each island's worst individuals with the elites sent to it.
+        Populations are sorted by decreasing fitness.
+        """
+        incoming = [[] for _ in populations]
+        for island, population in enumerate(populations):
+            elites = [list(solution) for solution in population[:self.migrants]]
+            for destination in self.destinations(island):
+                incoming[destination].extend(zip(fitness[island][:self.migrants], elites))
+
+        for island, arrivals in enumerate(incoming):
+            if not arrivals:
+                continue
+            population, values = populations[island], fitness[island]
+            arrivals = sorted(arrivals, key=lambda item: -item[0])[:max(0, len(population) - 1)]
+            for k, (value, solution) in enumerate(arrivals, start=1):
+                population[-k], values[-k] = solution, value
+
+    def run(self, generations=30, population_size=10) -> list:
+        """
+        Evolves all islands for the given number of generations and returns the best
+        [(drone_id, delivery_id), ...] assignment found on any island.
+
+        :param population_size: Individuals per island
+        """
+        # Sorted like the epoch results, so generations=0 returns the best initial individual
+        table = self.optimizer.table
+        populations = [sorted(self.optimizer.generate_initial_population(population_size), key=table.fitness, reverse=True)
+                       for _ in range(self.islands)]
+        fitness = [[table.fitness(solution) for solution in population] for population in populations]
+        self.history = []
+
+        # Costs are computed once here and shipped to every worker with the rest of the problem
+        if self.engine == "numpy":
+            table.as_arrays()
+        else:
+            table.fill_costs()
+        initargs = self._initargs + (table.export_state(),)
+
+        with multiprocessing.Pool(processes=self.workers, initializer=_init_worker, initargs=initargs) as pool:
+            done = 0
+            epoch = 0
+            while done < generations:
+                step = min(self.migration_interval, generations - done)
+                tasks = [(population, step, self._island_seed(island, epoch))
+                         for island, population in enumerate(populations)]
+                results = pool.map(_evolve_island, tasks)
+                populations = [population for population, _ in results]
+                fitness = [values for _, values in results]
+                self.history.append([values[0] for values in fitness])
+                if self.verbose:
+                    bests = ", ".join(f"{values[0]:.2f}" for values in fitness)
+                    print(f"[!] Ada nesli {done + step}/{generations} → en iyi skorlar: {bests}")
+
+                done += step
+                epoch += 1
+                if done < generations:
+                    self.migrate(populations, fitness)
+
+        self.populations = populations
+        island = max(range(self.islands), key=lambda k: fitness[k][0])
+        return populations[island][0]
+
+    def _island_seed(self, island: int, epoch: int):
+        if self.seed is None:
+            return None
+        return (self.seed * 1_000_003 + island) * 1_000_003 + epoch
@@ -0,0 +1,73 @@
+# src/algorithms/parallel.py
+
+import multiprocessing
+from src.algorithms.astar import AStar
+from src.algorithms.csp import CSP
+from src.algorithms.evaluation import FitnessTable
+
+# Per-process FitnessTable, built once by the pool initializer
+_worker_table = None
+
+
+def _init_worker(drones, deliveries, noflyzones, graph, positions, current_time, zone_routing=False):
+    """
+    Pool initializer: receives the static problem data once and builds the worker's table.
+    """
+    global _worker_table
+    astar = AStar(graph, positions)
+    csp = CSP(drones, deliveries, noflyzones, router=astar if zone_routing else None)
+    _worker_table = FitnessTable(drones, deliveries, csp, astar, current_time)
+
+
+def _score_chunk(solutions):
+    """
+    Scores a chunk of solutions with the worker's table.
+    """
+    return [_worker_table.fitness(solution) for solution in solutions]
+
+
+class PopulationScorer:
+    """
+    Scores GA populations on a process pool.
+
+    Drones, deliveries, no-fly zones and the graph are handed to each worker once
+    through the pool initializer; only solutions and scores cross process
+    boundaries afterwards. Scores come back in input order, so results do not
+    depend on the number of workers.
+    """
+
+    def __init__(self, workers: int, drones, deliveries, noflyzones, graph, positions, current_time,
+                 zone_routing=False):
+        """
+        :param workers: Number of worker processes
+        :param zone_routing: Route around no-fly zones in the workers' CSP (see GeneticOptimizer)
+        """
+        self.workers = workers
+        self.pool = multiprocessing.Pool(
+            processes=workers,
+            initializer=_init_worker,
+            initargs=(drones, deliveries, noflyzones, graph, positions, current_time, zone_routing)
+        )
+
+    def score(self, solutions: list) -> list:
+        """
+        Returns the fitness of each solution, in the same order.
+        """
+        if not solutions:
+            return []
+        chunk_size = -(-len(solutions) // self.workers)  # ceil division
+        chunks = [solutions[k:k + chunk_size] for k in range(0, len(solutions), chunk_size)]
+        return [value for chunk in self.pool.map(_score_chunk, chunks) for value in chunk]
+
+    def close(self):
+        """
+        Shuts down the worker processes.
+        """
+        self.pool.close()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,161 @@
+# src/algorithms/planner.py
+
+from src.algorithms.genetic import GeneticOptimizer
+from src.utils.graph_builder import ImplicitCompleteGraph, build_positions
+from src.utils.timeutils import to_minutes
+
+
+class DispatchPlanner:
+    """
+    Long-lived planner for a stream of orders and drone updates.
+
+    Wraps a GeneticOptimizer and keeps its graph, FitnessTable and last
+    population alive between re-plans. Each update patches only the affected
+    node, table row or column, and replan() warm-starts the GA from the
+    previous population, so one new order costs one table column plus a short
+    GA run instead of a full rebuild.
+
+    The graph is a complete Euclidean graph: adding a node never shortens a
+    path between existing nodes (the direct edge already is the shortest), so
+    cached paths stay valid; moving a drone drops the A* cache.
+
+    The planner takes ownership of the Drone objects it is given:
+    update_drone_state() writes field reports (position, battery, load, active)
+    onto them, and complete_delivery() sets delivered on the Delivery. Pass
+    copies if the caller's objects must stay untouched.
+    """
+
+    def __init__(self, drones: list, deliveries: list, noflyzones: list, current_time, engine="python",
+                 seed=None, generations=30, population_size=10, zone_routing=False, verbose=False):
+        """
+        :param current_time: Planning time in minutes since midnight ("HH:MM" strings are accepted)
+        :param generations: Generations of the first plan; later re-plans default to a third of it
+        :param population_size: GA population size, kept between re-plans
+        """
+        self.positions = build_positions(drones, deliveries)
+        self.graph = ImplicitCompleteGraph(self.positions)
+        self.optimizer = GeneticOptimizer(
+            drones=drones,
+            deliveries=list(deliveries),
+            noflyzones=list(noflyzones),
+            graph=self.graph,
+            positions=self.positions,
+            current_time=current_time,
+            verbose=verbose,
+            engine=engine,
+            seed=seed,
+            zone_routing=zone_routing
+        )
+        self.generations = generations
+        self.replan_generations = max(1, generations // 3)
+        self.population_size = population_size
+        self.best = []
+        self.population = []
+
+    @property
+    def drones(self) -> list:
+        return self.optimizer.drones
+
+    @property
+    def deliveries(self) -> list:
+        """
+        Open deliveries (completed ones are removed).
+        """
+        return self.optimizer.deliveries
+
+    def add_delivery(self, delivery):
+        """
+        Registers a new order: adds its graph node and one table column.
+        """
+        node_id = f"D{delivery.id + 80}"
+        self.positions[node_id] = delivery.pos
+        self.graph.add_node(node_id, delivery.pos)
+        self.optimizer.table.add_delivery(delivery)
+        self.optimizer.invalidate()
+
+    def complete_delivery(self, delivery_id):
+        """
+        Marks a delivery as done and drops its table column and genes.
+        """
+        table = self.optimizer.table
+        delivery = table.delivery_by_id[delivery_id]
+        delivery.delivered = True
+        table.remove_delivery(delivery_id)
+        self.optimizer.invalidate()
+        self._prune()
+
+    def update_drone_state(self, drone_id, position=None, remaining_battery=None, carrying_weight=None, active=None):
+        """
+        Updates a drone after a report from the field and recomputes its table row.
+        The caller's Drone object is modified in place; a new position becomes the
+        start of the drone's next flight.
+        """
+        table = self.optimizer.table
+        drone = table.drone_by_id[drone_id]
+        if position is not None:
+            drone.current_pos = position
+            drone.start_pos = position
+            node_id = f"DR{drone.id}"
+            self.positions[node_id] = position
+            self.graph.add_node(node_id, position)
+            self.optimizer.astar.refresh()
+            self.optimizer.astar.clear_cache()
+            self.optimizer.csp.clear_route_cache()
+        if remaining_battery is not None:
+            drone.remaining_battery = remaining_battery
+        if carrying_weight is not None:
+            drone.carrying_weight = carrying_weight
+        if active is not None:
+            drone.active = active
+
+        table.refresh_drone(drone_id)
+        self.optimizer.invalidate()
+        self._prune()
+
+    def add_noflyzone(self, zone):
+        """
+        Registers a new no-fly zone and invalidates the pairs it blocks.
+        """
+        self.optimizer.csp.add_noflyzone(zone)
+        self.optimizer.astar.zone_state = self.optimizer.csp.zone_state
+        self.optimizer.table.apply_noflyzone(zone)
+        self.optimizer.invalidate()
+        self._prune()
+
+    def set_time(self, current_time):
+        """
+        Moves the planning time; the table is rebuilt on the next re-plan.
+        """
+        self.optimizer.current_time = to_minutes(current_time)
+
+    def replan(self, generations=None) -> list:
+        """
+        Re-optimizes from the previous population and returns the best
+        [(drone_id, delivery_id), ...] assignment.
+
+        :param generations: Defaults to the full count for the first plan, a third of it afterwards
+        """
+        if generations is None:
+            generations = self.generations if not self.population else self.replan_generations
+        initial = [self.best] + self.population if self.best else self.population
+        self.best = self.optimizer.run(generations, self.population_size, initial_population=initial)
+        self.population = self.optimizer.population
+        return self.best
+
+    def _prune(self):
+        """
+        Drops genes that became invalid (completed deliveries, moved drones, new zones)
+        from the kept population, so a warm start only contains feasible assignments.
+        """
+        table = self.optimizer.table
+
+        def feasible(gene):
+            drone_id, delivery_id = gene
+            j = table.delivery_index.get(delivery_id)
+            return j is not None and table.valid[table.drone_index[drone_id]][j]
+
+        self.best = [gene for gene in self.best if feasible(gene)]
+        self.population = [[gene for gene in solution if feasible(gene)] for solution in self.population]
+
+    def __repr__(self):
+        return f"<DispatchPlanner drones={len(self.drones)} deliveries={len(self.deliveries)}>"
@@ -0,0 +1,206 @@
+# src/algorithms/rolling.py
+
+import copy
+import math
+import multiprocessing
+import numpy as np
+from src.algorithms.csp import CSP
+from src.algorithms.evaluation import FitnessTable
+from src.algorithms.genetic import GeneticOptimizer
+from src.utils.graph_builder import ImplicitCompleteGraph, build_positions
+from src.utils.intervals import IntervalIndex
+from src.utils.timeutils import minutes_to_timestr
+
+
+def _solve_slot(task):
+    """
+    Plans one slot with its own GeneticOptimizer and returns
+    [(drone_id, delivery_id, distance, arrival_minute), ...] for the kept assignments.
+    """
+    drones, deliveries, noflyzones, current_time, engine, seed, generations, population_size, zone_routing = task
+    positions = build_positions(drones, deliveries)
+    optimizer = GeneticOptimizer(drones, deliveries, noflyzones, ImplicitCompleteGraph(positions), positions,
+                                 current_time, engine=engine, seed=seed, zone_routing=zone_routing)
+    solution = optimizer.run(generations, population_size)
+
+    # Keep feasible genes only, at most one delivery per drone and one drone per delivery
+    table = optimizer.table
+    used_drones, used_deliveries = set(), set()
+    flights = []
+    for drone_id, delivery_id in solution:
+        if drone_id in used_drones or delivery_id in used_deliveries:
+            continue
+        if not table.valid[table.drone_index[drone_id]][table.delivery_index[delivery_id]]:
+            continue
+        drone, delivery = table.drone_by_id[drone_id], table.delivery_by_id[delivery_id]
+        if zone_routing:
+            distance, _, arrival = optimizer.csp.route(drone, delivery, current_time)
+        else:
+            distance = CSP.euclidean_distance(drone.start_pos, delivery.pos)
+            arrival = current_time + distance / (drone.speed * 60.0) if drone.speed > 0 else math.inf
+        used_drones.add(drone_id)
+        used_deliveries.add(delivery_id)
+        flights.append((drone_id, delivery_id, distance, arrival))
+    return flights
+
+
+class RollingHorizonPlanner:
+    """
+    Plans a whole day as a sequence of time slots instead of one fixed current_time.
+
+    Slot start times are a minimum stabbing set of the delivery time windows
+    (IntervalIndex.stabbing_points), so every delivery is open at the start of
+    at least one slot, plus every moment a no-fly zone activates or expires while
+    deliveries are open, so a delivery blocked by a zone is retried once the zone
+    is lifted. Each slot only sees the open, undelivered deliveries and
+    the no-fly zones overlapping its flights, both looked up in interval indexes.
+    Drones that fly in a slot carry their new position and remaining battery
+    forward and stay busy until they arrive.
+
+    Consecutive slots whose drone sets (drones with a candidate delivery, see
+    CSP.candidate_pairs) and delivery sets are disjoint do not influence each
+    other and are solved in parallel as one batch.
+    """
+
+    mAh_per_meter = FitnessTable.mAh_per_meter
+
+    def __init__(self, drones: list, deliveries: list, noflyzones: list, engine="python", seed=None,
+                 generations=30, population_size=10, zone_routing=False, workers=None, verbose=False):
+        """
+        :param drones: Drones in their state at the start of the day (copied, the originals are not modified)
+        :param deliveries: Deliveries of the day (copied)
+        :param workers: Processes solving a batch of independent slots; 1 (or None) solves in-process
+        """
+        self.drones = copy.deepcopy(list(drones))
+        self.deliveries = copy.deepcopy(list(deliveries))
+        self.noflyzones = list(noflyzones)
+        self.engine = engine
+        self.seed = seed
+        self.generations = generations
+        self.population_size = population_size
+        self.zone_routing = zone_routing
+        self.workers = workers or 1
+        self.verbose = verbose
+
+        self.window_index = IntervalIndex([delivery.time_window for delivery in self.deliveries])
+        self.zone_index = IntervalIndex([zone.active_time for zone in self.noflyzones])
+        self.busy_until = {drone.id: -math.inf for drone in self.drones}
+
+        self.slots = []     # One dict per slot: time, end, drones, deliveries, zones, assignments, batch
+        self.schedule = []  # (depart_minute, drone_id, delivery_id, arrival_minute)
+
+    def slot_times(self) -> list:
+        """
+        Start minutes of the slots: one per group of delivery windows sharing a moment, and
+        each zone start or end (the minute after its last active one) while a delivery is open.
+        """
+        times = set(self.window_index.stabbing_points())
+        for start, end in zip(self.zone_index.starts.tolist(), self.zone_index.ends.tolist()):
+            times.update(t for t in (start, end + 1) if len(self.window_index.active_at(t)))
+        return sorted(times)
+
+    def slot_members(self, current_time: int, excluded=()) -> tuple:
+        """
+        Returns (drone rows, delivery columns) taking part in the slot starting at current_time:
+        open undelivered deliveries (minus excluded columns) and the available drones that can
+        reach at least one of them.
+        """
+        excluded = set(excluded)
+        columns = [j for j in self.window_index.active_at(current_time).tolist()
+                   if not self.deliveries[j].delivered and j not in excluded]
+        available = [i for i, drone in enumerate(self.drones)
+                     if drone.active and drone.remaining_battery > 0 and self.busy_until[drone.id] <= current_time]
+        if not columns or not available:
+            return [], columns
+
+        drones = [self.drones[i] for i in available]
+        deliveries = [self.deliveries[j] for j in columns]
+        rows, _ = CSP(drones, deliveries, []).candidate_pairs(drones, deliveries)
+        return [available[k] for k in np.unique(rows).tolist()], columns
+
+    def run(self) -> list:
+        """
+        Plans every slot and returns all [(drone_id, delivery_id), ...] assignments of the day in slot order.
+        """
+        times = self.slot_times()
+        self.slots, self.schedule = [], []
+        pool = multiprocessing.Pool(processes=self.workers) if self.workers > 1 else None
+        try:
+            batch, batch_drones, batch_deliveries = [], set(), set()
+            for k, current_time in enumerate(times):
+                rows, columns = self.slot_members(current_time)
+                # A delivery left open by an earlier slot of the batch is only known after solving it
+                if batch and (batch_drones.intersection(rows) or batch_deliveries.intersection(columns)):
+                    self._solve_batch(batch, pool)
+                    batch, batch_drones, batch_deliveries = [], set(), set()
+                    rows, columns = self.slot_members(current_time)
+
+                end = times[k + 1] if k + 1 < len(times) else None
+                batch.append((current_time, end, rows, columns))
+                if rows:
+                    batch_drones.update(rows)
+                    batch_deliveries.update(columns)
+            if batch:
+                self._solve_batch(batch, pool)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        return [(drone_id, delivery_id) for slot in self.slots for drone_id, delivery_id in slot["assignments"]]
+
+    def _solve_batch(self, batch: list, pool):
+        """
+        Solves a batch of independent slots (in parallel when a pool is given) and applies the
+        flights in slot order.
+        """
+        tasks, owners = [], []
+        for k, (current_time, _, rows, columns) in enumerate(batch):
+            if not rows or not columns:
+                continue
+            deliveries = [self.deliveries[j] for j in columns]
+            horizon = max(delivery.time_window[1] for delivery in deliveries)
+            zones = [self.noflyzones[z] for z in self.zone_index.overlapping(current_time, horizon).tolist()]
+            tasks.append(([self.drones[i] for i in rows], deliveries, zones, current_time, self.engine,
+                          self._slot_seed(len(self.slots) + k), self.generations, self.population_size,
+                          self.zone_routing))
+            owners.append(k)
+
+        results = pool.map(_solve_slot, tasks) if pool is not None and len(tasks) > 1 else list(map(_solve_slot, tasks))
+        flights_by_slot = dict(zip(owners, results))
+
+        batch_number = self.slots[-1]["batch"] + 1 if self.slots else 0
+        drone_by_id = {drone.id: drone for drone in self.drones}
+        delivery_by_id = {delivery.id: delivery for delivery in self.deliveries}
+        for k, (current_time, end, rows, columns) in enumerate(batch):
+            flights = flights_by_slot.get(k, [])
+            for drone_id, delivery_id, distance, arrival in flights:
+                drone, delivery = drone_by_id[drone_id], delivery_by_id[delivery_id]
+                drone.remaining_battery -= distance * self.mAh_per_meter
+                drone.current_pos = drone.start_pos = delivery.pos
+                self.busy_until[drone_id] = arrival
+                delivery.assigned_drone_id = drone_id
+                delivery.delivered = True
+                self.schedule.append((current_time, drone_id, delivery_id, arrival))
+
+            zones = self.zone_index.active_at(current_time).tolist()
+            self.slots.append({
+                "time": current_time,
+                "end": end,
+                "drones": [self.drones[i].id for i in rows],
+                "deliveries": [self.deliveries[j].id for j in columns],
+                "zones": [self.noflyzones[z].id for z in zones],
+                "assignments": [(drone_id, delivery_id) for drone_id, delivery_id, _, _ in flights],
+                "batch": batch_number,
+            })
+            if self.verbose:
+                print(f"[!] Zaman dilimi {minutes_to_timestr(current_time)} → {len(columns)} teslimat, "
+                      f"{len(rows)} uygun drone, {len(zones)} aktif yasak bölge, {len(flights)} atama")
+
+    def _slot_seed(self, slot: int):
+        if self.seed is None:
+            return None
+        return self.seed * 1_000_003 + slot
+
+    def __repr__(self):
+        return f"<RollingHorizonPlanner drones={len(self.drones)} deliveries={len(self.deliveries)} slots={len(self.slots)}>"
@@ -0,0 +1,362 @@
+# src/algorithms/simulator.py
+
+import copy
+import heapq
+import itertools
+import math
+import time
+from collections import deque
+import numpy as np
+import shapely
+from src.algorithms.astar import AStar
+from src.algorithms.evaluation import FitnessTable
+from src.utils.spatial import NoFlyZoneIndex
+from src.utils.timeutils import minutes_to_timestr, to_minutes
+
+
+class FleetSimulator:
+    """
+    Discrete-event simulation of a fleet flying a plan.
+
+    Events sit in one heap ordered by (minute, sequence): drones leave when their
+    next planned delivery is due, fly their path segment by segment at their
+    speed, drain mAh_per_meter per meter and hand over the package on arrival
+    (waiting for the window to open if early). No-fly zones switch on and off at
+    their active_time, and new orders can be released during the run. Nothing
+    happens between events, so simulated time advances as fast as the events
+    can be processed.
+
+    Flights follow AStar paths when an AStar is given, straight lines otherwise
+    (the geometry CSP checks without zone routing). Drones and deliveries are
+    copied, and a complete graph (which new orders extend) is routed on a copy
+    with its own positions, so the caller's objects are not modified.
+
+    KPIs (see kpis()): delivered, on_time, late, lateness, waiting, battery
+    failures, zone conflicts (a flown segment crossing an active zone, or a zone
+    switching on across a drone's remaining path), unreachable and duplicate
+    assignments, distance, energy, utilization and the simulation speed-up.
+    """
+
+    mAh_per_meter = FitnessTable.mAh_per_meter
+
+    def __init__(self, drones: list, deliveries: list, noflyzones: list, start_time=0, astar=None,
+                 dispatcher=None, verbose=False):
+        """
+        :param start_time: Simulation start, in minutes ("HH:MM" strings are accepted)
+        :param astar: Optional AStar whose graph contains "DR<id>" and "D<id + 80>" nodes
+        :param dispatcher: Optional callback(simulator, delivery) returning a drone id for a newly
+                           released order, or None to leave it unassigned
+        """
+        self.drones = copy.deepcopy(list(drones))
+        self.deliveries = copy.deepcopy(list(deliveries))
+        self.noflyzones = list(noflyzones)
+        self.zone_index = NoFlyZoneIndex(self.noflyzones)
+        self.now = float(to_minutes(start_time))
+        self.start_time = self.now
+        if astar is not None and getattr(astar.graph, "straight_line", False):
+            astar = AStar(copy.deepcopy(astar.graph), dict(astar.positions), cache_size=astar.cache_size,
+                          bidirectional=astar.bidirectional, stats=astar.stats)
+        self.astar = astar
+        self.dispatcher = dispatcher
+        self.verbose = verbose
+
+        self.drone_by_id = {drone.id: drone for drone in self.drones}
+        self.delivery_by_id = {delivery.id: delivery for delivery in self.deliveries}
+        self.node_of = {drone.id: f"DR{drone.id}" for drone in self.drones}  # Graph node of each drone's position
+        self.pending = {drone.id: deque() for drone in self.drones}  # (depart_minute, delivery_id) per drone
+        self.flights = {}  # drone_id -> in-flight state
+        self.busy_time = {drone.id: 0.0 for drone in self.drones}
+        self.log = []  # (minute, event, drone_id, delivery_id)
+
+        self.queue = []
+        self._sequence = itertools.count()
+        self._planned = set()  # Delivery ids already given to a drone
+        self._activity = 0  # Queued events other than zone switches
+        self.active_zones = set(np.nonzero(self.zone_index.active_mask(self.now))[0].tolist())
+        for z, (start, end) in enumerate(self.zone_index.windows.tolist()):
+            # Zones are active through their end minute
+            if start > self.now:
+                self.schedule(start, "zone_on", z)
+            if end + 1 > self.now:
+                self.schedule(end + 1, "zone_off", z)
+
+        self.counters = dict.fromkeys((
+            "events", "flights", "delivered", "on_time", "late", "battery_failures", "zone_conflicts",
+            "unreachable", "duplicate_assignments", "orders"), 0)
+        self.lateness = 0.0  # Minutes past window end, summed over late deliveries
+        self.waiting = 0.0   # Minutes spent waiting for windows to open
+        self.distance = 0.0
+        self.energy = 0.0
+        self.wall_seconds = 0.0
+
+    def schedule(self, minute: float, kind: str, *data):
+        """
+        Pushes an event; events at the same minute run in the order they were scheduled.
+        """
+        if kind not in ("zone_on", "zone_off"):
+            self._activity += 1
+        heapq.heappush(self.queue, (minute, next(self._sequence), kind, data))
+
+    def add_plan(self, assignments: list, depart=None):
+        """
+        Queues [(drone_id, delivery_id), ...] (e.g. GeneticOptimizer.run) for departure at
+        the given minute (default: now). A drone with several deliveries flies them in order.
+        """
+        depart = self.now if depart is None else float(to_minutes(depart))
+        for drone_id, delivery_id in assignments:
+            self._plan(depart, drone_id, delivery_id)
+
+    def add_schedule(self, schedule: list):
+        """
+        Queues (depart_minute, drone_id, delivery_id, ...) entries, e.g. RollingHorizonPlanner.schedule.
+        """
+        for depart, drone_id, delivery_id, *_ in sorted(schedule, key=lambda entry: entry[0]):
+            self._plan(float(depart), drone_id, delivery_id)
+
+    def add_delivery(self, delivery, release_time, drone_id=None):
+        """
+        Releases a new order at release_time. It goes to drone_id if given,
+        otherwise to the dispatcher's choice (if any).
+        """
+        self.schedule(float(to_minutes(release_time)), "order", copy.deepcopy(delivery), drone_id)
+
+    def run(self, until=None) -> dict:
+        """
+        Processes events in time order (up to minute until, if given) and returns kpis().
+        """
+        started = time.perf_counter()
+        handlers = {
+            "dispatch": self._on_dispatch,
+            "waypoint": self._on_waypoint,
+            "depleted": self._on_depleted,
+            "zone_on": self._on_zone_on,
+            "zone_off": self._on_zone_off,
+            "order": self._on_order,
+        }
+        queue = self.queue
+        while queue:
+            if until is not None and queue[0][0] > until:
+                break
+            if until is None and not self._activity:
+                break  # Only zone switches left, nothing more can happen to the fleet
+            minute, _, kind, data = heapq.heappop(queue)
+            if kind not in ("zone_on", "zone_off"):
+                self._activity -= 1
+            self.now = max(self.now, minute)
+            self.counters["events"] += 1
+            handlers[kind](*data)
+        if until is not None:
+            self.now = max(self.now, float(until))
+        self.wall_seconds += time.perf_counter() - started
+        return self.kpis()
+
+    def kpis(self) -> dict:
+        """
+        Key performance indicators of the run so far.
+        """
+        counters = self.counters
+        simulated = self.now - self.start_time
+        unserved = sum(not delivery.delivered for delivery in self.deliveries)
+        return {
+            **counters,
+            "unserved": unserved,
+            "on_time_rate": counters["on_time"] / counters["delivered"] if counters["delivered"] else None,
+            "mean_lateness": self.lateness / counters["late"] if counters["late"] else 0.0,
+            "waiting_minutes": self.waiting,
+            "distance_m": self.distance,
+            "energy_mAh": self.energy,
+            "utilization": (sum(self.busy_time.values()) / (simulated * len(self.drones))
+                            if simulated > 0 and self.drones else 0.0),
+            "simulated_minutes": simulated,
+            "wall_seconds": self.wall_seconds,
+            "speedup": simulated * 60 / self.wall_seconds if self.wall_seconds > 0 else None,
+        }
+
+    def _plan(self, depart: float, drone_id, delivery_id):
+        if delivery_id in self._planned:
+            self.counters["duplicate_assignments"] += 1
+            return
+        self._planned.add(delivery_id)
+        self.pending[drone_id].append((depart, delivery_id))
+        self.schedule(max(depart, self.now), "dispatch", drone_id)
+
+    def _route(self, drone, delivery) -> list:
+        """
+        Waypoints from the drone's position to the delivery, or [] if no path exists.
+        """
+        if self.astar is None:
+            return [tuple(drone.current_pos), tuple(delivery.pos)]
+        cost, path = self.astar.find_path(self.node_of[drone.id], f"D{delivery.id + 80}")
+        if not path or math.isinf(cost):
+            return []
+        return [tuple(self.astar.positions[node]) for node in path]
+
+    def _on_dispatch(self, drone_id):
+        drone = self.drone_by_id[drone_id]
+        queue = self.pending[drone_id]
+        if drone_id in self.flights or not queue or not drone.active:
+            return
+        depart, delivery_id = queue[0]
+        if depart > self.now:
+            return  # Its own dispatch event is still scheduled
+        queue.popleft()
+        delivery = self.delivery_by_id[delivery_id]
+        if delivery.delivered:
+            self.counters["duplicate_assignments"] += 1
+            self.schedule(self.now, "dispatch", drone_id)
+            return
+
+        waypoints = self._route(drone, delivery)
+        if len(waypoints) < 2 or drone.speed <= 0:
+            self.counters["unreachable"] += 1
+            self.schedule(self.now, "dispatch", drone_id)
+            return
+
+        self.counters["flights"] += 1
+        delivery.assigned_drone_id = drone_id
+        drone.carrying_weight += delivery.weight
+        self.flights[drone_id] = {
+            "delivery": delivery,
+            "waypoints": waypoints,
+            "leg": 0,
+            "leg_start": self.now,
+            "leg_end": self.now,
+            "departed": self.now,
+            "conflict": False,
+        }
+        self.log.append((self.now, "depart", drone_id, delivery_id))
+        self._start_leg(drone)
+
+    def _start_leg(self, drone):
+        """
+        Schedules the end of the drone's next path segment, or the moment its battery runs out on it.
+        """
+        flight = self.flights[drone.id]
+        a, b = flight["waypoints"][flight["leg"]], flight["waypoints"][flight["leg"] + 1]
+        length = math.hypot(b[0] - a[0], b[1] - a[1])
+        duration = length / (drone.speed * 60.0)
+        energy = length * self.mAh_per_meter
+        flight["leg_start"], flight["leg_end"] = self.now, self.now + duration
+
+        if self.active_zones and not flight["conflict"]:
+            zones = self.zone_index.segment_zones([a], [b])[0]
+            if any(z in self.active_zones for z in zones):
+                self._conflict(drone.id, flight)
+
+        if energy > drone.remaining_battery:
+            fraction = drone.remaining_battery / energy if energy > 0 else 0.0
+            self.schedule(self.now + duration * fraction, "depleted", drone.id)
+        else:
+            self.schedule(self.now + duration, "waypoint", drone.id)
+
+    def _on_waypoint(self, drone_id):
+        drone = self.drone_by_id[drone_id]
+        flight = self.flights[drone_id]
+        a, b = flight["waypoints"][flight["leg"]], flight["waypoints"][flight["leg"] + 1]
+        self._fly(drone, a, b, 1.0)
+        flight["leg"] += 1
+        if flight["leg"] + 1 < len(flight["waypoints"]):
+            self._start_leg(drone)
+            return
+
+        # Arrival: hand over the package, waiting for the window to open if early
+        delivery = flight["delivery"]
+        start, end = delivery.time_window
+        handover = max(self.now, float(start))
+        self.waiting += handover - self.now
+        if handover > end:
+            self.counters["late"] += 1
+            self.lateness += handover - end
+            if self.verbose:
+                print(f"[X] Geç Teslimat → Drone#{drone_id} → Delivery#{delivery.id} "
+                      f"varış: {minutes_to_timestr(int(handover))}, son: {minutes_to_timestr(end)}")
+        else:
+            self.counters["on_time"] += 1
+        self.counters["delivered"] += 1
+        delivery.delivered = True
+        drone.carrying_weight = max(0.0, drone.carrying_weight - delivery.weight)
+        drone.start_pos = drone.current_pos
+        self.node_of[drone_id] = f"D{delivery.id + 80}"
+        self.busy_time[drone_id] += handover - flight["departed"]
+        del self.flights[drone_id]
+        self.log.append((handover, "deliver", drone_id, delivery.id))
+        self.schedule(handover, "dispatch", drone_id)
+
+    def _on_depleted(self, drone_id):
+        drone = self.drone_by_id[drone_id]
+        flight = self.flights.pop(drone_id)
+        a, b = flight["waypoints"][flight["leg"]], flight["waypoints"][flight["leg"] + 1]
+        length = math.hypot(b[0] - a[0], b[1] - a[1])
+        self._fly(drone, a, b, drone.remaining_battery / (length * self.mAh_per_meter) if length > 0 else 0.0)
+        drone.remaining_battery = 0
+        drone.active = False
+        delivery = flight["delivery"]
+        delivery.assigned_drone_id = None
+        self.counters["battery_failures"] += 1
+        self.busy_time[drone_id] += self.now - flight["departed"]
+        self.log.append((self.now, "depleted", drone_id, delivery.id))
+        if self.verbose:
+            print(f"[X] Batarya Bitti → Drone#{drone_id} Delivery#{delivery.id} yolunda {minutes_to_timestr(int(self.now))}")
+
+    def _on_zone_on(self, z):
+        self.active_zones.add(z)
+        if not self.flights:
+            return
+        # Remaining path of every airborne drone (current position onwards) against the new zone
+        drone_ids, lines = [], []
+        for drone_id, flight in self.flights.items():
+            if flight["conflict"]:
+                continue
+            points = [self._position(flight)] + flight["waypoints"][flight["leg"] + 1:]
+            drone_ids.append(drone_id)
+            lines.append(shapely.linestrings(points))
+        if not lines:
+            return
+        hits = shapely.intersects(self.zone_index.polygons[z], np.array(lines, dtype=object))
+        for drone_id in np.array(drone_ids, dtype=object)[hits].tolist():
+            self._conflict(drone_id, self.flights[drone_id])
+
+    def _on_zone_off(self, z):
+        self.active_zones.discard(z)
+
+    def _on_order(self, delivery, drone_id):
+        self.counters["orders"] += 1
+        self.deliveries.append(delivery)
+        self.delivery_by_id[delivery.id] = delivery
+        # Only a complete graph can connect a new node; the copy made in __init__ is extended
+        if self.astar is not None and getattr(self.astar.graph, "straight_line", False):
+            node_id = f"D{delivery.id + 80}"
+            self.astar.positions[node_id] = delivery.pos
+            self.astar.graph.add_node(node_id, delivery.pos)
+            self.astar.refresh()
+        if drone_id is None and self.dispatcher is not None:
+            drone_id = self.dispatcher(self, delivery)
+        if drone_id is not None:
+            self._plan(self.now, drone_id, delivery.id)
+
+    def _fly(self, drone, a: tuple, b: tuple, fraction: float):
+        """
+        Moves the drone the given fraction along segment a → b and drains the battery for it.
+        """
+        length = math.hypot(b[0] - a[0], b[1] - a[1]) * fraction
+        drone.current_pos = (a[0] + (b[0] - a[0]) * fraction, a[1] + (b[1] - a[1]) * fraction)
+        drone.remaining_battery -= length * self.mAh_per_meter
+        self.distance += length
+        self.energy += length * self.mAh_per_meter
+
+    def _position(self, flight) -> tuple:
+        a, b = flight["waypoints"][flight["leg"]], flight["waypoints"][flight["leg"] + 1]
+        span = flight["leg_end"] - flight["leg_start"]
+        fraction = (self.now - flight["leg_start"]) / span if span > 0 else 1.0
+        return a[0] + (b[0] - a[0]) * fraction, a[1] + (b[1] - a[1]) * fraction
+
+    def _conflict(self, drone_id, flight):
+        flight["conflict"] = True
+        self.counters["zone_conflicts"] += 1
+        self.log.append((self.now, "zone_conflict", drone_id, flight["delivery"].id))
+        if self.verbose:
+            print(f"[X] No-Fly Zone Engeli → Drone#{drone_id} → Delivery#{flight['delivery'].id} "
+                  f"uçuş sırasında aktif yasak bölgeye giriyor ({minutes_to_timestr(int(self.now))})")
+
+    def __repr__(self):
+        return f"<FleetSimulator drones={len(self.drones)} now={minutes_to_timestr(int(self.now))} queued={len(self.queue)}>"
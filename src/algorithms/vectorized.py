@@ -0,0 +1,205 @@
+# src/algorithms/vectorized.py
+
+import time
+import numpy as np
+from src.algorithms.evaluation import FitnessTable
+
+
+class VectorizedGA:
+    """
+    Array-backed Genetic Algorithm engine.
+
+    A population is a single integer array of shape (pop_size, n_drones) where
+    each gene holds the delivery column assigned to that drone, or -1 if the
+    drone stays idle. Fitness, duplicate detection, crossover and mutation all
+    operate on the whole population at once.
+    """
+
+    def __init__(self, table: FitnessTable, seed=None):
+        """
+        :param table: FitnessTable providing validity and score matrices
+        :param seed: Seed for the NumPy random generator
+        """
+        self.table = table
+        self.rng = np.random.default_rng(seed)
+        self.valid, self.score = table.as_arrays()
+        self.n_drones, self.n_deliveries = self.valid.shape
+
+        # Feasible delivery columns per drone in CSR form, used to sample mutations
+        counts = self.valid.sum(axis=1)
+        self.candidate_offsets = np.concatenate(([0], np.cumsum(counts)))
+        self.candidates = np.nonzero(self.valid)[1]
+
+        # Optional callback(generation, population, fitness, seconds) called once per generation
+        self.on_generation = None
+
+    def initial_population(self, size: int) -> np.ndarray:
+        """
+        Each individual visits deliveries in its own random order and gives every
+        drone the first feasible delivery that is still free.
+        """
+        population = np.full((size, self.n_drones), -1, dtype=np.int64)
+        if self.n_deliveries == 0:
+            return population
+
+        rows = np.arange(size)
+        keys = self.rng.random((size, self.n_deliveries))
+        used = np.zeros((size, self.n_deliveries), dtype=bool)
+
+        for i in range(self.n_drones):
+            masked = np.where(self.valid[i] & ~used, keys, -1.0)
+            choice = masked.argmax(axis=1)
+            ok = masked[rows, choice] >= 0
+            population[ok, i] = choice[ok]
+            used[rows[ok], choice[ok]] = True
+        return population
+
+    def duplicates(self, population: np.ndarray) -> np.ndarray:
+        """
+        Returns a boolean array marking individuals that use a delivery twice.
+        """
+        ordered = np.sort(population, axis=1)
+        repeated = (ordered[:, 1:] == ordered[:, :-1]) & (ordered[:, 1:] >= 0)
+        return repeated.any(axis=1)
+
+    def fitness(self, population: np.ndarray) -> np.ndarray:
+        """
+        Batched equivalent of FitnessTable.fitness: individuals with an invalid
+        pair or a repeated delivery score FitnessTable.infeasible.
+        """
+        assigned = population >= 0
+        genes = np.where(assigned, population, 0)
+        drones = np.arange(self.n_drones)
+
+        valid = self.valid[drones, genes] | ~assigned
+        totals = np.where(assigned, self.score[drones, genes], 0.0).sum(axis=1)
+
+        ok = valid.all(axis=1) & ~self.duplicates(population)
+        return np.where(ok, totals, self.table.infeasible)
+
+    def crossover(self, parents1: np.ndarray, parents2: np.ndarray) -> np.ndarray:
+        """
+        One-point crossover at the middle drone. Deliveries already taken from
+        the first parent are dropped from the second parent's half.
+        """
+        mid = self.n_drones // 2
+        children = np.concatenate((parents1[:, :mid], parents2[:, mid:]), axis=1)
+
+        # Stable sort keeps the first occurrence of each delivery, which lies in parent1's half
+        order = np.argsort(children, axis=1, kind="stable")
+        ordered = np.take_along_axis(children, order, axis=1)
+        repeated = (ordered[:, 1:] == ordered[:, :-1]) & (ordered[:, 1:] >= 0)
+        rows, cols = np.nonzero(repeated)
+        children[rows, order[rows, cols + 1]] = -1
+        return children
+
+    def mutate(self, population: np.ndarray, mutation_rate=0.2) -> np.ndarray:
+        """
+        With probability mutation_rate, reassigns one random drone of an individual
+        to a random feasible delivery not already used by that individual.
+        """
+        if self.n_drones == 0:
+            return population
+
+        size = len(population)
+        rows = np.nonzero(self.rng.random(size) < mutation_rate)[0]
+        cols = self.rng.integers(0, self.n_drones, size=len(rows))
+        draws = self.rng.random(len(rows))
+
+        counts = self.candidate_offsets[cols + 1] - self.candidate_offsets[cols]
+        has_candidates = counts > 0
+        rows, cols, counts, draws = rows[has_candidates], cols[has_candidates], counts[has_candidates], draws[has_candidates]
+
+        picks = self.candidates[self.candidate_offsets[cols] + (draws * counts).astype(np.int64)]
+        free = ~(population[rows] == picks[:, None]).any(axis=1)
+        population[rows[free], cols[free]] = picks[free]
+        return population
+
+    def select_parents(self, pool: np.ndarray, count: int) -> tuple:
+        """
+        Draws count pairs of distinct parents from the pool (indices into the population).
+        """
+        k = len(pool)
+        first = self.rng.integers(0, k, size=count)
+        if k < 2:
+            return pool[first], pool[first]
+        second = (first + 1 + self.rng.integers(0, k - 1, size=count)) % k
+        return pool[first], pool[second]
+
+    def run(self, generations=30, population_size=10, elite_count=1, parent_pool_size=5, mutation_rate=0.2,
+            initial=None) -> np.ndarray:
+        """
+        Evolves a population and returns the best genome. The final population is kept in self.population.
+
+        :param initial: Optional (k, n_drones) genomes to warm-start from; the rest is generated
+        """
+        best = None
+        for _, best, _ in self.steps(generations, population_size, elite_count, parent_pool_size, mutation_rate, initial):
+            pass
+        return best
+
+    def steps(self, generations=30, population_size=10, elite_count=1, parent_pool_size=5, mutation_rate=0.2,
+              initial=None):
+        """
+        Generator form of run: yields (generation, best_genome, best_fitness) of each scored
+        population, ending with the final one. generations=None evolves until the consumer
+        stops iterating; self.population always holds the latest population.
+        """
+        population = self.initial_population(population_size)
+        if initial is not None and len(initial):
+            k = min(len(initial), population_size)
+            population[:k] = initial[:k]
+        elite_count = min(elite_count, population_size)
+        self.population = population
+
+        generation = 0
+        while generations is None or generation < generations:
+            start = time.perf_counter()
+            fitness = self.fitness(population)
+            order = np.argsort(-fitness, kind="stable")
+            elite = population[order[:elite_count]]
+
+            first, second = self.select_parents(order[:parent_pool_size], population_size - elite_count)
+            children = self.crossover(population[first], population[second])
+            children = self.mutate(children, mutation_rate)
+            best, value = population[order[0]].copy(), float(fitness[order[0]])
+            population = np.concatenate((elite, children))
+            self.population = population
+            if self.on_generation is not None:
+                self.on_generation(generation, population, fitness, time.perf_counter() - start)
+            yield generation, best, value
+            generation += 1
+
+        fitness = self.fitness(population)
+        index = int(np.argmax(fitness))
+        yield generation, population[index].copy(), float(fitness[index])
+
+    def top(self, count: int) -> np.ndarray:
+        """
+        Returns the count fittest genomes of the last run's final population.
+        """
+        order = np.argsort(-self.fitness(self.population), kind="stable")
+        return self.population[order[:count]]
+
+    def encode_population(self, solutions: list) -> np.ndarray:
+        """
+        Converts [(drone_id, delivery_id), ...] solutions to genomes; unknown ids are dropped.
+        """
+        population = np.full((len(solutions), self.n_drones), -1, dtype=np.int64)
+        drone_index = self.table.drone_index
+        delivery_index = self.table.delivery_index
+        for k, solution in enumerate(solutions):
+            for drone_id, delivery_id in solution:
+                if drone_id in drone_index and delivery_id in delivery_index:
+                    population[k, drone_index[drone_id]] = delivery_index[delivery_id]
+        return population
+
+    def decode(self, genome: np.ndarray) -> list:
+        """
+        Converts a genome to the [(drone_id, delivery_id), ...] format used by GeneticOptimizer.
+        """
+        return [
+            (self.table.drones[i].id, self.table.deliveries[j].id)
+            for i, j in enumerate(genome.tolist())
+            if j >= 0
+        ]
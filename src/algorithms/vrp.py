@@ -0,0 +1,412 @@
+# src/algorithms/vrp.py
+
+import math
+import random
+from src.algorithms.csp import CSP
+from src.algorithms.evaluation import FitnessTable
+from src.utils.kdtree import KDTree
+from src.utils.timeutils import minutes_to_timestr, to_minutes
+
+
+class Tour:
+    """
+    Ordered list of delivery columns served by one drone.
+
+    Per-stop arrival and service-start times and the forward slack (how far the
+    arrival at a stop may be pushed without breaking any later time window) are
+    cached, so inserting or removing a stop can be scored in O(1).
+    """
+
+    def __init__(self, row: int, stops=None):
+        self.row = row  # Drone row in VRPOptimizer
+        self.stops = list(stops or [])
+        self.load = 0.0
+        self.distance = 0.0  # Includes the return leg to the drone's start
+        self.reward = 0.0
+        self.arrival = []
+        self.service = []
+        self.slack = []
+
+    def __len__(self):
+        return len(self.stops)
+
+    def __repr__(self):
+        return f"<Tour drone_row={self.row} stops={len(self.stops)} distance={self.distance:.1f}>"
+
+
+class VRPOptimizer:
+    """
+    Vehicle-routing mode: each drone flies an ordered tour of several deliveries
+    and returns to its start.
+
+    A tour must respect:
+    - cumulative package weight (plus carrying_weight) <= max_weight
+    - energy of the whole tour, return leg included, <= remaining_battery
+    - each delivery's time_window at its computed arrival (drones may wait for a window to open)
+    - no leg crossing a no-fly zone active at current_time
+
+    Objective per tour = priority reward - energy * penalty_factor, as in FitnessTable.
+    Tours are built by cheapest insertion and improved by ruin-and-recreate; every
+    move is scored by its distance/reward delta without re-evaluating the tour.
+    """
+
+    mAh_per_meter = FitnessTable.mAh_per_meter
+    penalty_factor = FitnessTable.penalty_factor
+    priority_weight = FitnessTable.priority_weight
+    epsilon = 1e-9
+
+    def __init__(self, drones: list, deliveries: list, noflyzones: list, current_time, seed=None, verbose=False):
+        """
+        :param current_time: Departure time of every drone, in minutes ("HH:MM" strings are accepted)
+        :param seed: Seed for the optimizer's random generator
+        """
+        self.drones = drones
+        self.deliveries = deliveries
+        self.noflyzones = noflyzones
+        self.current_time = to_minutes(current_time)
+        self.verbose = verbose
+        self.rng = random.Random(seed) if seed is not None else random
+        self.csp = CSP(drones, deliveries, noflyzones)
+
+        # Node k < n_drones is drone k's start, node n_drones + j is delivery j
+        self.n_drones = len(drones)
+        points = [drone.start_pos for drone in drones] + [delivery.pos for delivery in deliveries]
+        self._xs = [p[0] for p in points]
+        self._ys = [p[1] for p in points]
+        self._active_zones = self.csp.zone_index.active_mask(self.current_time).tolist()
+        self._blocked = {}
+
+        self.capacity = [drone.max_weight - drone.carrying_weight for drone in drones]
+        self.battery = [drone.remaining_battery for drone in drones]
+        self.meters_per_minute = [drone.speed * 60 for drone in drones]
+        self.weight = [delivery.weight for delivery in deliveries]
+        self.window = [delivery.time_window for delivery in deliveries]
+        self.reward = [delivery.priority * self.priority_weight for delivery in deliveries]
+        self.cost_per_meter = self.mAh_per_meter * self.penalty_factor
+
+        self._delivery_tree = KDTree([delivery.pos for delivery in deliveries])
+        self.candidates = [self._candidates(i) for i in range(self.n_drones)]
+        self._allowed = [set(candidates) for candidates in self.candidates]
+
+    def leg(self, a: int, b: int) -> float:
+        """
+        Straight-line distance between nodes a and b, or inf if it crosses an active no-fly zone.
+        """
+        if a == b:
+            return 0.0
+        distance = math.hypot(self._xs[a] - self._xs[b], self._ys[a] - self._ys[b])
+        if not any(self._active_zones):
+            return distance
+        key = (a, b) if a < b else (b, a)
+        blocked = self._blocked.get(key)
+        if blocked is None:
+            zones = self.csp.zone_index.segment_zones([(self._xs[a], self._ys[a])], [(self._xs[b], self._ys[b])])[0]
+            blocked = any(self._active_zones[z] for z in zones)
+            self._blocked[key] = blocked
+        return math.inf if blocked else distance
+
+    def _candidates(self, i: int) -> list:
+        """
+        Deliveries drone i could serve alone (weight, round-trip battery, window); a necessary condition for any tour.
+        """
+        depot = i
+        speed = self.meters_per_minute[i]
+        # A round trip needs at least twice the straight-line distance, so farther deliveries are skipped
+        radius = max(self.battery[i], 0) / (2 * self.mAh_per_meter) * (1 + self.epsilon) + self.epsilon
+        result = []
+        for j in self._delivery_tree.query_radius((self._xs[i], self._ys[i]), radius).tolist():
+            if self.weight[j] > self.capacity[i]:
+                continue
+            out = self.leg(depot, self.n_drones + j)
+            back = self.leg(self.n_drones + j, depot)
+            if (out + back) * self.mAh_per_meter > self.battery[i] or speed <= 0:
+                continue
+            if self.current_time + out / speed > self.window[j][1]:
+                continue
+            result.append(j)
+        return result
+
+    def recompute(self, tour: Tour):
+        """
+        Recomputes a tour's cached load, distance, times and slacks in one O(n) pass.
+        """
+        i = tour.row
+        speed = self.meters_per_minute[i]
+        node = i
+        now = self.current_time
+        tour.load = 0.0
+        tour.distance = 0.0
+        tour.reward = 0.0
+        tour.arrival = []
+        tour.service = []
+
+        for j in tour.stops:
+            d = self.leg(node, self.n_drones + j)
+            tour.distance += d
+            tour.load += self.weight[j]
+            tour.reward += self.reward[j]
+            arrival = now + d / speed
+            now = max(arrival, self.window[j][0])
+            tour.arrival.append(arrival)
+            tour.service.append(now)
+            node = self.n_drones + j
+        tour.distance += self.leg(node, i)
+
+        # Forward slack: S_k = wait_k + min(latest_k - service_k, S_{k+1})
+        tour.slack = [0.0] * len(tour.stops)
+        slack = math.inf
+        for k in range(len(tour.stops) - 1, -1, -1):
+            wait = tour.service[k] - tour.arrival[k]
+            slack = wait + min(self.window[tour.stops[k]][1] - tour.service[k], slack)
+            tour.slack[k] = slack
+
+    def objective(self, tours: list) -> float:
+        """
+        Total priority reward minus energy penalty over all tours.
+        """
+        return sum(tour.reward - tour.distance * self.cost_per_meter for tour in tours)
+
+    def insertion_delta(self, tour: Tour, j: int, pos: int):
+        """
+        Extra distance of inserting delivery j before position pos, or None if infeasible. O(1).
+        """
+        i = tour.row
+        if tour.load + self.weight[j] > self.capacity[i] + self.epsilon:
+            return None
+
+        node_j = self.n_drones + j
+        prev = i if pos == 0 else self.n_drones + tour.stops[pos - 1]
+        nxt = i if pos == len(tour.stops) else self.n_drones + tour.stops[pos]
+        into, out_of = self.leg(prev, node_j), self.leg(node_j, nxt)
+        delta = into + out_of - self.leg(prev, nxt)
+        if math.isinf(delta) or (tour.distance + delta) * self.mAh_per_meter > self.battery[i]:
+            return None
+
+        speed = self.meters_per_minute[i]
+        leave = self.current_time if pos == 0 else tour.service[pos - 1]
+        arrival = leave + into / speed
+        if arrival > self.window[j][1] + self.epsilon:
+            return None
+        if pos < len(tour.stops):
+            push = max(arrival, self.window[j][0]) + out_of / speed - tour.arrival[pos]
+            if push > tour.slack[pos] + self.epsilon:
+                return None
+        return delta
+
+    def removal_delta(self, tour: Tour, pos: int):
+        """
+        Distance change of removing the stop at pos (never positive with straight legs), or None
+        if the shortcut leg is blocked. Removing a stop can only make later arrivals earlier. O(1).
+        """
+        i = tour.row
+        node = self.n_drones + tour.stops[pos]
+        prev = i if pos == 0 else self.n_drones + tour.stops[pos - 1]
+        nxt = i if pos == len(tour.stops) - 1 else self.n_drones + tour.stops[pos + 1]
+        shortcut = self.leg(prev, nxt)
+        if math.isinf(shortcut):
+            return None
+        return shortcut - self.leg(prev, node) - self.leg(node, nxt)
+
+    def best_insertion(self, tours: list, j: int, allowed=None):
+        """
+        Returns (gain, tour, pos, delta) of the best feasible insertion of delivery j, or None.
+        """
+        best = None
+        weight = self.weight[j]
+        for tour in tours:
+            if allowed is not None and j not in allowed[tour.row]:
+                continue
+            if tour.load + weight > self.capacity[tour.row] + self.epsilon:
+                continue
+            for pos in range(len(tour.stops) + 1):
+                delta = self.insertion_delta(tour, j, pos)
+                if delta is None:
+                    continue
+                gain = self.reward[j] - delta * self.cost_per_meter
+                if best is None or gain > best[0]:
+                    best = (gain, tour, pos, delta)
+        return best
+
+    def _retime(self, tour: Tour, pos: int):
+        """
+        Refreshes the cached times from stop pos on, stopping at the first stop whose service time
+        is unchanged, then the slacks backwards until they match their old values.
+        """
+        i = tour.row
+        speed = self.meters_per_minute[i]
+        stops = tour.stops
+        node = i if pos == 0 else self.n_drones + stops[pos - 1]
+        now = self.current_time if pos == 0 else tour.service[pos - 1]
+
+        k = pos
+        while k < len(stops):
+            j = stops[k]
+            arrival = now + self.leg(node, self.n_drones + j) / speed
+            now = max(arrival, self.window[j][0])
+            tour.arrival[k] = arrival
+            if k > pos and now == tour.service[k]:
+                break  # Later stops keep their times and slacks
+            tour.service[k] = now
+            node = self.n_drones + j
+            k += 1
+
+        slack = tour.slack[k + 1] if k + 1 < len(stops) else math.inf
+        for k in range(min(k, len(stops) - 1), -1, -1):
+            wait = tour.service[k] - tour.arrival[k]
+            slack = wait + min(self.window[stops[k]][1] - tour.service[k], slack)
+            if k < pos and slack == tour.slack[k]:
+                break
+            tour.slack[k] = slack
+
+    def insert(self, tour: Tour, j: int, pos: int, delta: float) -> float:
+        """
+        Inserts delivery j before pos given its insertion delta; returns the objective change.
+        """
+        tour.stops.insert(pos, j)
+        tour.load += self.weight[j]
+        tour.reward += self.reward[j]
+        tour.distance += delta
+        for cache in (tour.arrival, tour.service, tour.slack):
+            cache.insert(pos, 0.0)
+        self._retime(tour, pos)
+        return self.reward[j] - delta * self.cost_per_meter
+
+    def remove(self, tour: Tour, pos: int, delta: float) -> tuple:
+        """
+        Removes the stop at pos given its removal delta; returns (delivery, objective change).
+        """
+        j = tour.stops.pop(pos)
+        tour.load -= self.weight[j]
+        tour.reward -= self.reward[j]
+        tour.distance += delta
+        for cache in (tour.arrival, tour.service, tour.slack):
+            del cache[pos]
+        self._retime(tour, pos)
+        return j, -self.reward[j] - delta * self.cost_per_meter
+
+    @staticmethod
+    def _save(tour: Tour) -> tuple:
+        return list(tour.stops), tour.load, tour.distance, tour.reward, list(tour.arrival), list(tour.service), list(tour.slack)
+
+    @staticmethod
+    def _restore(tour: Tour, state: tuple):
+        tour.stops, tour.load, tour.distance, tour.reward, tour.arrival, tour.service, tour.slack = state
+
+    def recreate(self, tours: list, pending: list, saved=None) -> tuple:
+        """
+        Greedily inserts pending deliveries at their best positions while the gain is positive.
+
+        :param saved: Optional dict tour -> saved state, filled before a tour is first changed
+        :return: (deliveries left unassigned, total objective gain)
+        """
+        pending = list(pending)
+        self.rng.shuffle(pending)
+        left = []
+        total = 0.0
+        for j in pending:
+            best = self.best_insertion(tours, j, self._allowed)
+            if best is not None and best[0] > 0:
+                _, tour, pos, delta = best
+                if saved is not None and tour not in saved:
+                    saved[tour] = self._save(tour)
+                total += self.insert(tour, j, pos, delta)
+            else:
+                left.append(j)
+        return left, total
+
+    def construct(self) -> tuple:
+        """
+        Builds initial tours by cheapest insertion; returns (tours, unassigned).
+        """
+        tours = [Tour(i) for i in range(self.n_drones)]
+        for tour in tours:
+            self.recompute(tour)
+        pending = sorted({j for candidates in self.candidates for j in candidates})
+        left, _ = self.recreate(tours, pending)
+        return tours, left
+
+    def improve(self, tours: list, unassigned: list, iterations: int) -> tuple:
+        """
+        Ruin-and-recreate local search: remove a few stops (scored by removal delta),
+        reinsert them and any unassigned deliveries, keep the result if it is not worse.
+        The objective is tracked from the move deltas (final value in self.value) and a
+        rejected move restores only the tours it touched.
+        """
+        current = self.objective(tours)
+        for _ in range(iterations):
+            total = sum(len(tour.stops) for tour in tours)
+            if not total and not unassigned:
+                break
+
+            # Each sampled stop picks its tour, so tours are ruined in proportion to their length
+            saved = {}
+            removed = []
+            change = 0.0
+            count = min(total, self.rng.randint(1, max(1, total // 10)))
+            picks = iter(sorted(self.rng.sample(range(total), count)))
+            pick, offset = next(picks, None), 0
+            for tour in tours:
+                size = len(tour.stops)
+                hits = 0
+                while pick is not None and pick < offset + size:
+                    hits += 1
+                    pick = next(picks, None)
+                offset += size
+                for _ in range(hits):
+                    if not tour.stops:
+                        break
+                    pos = self.rng.randrange(len(tour.stops))
+                    delta = self.removal_delta(tour, pos)
+                    if delta is None:
+                        continue
+                    if tour not in saved:
+                        saved[tour] = self._save(tour)
+                    j, gain = self.remove(tour, pos, delta)
+                    removed.append(j)
+                    change += gain
+
+            # Retry only a sample of the unassigned pool so an iteration stays O(removed)
+            retry = self.rng.sample(unassigned, min(len(unassigned), 2 * len(removed) + 4))
+            left, gain = self.recreate(tours, removed + retry, saved)
+            change += gain
+            if change >= -self.epsilon:
+                retried = set(retry)
+                current += change
+                unassigned = [j for j in unassigned if j not in retried] + left
+            else:
+                for tour, state in saved.items():
+                    self._restore(tour, state)
+        self.value = current
+        return tours, unassigned
+
+    def run(self, iterations=1000) -> dict:
+        """
+        Plans tours for every drone.
+
+        :return: Dictionary drone_id -> [delivery_id, ...] in visiting order
+        """
+        tours, unassigned = self.construct()
+        tours, unassigned = self.improve(tours, unassigned, iterations)
+        self.tours = tours
+        self.unassigned = unassigned
+
+        if self.verbose:
+            print(f"\n[!] VRP turları (amaç: {self.value:.2f}, atanmayan: {len(unassigned)})")
+            for tour in tours:
+                if tour.stops:
+                    drone = self.drones[tour.row]
+                    stops = " → ".join(f"Delivery#{self.deliveries[j].id}@{minutes_to_timestr(int(t))}"
+                                       for j, t in zip(tour.stops, tour.arrival))
+                    print(f"Drone#{drone.id}: {stops} | Distance: {tour.distance:.2f} m | Load: {tour.load:.2f}kg")
+
+        return {
+            self.drones[tour.row].id: [self.deliveries[j].id for j in tour.stops]
+            for tour in tours
+        }
+
+    @staticmethod
+    def to_assignments(routes: dict) -> list:
+        """
+        Flattens {drone_id: [delivery_id, ...]} into [(drone_id, delivery_id), ...] pairs.
+        """
+        return [(drone_id, delivery_id) for drone_id, stops in routes.items() for delivery_id in stops]
@@ -1,10 +1,14 @@
 # src/models/delivery.py
 
+from src.utils.timeutils import to_minutes_window
+
 class Delivery:
     """
     Represents a delivery task with location, weight, priority, and time window.
     """
 
+    __slots__ = ("id", "pos", "weight", "priority", "time_window", "assigned_drone_id", "delivered")
+
     def __init__(self, delivery_id: int, pos: tuple, weight: float, priority: int, time_window: tuple):
         """
         Initialize a Delivery instance.
@@ -13,13 +17,14 @@ class Delivery:
         :param pos: Coordinates of the delivery point (x, y)
         :param weight: Weight of the package (in kg)
         :param priority: Delivery priority (1: low, 5: high)
-        :param time_window: Acceptable delivery time range as a tuple ("HH:MM", "HH:MM")
+        :param time_window: Acceptable delivery time range in minutes since midnight;
+                            ("HH:MM", "HH:MM") strings are also accepted
         """
         self.id = delivery_id
         self.pos = pos
         self.weight = weight
         self.priority = priority
-        self.time_window = time_window  # (start_time_str, end_time_str)
+        self.time_window = to_minutes_window(time_window)  # (start_minute, end_minute)
 
         # Delivery status tracking
         self.assigned_drone_id = None
@@ -5,6 +5,9 @@ class Drone:
     Represents a delivery drone with specific capabilities.
     """
 
+    __slots__ = ("id", "max_weight", "battery", "speed", "start_pos",
+                 "current_pos", "remaining_battery", "carrying_weight", "active")
+
     def __init__(self, drone_id: int, max_weight: float, battery: int, speed: float, start_pos: tuple):
         """
         Initialize a Drone instance.
@@ -0,0 +1,248 @@
+# src/models/fleet.py
+
+import numpy as np
+from src.models.delivery import Delivery
+from src.models.drone import Drone
+from src.utils.timeutils import to_minutes_window
+
+
+class _Column:
+    """
+    Descriptor exposing one row of a batch column as a plain attribute of a row view.
+    """
+
+    def __init__(self, column: str, load=None, store=None):
+        """
+        :param column: Name of the array attribute on the batch
+        :param load: Converts the stored value to the Python value returned to callers
+        :param store: Converts an assigned Python value to the stored value
+        """
+        self.column = column
+        self.load = load
+        self.store = store
+
+    def __get__(self, view, owner=None):
+        if view is None:
+            return self
+        value = getattr(view._batch, self.column)[view._row]
+        return self.load(value) if self.load else value
+
+    def __set__(self, view, value):
+        getattr(view._batch, self.column)[view._row] = self.store(value) if self.store else value
+
+
+def _point(value) -> tuple:
+    return float(value[0]), float(value[1])
+
+
+def _window(value) -> tuple:
+    return int(value[0]), int(value[1])
+
+
+def _optional_id(value):
+    return None if value < 0 else int(value)
+
+
+def _store_optional_id(value) -> int:
+    return -1 if value is None else value
+
+
+class DroneView:
+    """
+    Row of a DroneFleet with the same attribute API as Drone; reads and writes go to the fleet's arrays.
+    """
+
+    __slots__ = ("_batch", "_row")
+
+    id = _Column("ids", int)
+    max_weight = _Column("max_weight", float)
+    battery = _Column("battery", int)
+    speed = _Column("speed", float)
+    start_pos = _Column("start_pos", _point)
+    current_pos = _Column("current_pos", _point)
+    remaining_battery = _Column("remaining_battery", float)
+    carrying_weight = _Column("carrying_weight", float)
+    active = _Column("active", bool)
+
+    def __init__(self, batch, row: int):
+        self._batch = batch
+        self._row = row
+
+    reset = Drone.reset
+    __repr__ = Drone.__repr__
+
+
+class DeliveryView:
+    """
+    Row of a DeliveryBatch with the same attribute API as Delivery.
+    """
+
+    __slots__ = ("_batch", "_row")
+
+    id = _Column("ids", int)
+    pos = _Column("pos", _point)
+    weight = _Column("weight", float)
+    priority = _Column("priority", int)
+    time_window = _Column("time_window", _window, to_minutes_window)
+    assigned_drone_id = _Column("assigned_drone_id", _optional_id, _store_optional_id)
+    delivered = _Column("delivered", bool)
+
+    def __init__(self, batch, row: int):
+        self._batch = batch
+        self._row = row
+
+    __repr__ = Delivery.__repr__
+
+
+class _Batch:
+    """
+    Shared behaviour of the struct-of-arrays containers: length, row views and id lookup.
+    """
+
+    view_class = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, row: int):
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return self.view_class(self, row)
+
+    def __iter__(self):
+        return (self.view_class(self, row) for row in range(len(self)))
+
+    def views(self, rows=None) -> list:
+        """
+        Returns row views (all rows, or the given row indices) for code that expects a list of objects.
+        """
+        if rows is None:
+            rows = range(len(self))
+        return [self.view_class(self, int(row)) for row in rows]
+
+    def row_of(self, item_id) -> int:
+        """
+        Returns the row holding the given id (index built on first use).
+        """
+        if self._index is None:
+            self._index = {item_id: row for row, item_id in enumerate(self.ids.tolist())}
+        return self._index[item_id]
+
+
+class DroneFleet(_Batch):
+    """
+    Struct-of-arrays container for a fleet: one NumPy array per Drone attribute.
+
+    Iterating or indexing yields DroneView rows, so a fleet can be passed
+    wherever a list of drones is expected while the data stays in compact arrays.
+    """
+
+    view_class = DroneView
+
+    def __init__(self, ids, max_weight, battery, speed, start_pos):
+        """
+        :param ids: Drone ids
+        :param max_weight: Maximum payloads (kg)
+        :param battery: Battery capacities (mAh)
+        :param speed: Flight speeds (m/s)
+        :param start_pos: (n, 2) starting positions
+        """
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.max_weight = np.asarray(max_weight, dtype=float)
+        self.battery = np.asarray(battery, dtype=np.int64)
+        self.speed = np.asarray(speed, dtype=float)
+        self.start_pos = np.array(start_pos, dtype=float).reshape(-1, 2)
+
+        # Operational state, as in Drone.__init__
+        self.current_pos = self.start_pos.copy()
+        self.remaining_battery = self.battery.astype(float)
+        self.carrying_weight = np.zeros(len(self.ids))
+        self.active = np.ones(len(self.ids), dtype=bool)
+        self._index = None
+
+    @classmethod
+    def from_drones(cls, drones: list):
+        """
+        Packs Drone objects (including their operational state) into a fleet.
+        """
+        fleet = cls(
+            [drone.id for drone in drones],
+            [drone.max_weight for drone in drones],
+            [drone.battery for drone in drones],
+            [drone.speed for drone in drones],
+            [drone.start_pos for drone in drones]
+        )
+        fleet.current_pos[:] = np.array([drone.current_pos for drone in drones], dtype=float).reshape(-1, 2)
+        fleet.remaining_battery[:] = [drone.remaining_battery for drone in drones]
+        fleet.carrying_weight[:] = [drone.carrying_weight for drone in drones]
+        fleet.active[:] = [drone.active for drone in drones]
+        return fleet
+
+    def reset(self):
+        """
+        Resets every drone to its initial state.
+        """
+        self.current_pos[:] = self.start_pos
+        self.remaining_battery[:] = self.battery
+        self.carrying_weight[:] = 0.0
+        self.active[:] = True
+
+    def __repr__(self):
+        return f"<DroneFleet drones={len(self)}>"
+
+
+class DeliveryBatch(_Batch):
+    """
+    Struct-of-arrays container for deliveries: one NumPy array per Delivery attribute.
+    Time windows are stored as (n, 2) integer minutes; assigned_drone_id -1 means unassigned.
+    """
+
+    view_class = DeliveryView
+
+    def __init__(self, ids, pos, weight, priority, time_window):
+        """
+        :param ids: Delivery ids
+        :param pos: (n, 2) delivery coordinates
+        :param weight: Package weights (kg)
+        :param priority: Priorities (1: low, 5: high)
+        :param time_window: (n, 2) windows in minutes since midnight
+        """
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.pos = np.asarray(pos, dtype=float).reshape(-1, 2)
+        self.weight = np.asarray(weight, dtype=float)
+        self.priority = np.asarray(priority, dtype=np.int8)
+        self.time_window = np.asarray(time_window, dtype=np.int32).reshape(-1, 2)
+
+        # Delivery status tracking
+        self.assigned_drone_id = np.full(len(self.ids), -1, dtype=np.int64)
+        self.delivered = np.zeros(len(self.ids), dtype=bool)
+        self._index = None
+
+    @classmethod
+    def from_deliveries(cls, deliveries: list):
+        """
+        Packs Delivery objects into a batch.
+        """
+        batch = cls(
+            [delivery.id for delivery in deliveries],
+            [delivery.pos for delivery in deliveries],
+            [delivery.weight for delivery in deliveries],
+            [delivery.priority for delivery in deliveries],
+            [delivery.time_window for delivery in deliveries]
+        )
+        batch.assigned_drone_id[:] = [_store_optional_id(delivery.assigned_drone_id) for delivery in deliveries]
+        batch.delivered[:] = [delivery.delivered for delivery in deliveries]
+        return batch
+
+    @classmethod
+    def from_columns(cls, columns: dict):
+        """
+        Wraps the arrays returned by load_delivery_columns without copying them
+        (memory-mapped columns stay memory-mapped and read-only).
+        """
+        return cls(columns["id"], columns["pos"], columns["weight"], columns["priority"], columns["time_window"])
+
+    def __repr__(self):
+        return f"<DeliveryBatch deliveries={len(self)}>"
@@ -1,21 +1,26 @@
 # src/models/noflyzone.py
 
+from src.utils.timeutils import format_window, to_minutes_window
+
 class NoFlyZone:
     """
     Represents a no-fly zone area with polygon coordinates and active time.
     """
 
+    __slots__ = ("id", "coordinates", "active_time")
+
     def __init__(self, zone_id: int, coordinates: list, active_time: tuple):
         """
         Initialize a NoFlyZone instance.
 
         :param zone_id: Unique identifier for the no-fly zone
         :param coordinates: List of (x, y) tuples defining polygon corners
-        :param active_time: Tuple of active time range strings ("HH:MM", "HH:MM")
+        :param active_time: Active time range in minutes since midnight;
+                            ("HH:MM", "HH:MM") strings are also accepted
         """
         self.id = zone_id
         self.coordinates = coordinates  # [(x1, y1), (x2, y2), ...]
-        self.active_time = active_time  # ("09:30", "11:00")
+        self.active_time = to_minutes_window(active_time)  # (570, 660) = 09:30 – 11:00
 
     def __repr__(self):
-        return f"<NoFlyZone#{self.id} active={self.active_time}>"
\ No newline at end of file
+        return f"<NoFlyZone#{self.id} active={format_window(self.active_time)}>"
\ No newline at end of file
@@ -0,0 +1,169 @@
+# src/utils/csr_graph.py
+
+import json
+import os
+import numpy as np
+from src.utils.graph import Graph
+from src.utils.graph_builder import nearest_neighbors
+from src.utils.spatial import NoFlyZoneIndex
+
+
+class CSRGraph:
+    """
+    Compact weighted graph in compressed sparse row (CSR) form.
+
+    Node ids are interned to integer indices; the neighbours of node i are
+    neighbors[offsets[i]:offsets[i + 1]] with matching costs. All edge data
+    lives in three NumPy buffers, which can be saved to disk and memory-mapped.
+    """
+
+    files = ("offsets.npy", "neighbors.npy", "costs.npy", "coords.npy")
+
+    def __init__(self, node_ids: list, offsets, neighbors, costs, coords=None):
+        """
+        :param node_ids: Original node ids, position i holds the id of node index i
+        :param offsets: Array of length n + 1 with each node's start in neighbors/costs
+        :param neighbors: Array of neighbour indices
+        :param costs: Array of edge costs, aligned with neighbors
+        :param coords: Optional (n, 2) array of node coordinates
+        """
+        self.node_ids = list(node_ids)
+        self.index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.costs = costs
+        self.coords = coords
+
+    @classmethod
+    def from_edges(cls, node_ids: list, sources, targets, costs, coords=None, undirected=True):
+        """
+        Builds a graph from parallel arrays of edge endpoints (node indices) and costs.
+        With undirected=True each edge is stored in both directions.
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        costs = np.asarray(costs, dtype=float)
+        if undirected:
+            sources, targets = np.concatenate((sources, targets)), np.concatenate((targets, sources))
+            costs = np.concatenate((costs, costs))
+
+        order = np.argsort(sources, kind="stable")
+        counts = np.bincount(sources, minlength=len(node_ids))
+        offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        return cls(node_ids, offsets, targets[order].astype(np.int32), costs[order], coords)
+
+    @classmethod
+    def from_coordinates(cls, node_ids: list, coords, k=None, noflyzones=None, current_time=None):
+        """
+        Bulk construction from a coordinate array with Euclidean edge costs.
+
+        :param node_ids: Node ids aligned with coords
+        :param coords: (n, 2) array of coordinates
+        :param k: Connect each node to its k nearest neighbours; None builds a complete graph
+        :param noflyzones: Optional list of NoFlyZone objects whose crossing edges are dropped
+        :param current_time: Only zones active at this time block edges; None blocks on every zone
+        """
+        coords = np.asarray(coords, dtype=float).reshape(-1, 2)
+        n = len(coords)
+        if k is None:
+            sources, targets = np.triu_indices(n, k=1)
+        else:
+            neighbors = nearest_neighbors(coords, k)
+            pairs = np.repeat(np.arange(n), neighbors.shape[1]), neighbors.ravel()
+            pairs = np.unique(np.sort(np.stack(pairs, axis=1), axis=1), axis=0)
+            sources, targets = pairs[:, 0], pairs[:, 1]
+
+        if noflyzones and len(sources):
+            blocked = NoFlyZoneIndex(noflyzones).intersects_many(coords[sources], coords[targets], current_time)
+            sources, targets = sources[~blocked], targets[~blocked]
+
+        costs = np.hypot(*(coords[sources] - coords[targets]).T)
+        return cls.from_edges(node_ids, sources, targets, costs, coords)
+
+    @classmethod
+    def from_positions(cls, positions: dict, k=None, noflyzones=None, current_time=None):
+        """
+        Same as from_coordinates, taking a node_id -> (x, y) dictionary.
+        """
+        node_ids = list(positions)
+        coords = [positions[node_id] for node_id in node_ids]
+        return cls.from_coordinates(node_ids, coords, k, noflyzones, current_time)
+
+    @classmethod
+    def from_graph(cls, graph: Graph, positions=None):
+        """
+        Converts an adjacency-list Graph; each stored (directed) entry becomes one CSR entry.
+        """
+        node_ids = list(graph.adjacency_list)
+        index = {node_id: i for i, node_id in enumerate(node_ids)}
+        offsets = [0]
+        neighbors = []
+        costs = []
+        for node_id in node_ids:
+            for neighbor, cost in graph.adjacency_list[node_id]:
+                neighbors.append(index[neighbor])
+                costs.append(cost)
+            offsets.append(len(neighbors))
+
+        coords = None
+        if positions is not None:
+            coords = np.array([positions[node_id] for node_id in node_ids], dtype=float).reshape(-1, 2)
+        return cls(node_ids, np.array(offsets, dtype=np.int64), np.array(neighbors, dtype=np.int32),
+                   np.array(costs, dtype=float), coords)
+
+    def neighbor_indices(self, i: int) -> tuple:
+        """
+        Returns (neighbor_indices, costs) array views for node index i.
+        """
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self.neighbors[start:end], self.costs[start:end]
+
+    def get_neighbors(self, node_id):
+        """
+        Returns the list of (neighbor_id, cost) for a given node, like Graph.get_neighbors.
+        """
+        i = self.index.get(node_id)
+        if i is None:
+            return []
+        neighbors, costs = self.neighbor_indices(i)
+        node_ids = self.node_ids
+        return [(node_ids[j], cost) for j, cost in zip(neighbors.tolist(), costs.tolist())]
+
+    def positions(self) -> dict:
+        """
+        Returns the node_id -> (x, y) dictionary, if coordinates are stored.
+        """
+        if self.coords is None:
+            return {}
+        return {node_id: tuple(pos) for node_id, pos in zip(self.node_ids, self.coords.tolist())}
+
+    euclidean_distance = staticmethod(Graph.euclidean_distance)
+
+    def save(self, path: str):
+        """
+        Saves the graph to a directory of .npy buffers plus a node_ids.json file.
+        """
+        os.makedirs(path, exist_ok=True)
+        coords = self.coords if self.coords is not None else np.empty((0, 2), dtype=float)
+        for name, array in zip(self.files, (self.offsets, self.neighbors, self.costs, coords)):
+            np.save(os.path.join(path, name), np.ascontiguousarray(array))
+        with open(os.path.join(path, "node_ids.json"), "w", encoding="utf-8") as f:
+            json.dump(self.node_ids, f)
+
+    @classmethod
+    def load(cls, path: str, mmap=True):
+        """
+        Loads a graph saved with save(). With mmap=True the buffers are memory-mapped
+        read-only, so loading does not read the edge data up front.
+        """
+        mode = "r" if mmap else None
+        offsets, neighbors, costs, coords = (np.load(os.path.join(path, name), mmap_mode=mode) for name in cls.files)
+        with open(os.path.join(path, "node_ids.json"), "r", encoding="utf-8") as f:
+            node_ids = json.load(f)
+        return cls(node_ids, offsets, neighbors, costs, coords if len(coords) else None)
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    def __repr__(self):
+        return f"<CSRGraph nodes={len(self.node_ids)} edges={len(self.neighbors)}>"
@@ -1,6 +1,10 @@
 # src/utils/generator.py
 
-from src.utils.loader import load_drones, load_deliveries, load_noflyzones
+import random
+from src.models.delivery import Delivery
+from src.models.drone import Drone
+from src.models.noflyzone import NoFlyZone
+from src.utils.loader import load_drones, load_deliveries, load_noflyzones, load_delivery_columns
 
 
 def generate_drones_from_file(path="data/drones.json"):
@@ -21,4 +25,69 @@ def generate_noflyzones_from_file(path="data/noflyzones.json"):
     """
     Loads a list of No-Fly Zones from a JSON file.
     """
-    return load_noflyzones(path)
\ No newline at end of file
+    return load_noflyzones(path)
+
+
+def generate_delivery_columns_from_file(path="data/deliveries.json", cache_dir=None):
+    """
+    Loads deliveries as columnar NumPy arrays, memory-mapping a binary cache when cache_dir is given.
+    """
+    return load_delivery_columns(path, cache_dir=cache_dir)
+
+
+def generate_random_scenario(n_drones=5, n_deliveries=20, n_zones=3, seed=None, area=None, horizon=(0, 240)):
+    """
+    Generates a synthetic scenario with the same value ranges as the sample data in data/.
+
+    :param seed: Seed for reproducible scenarios
+    :param area: Side length of the square map in meters; by default it grows with
+                 sqrt(n_deliveries) so the delivery density stays that of the sample data
+    :param horizon: (start, end) minutes that time windows and zone activity are drawn from
+    :return: (drones, deliveries, noflyzones)
+    """
+    rng = random.Random(seed)
+    if area is None:
+        area = 100.0 * max(1.0, (n_deliveries / 20) ** 0.5)
+    start, end = horizon
+
+    def point():
+        return (round(rng.uniform(0, area), 2), round(rng.uniform(0, area), 2))
+
+    def window(min_length, max_length):
+        length = rng.randint(min_length, max_length)
+        opens = rng.randint(start, max(start, end - length))
+        return (opens, min(end, opens + length))
+
+    drones = [
+        Drone(
+            drone_id=i + 1,
+            max_weight=rng.choice((2.0, 2.5, 3.0, 3.5, 4.0, 5.0, 6.0)),
+            battery=rng.randrange(8000, 20001, 1000),
+            speed=float(rng.randint(6, 12)),
+            start_pos=point()
+        )
+        for i in range(n_drones)
+    ]
+    deliveries = [
+        Delivery(
+            delivery_id=j + 1,
+            pos=point(),
+            weight=rng.choice((0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5, 4.0)),
+            priority=rng.randint(1, 5),
+            time_window=window(20, 90)
+        )
+        for j in range(n_deliveries)
+    ]
+
+    # Axis-aligned rectangles of 5-20% of the map side
+    noflyzones = []
+    for k in range(n_zones):
+        x, y = point()
+        w, h = (rng.uniform(0.05, 0.2) * area for _ in range(2))
+        corners = [(x, y), (x + w, y), (x + w, y + h), (x, y + h)]
+        noflyzones.append(NoFlyZone(
+            zone_id=k + 1,
+            coordinates=[(round(cx, 2), round(cy, 2)) for cx, cy in corners],
+            active_time=window(30, 120)
+        ))
+    return drones, deliveries, noflyzones
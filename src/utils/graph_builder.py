@@ -0,0 +1,170 @@
+# src/utils/graph_builder.py
+
+import numpy as np
+from shapely.geometry import Polygon
+from src.utils.graph import Graph
+from src.utils.kdtree import KDTree
+from src.utils.spatial import NoFlyZoneIndex
+
+
+def build_positions(drones: list, deliveries: list) -> dict:
+    """
+    Builds the node_id -> (x, y) map used by the graph and A* ("DR<id>" for drones, "D<id + 80>" for deliveries).
+    """
+    positions = {f"DR{drone.id}": drone.start_pos for drone in drones}
+    positions.update({f"D{delivery.id + 80}": delivery.pos for delivery in deliveries})
+    return positions
+
+
+class ImplicitCompleteGraph:
+    """
+    Complete Euclidean graph whose edges are computed on demand from node positions.
+
+    Only the coordinates are stored, so memory is linear in the number of nodes.
+    Exposes the same get_neighbors / euclidean_distance interface as Graph.
+    """
+
+    # Euclidean costs obey the triangle inequality, so every shortest path is the direct edge
+    straight_line = True
+
+    def __init__(self, positions: dict):
+        """
+        :param positions: Dictionary mapping node_id to (x, y) coordinates
+        """
+        self.node_ids = list(positions)
+        self.index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        self._coords = np.array([positions[node_id] for node_id in self.node_ids], dtype=float).reshape(-1, 2)
+
+    def add_node(self, node_id, pos: tuple):
+        """
+        Adds a node at pos, or moves it there if it already exists.
+        """
+        if node_id in self.index:
+            self._coords[self.index[node_id]] = pos
+            return
+        self.index[node_id] = len(self.node_ids)
+        self.node_ids.append(node_id)
+        self._coords = np.vstack((self._coords, np.asarray(pos, dtype=float).reshape(1, 2)))
+
+    def distances_from(self, i: int) -> np.ndarray:
+        """
+        Returns the Euclidean distance from node index i to every node (0 for i itself).
+        """
+        deltas = self._coords - self._coords[i]
+        return np.hypot(deltas[:, 0], deltas[:, 1])
+
+    def neighbor_indices(self, i: int) -> tuple:
+        """
+        Returns (neighbor_indices, costs) arrays for node index i: every other node at Euclidean cost.
+        """
+        costs = self.distances_from(i)
+        others = np.arange(len(self.node_ids))
+        mask = others != i
+        return others[mask], costs[mask]
+
+    def get_neighbors(self, node_id):
+        """
+        Returns the list of (neighbor_id, cost) for a given node: every other node at Euclidean cost.
+        """
+        i = self.index.get(node_id)
+        if i is None:
+            return []
+        neighbors, costs = self.neighbor_indices(i)
+        node_ids = self.node_ids
+        return [(node_ids[j], cost) for j, cost in zip(neighbors.tolist(), costs.tolist())]
+
+    euclidean_distance = staticmethod(Graph.euclidean_distance)
+
+    def __len__(self):
+        return len(self.node_ids)
+
+    def __repr__(self):
+        return f"<ImplicitCompleteGraph nodes={len(self.node_ids)}>"
+
+
+def build_complete_graph(positions: dict) -> Graph:
+    """
+    Builds an explicit complete Graph, adding each undirected edge exactly once.
+    """
+    graph = Graph()
+    node_ids = list(positions)
+    for node_id in node_ids:
+        graph.add_node(node_id)
+    for a in range(len(node_ids)):
+        for b in range(a + 1, len(node_ids)):
+            i, j = node_ids[a], node_ids[b]
+            graph.add_edge(i, j, graph.euclidean_distance(positions[i], positions[j]))
+    return graph
+
+
+def nearest_neighbors(coords: np.ndarray, k: int, chunk_size=256, tree_threshold=4096) -> np.ndarray:
+    """
+    Returns an (n, k) array with the indices of each point's k nearest other points.
+    Above tree_threshold points a KDTree is used (O(n log n)); below it distances
+    are computed in row chunks so memory stays O(chunk_size * n).
+    """
+    n = len(coords)
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.empty((n, 0), dtype=np.int64)
+    if n > tree_threshold:
+        return KDTree(coords).neighbors(k)
+
+    result = np.empty((n, k), dtype=np.int64)
+    sq_norms = (coords ** 2).sum(axis=1)
+    for start in range(0, n, chunk_size):
+        block = coords[start:start + chunk_size]
+        # |a - b|^2 = |a|^2 + |b|^2 - 2ab, computed with one matrix product per chunk
+        dist = sq_norms[start:start + chunk_size, None] + sq_norms[None, :] - 2.0 * (block @ coords.T)
+        dist[np.arange(len(block)), np.arange(start, start + len(block))] = np.inf
+        nearest = np.argpartition(dist, k - 1, axis=1)[:, :k]
+        result[start:start + len(block)] = nearest
+    return result
+
+
+def zone_waypoints(noflyzones: list, margin=1.0) -> dict:
+    """
+    Returns detour waypoints just outside each no-fly zone corner, keyed "Z<zone_id>_<k>".
+    """
+    waypoints = {}
+    for zone in noflyzones:
+        outline = Polygon(zone.coordinates).buffer(margin, join_style="mitre")
+        for k, corner in enumerate(outline.exterior.coords[:-1]):
+            waypoints[f"Z{zone.id}_{k}"] = tuple(corner)
+    return waypoints
+
+
+def build_visibility_graph(positions: dict, k=8, noflyzones=None, current_time=None, include_zone_corners=False) -> Graph:
+    """
+    Builds a sparse Graph connecting each node to its k nearest neighbours, dropping
+    edges that cross a no-fly zone.
+
+    :param positions: Dictionary mapping node_id to (x, y); zone corner waypoints are added to it in place
+                      when include_zone_corners is set, so A* can look them up
+    :param k: Number of nearest neighbours per node
+    :param noflyzones: Optional list of NoFlyZone objects to avoid
+    :param current_time: Only zones active at this time block edges; None blocks on every zone
+    :param include_zone_corners: Add waypoints around zone corners so routes can detour
+    """
+    if noflyzones and include_zone_corners:
+        positions.update(zone_waypoints(noflyzones))
+
+    node_ids = list(positions)
+    coords = np.array([positions[node_id] for node_id in node_ids], dtype=float).reshape(-1, 2)
+
+    neighbors = nearest_neighbors(coords, k)
+    rows = np.repeat(np.arange(len(node_ids)), neighbors.shape[1])
+    cols = neighbors.ravel()
+    pairs = np.unique(np.sort(np.stack((rows, cols), axis=1), axis=1), axis=0)
+
+    if noflyzones and len(pairs):
+        blocked = NoFlyZoneIndex(noflyzones).intersects_many(coords[pairs[:, 0]], coords[pairs[:, 1]], current_time)
+        pairs = pairs[~blocked]
+
+    graph = Graph()
+    for node_id in node_ids:
+        graph.add_node(node_id)
+    costs = np.hypot(*(coords[pairs[:, 0]] - coords[pairs[:, 1]]).T).tolist()
+    for (a, b), cost in zip(pairs.tolist(), costs):
+        graph.add_edge(node_ids[a], node_ids[b], cost)
+    return graph
@@ -0,0 +1,118 @@
+# src/utils/instrumentation.py
+
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+
+class Instrumentation:
+    """
+    Counters, timers and observer callbacks for the optimizer's hot paths.
+
+    GeneticOptimizer, AStar and CSP take an optional stats object and test
+    `if self.stats is not None` before recording anything, so with
+    instrumentation disabled (the default) a hook costs one attribute check.
+
+    Counter names used by the library:
+    - ga.fitness.calls / ga.fitness.cache_hits / ga.fitness.cache_misses
+    - astar.cache_hits / astar.cache_misses / astar.searches / astar.expansions
+    - csp.checks / csp.passed / csp.failed.<constraint> (see CSP.constraints)
+    - csp.pruned (pairs CSP.candidate_pairs ruled out by weight or battery radius)
+    Timers: ga.run, ga.table, ga.generation, astar.search.
+    Events passed to observers: "generation" (engine, generation, best, mean of the feasible individuals) and "run_end" (engine, generations, best).
+    """
+
+    def __init__(self):
+        self.counters = Counter()
+        self.timers = {}  # name -> [total_seconds, calls]
+        self.observers = []
+        self.history = []  # (generation, best, mean) of the last run
+
+    def count(self, name: str, amount=1):
+        self.counters[name] += amount
+
+    def add_time(self, name: str, seconds: float):
+        entry = self.timers.get(name)
+        if entry is None:
+            self.timers[name] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+    @contextmanager
+    def timer(self, name: str):
+        """
+        Context manager adding the elapsed wall time of its block to timer name.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def subscribe(self, callback):
+        """
+        Registers callback(event, data) for every emitted event; returns the callback.
+        """
+        self.observers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        self.observers.remove(callback)
+
+    def emit(self, event: str, **data):
+        if event == "generation":
+            if data["generation"] == 0:
+                self.history = []
+            self.history.append((data["generation"], data["best"], data["mean"]))
+        for callback in self.observers:
+            callback(event, data)
+
+    def reset(self):
+        """
+        Clears counters, timers and history (observers stay subscribed).
+        """
+        self.counters.clear()
+        self.timers.clear()
+        self.history = []
+
+    def snapshot(self) -> dict:
+        """
+        Returns counters, timers and generation history as plain data (e.g. for JSON).
+        """
+        return {
+            "counters": dict(self.counters),
+            "timers": {name: {"seconds": total, "calls": calls} for name, (total, calls) in self.timers.items()},
+            "history": [list(entry) for entry in self.history],
+        }
+
+    def report(self) -> str:
+        """
+        Formats a short human-readable summary.
+        """
+        lines = ["Counters:"]
+        for name in sorted(self.counters):
+            lines.append(f"  {name:<28} {self.counters[name]:>12}")
+
+        lookups = self.counters["ga.fitness.cache_hits"] + self.counters["ga.fitness.cache_misses"]
+        if lookups:
+            lines.append(f"  {'ga.fitness.hit_rate':<28} {self.counters['ga.fitness.cache_hits'] / lookups:>12.1%}")
+
+        lines.append("Timers:")
+        for name in sorted(self.timers):
+            total, count = self.timers[name]
+            lines.append(f"  {name:<28} {total:>10.4f} s  ({count} calls, {total / count * 1e3:.3f} ms avg)")
+
+        if self.history:
+            first, last = self.history[0], self.history[-1]
+            stalled = 0
+            for _, best, _ in reversed(self.history):
+                if best != last[1]:
+                    break
+                stalled += 1
+            lines.append(f"Generations: {len(self.history)} | best {first[1]:.2f} → {last[1]:.2f} | "
+                         f"mean {first[2]:.2f} → {last[2]:.2f} | unchanged best for last {stalled}")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"<Instrumentation counters={len(self.counters)} timers={len(self.timers)} observers={len(self.observers)}>"
@@ -0,0 +1,71 @@
+# src/utils/intervals.py
+
+import numpy as np
+
+
+class IntervalIndex:
+    """
+    Static index over closed integer intervals [start, end] (e.g. time windows in minutes).
+
+    Intervals are kept sorted by start together with the longest interval length,
+    so an overlap query only inspects the intervals starting in
+    [lo - longest, hi] instead of scanning every interval.
+    """
+
+    def __init__(self, intervals):
+        """
+        :param intervals: Sequence of (start, end) pairs, or an (n, 2) array
+        """
+        intervals = np.asarray(intervals, dtype=np.int64).reshape(-1, 2)
+        self.starts = intervals[:, 0]
+        self.ends = intervals[:, 1]
+        self.by_start = np.argsort(self.starts, kind="stable")
+        self.sorted_starts = self.starts[self.by_start]
+        self.longest = int((self.ends - self.starts).max(initial=0))
+
+    def overlapping(self, lo: int, hi: int) -> np.ndarray:
+        """
+        Returns the sorted indices of the intervals sharing at least one point with [lo, hi].
+        """
+        first = np.searchsorted(self.sorted_starts, lo - self.longest, side="left")
+        last = np.searchsorted(self.sorted_starts, hi, side="right")
+        idx = self.by_start[first:last]
+        return np.sort(idx[self.ends[idx] >= lo])
+
+    def active_at(self, t: int) -> np.ndarray:
+        """
+        Returns the sorted indices of the intervals containing t.
+        """
+        return self.overlapping(t, t)
+
+    def stabbing_points(self, subset=None) -> list:
+        """
+        Returns a minimum set of time points such that every interval contains one of them.
+
+        Greedy by earliest end: a group of intervals shares a point as long as each
+        starts before the group's earliest end; the group's point is its latest start,
+        i.e. the earliest moment at which all of its intervals are open.
+
+        :param subset: Optional indices restricting the intervals considered
+        """
+        idx = np.arange(len(self.starts)) if subset is None else np.asarray(subset, dtype=np.int64)
+        idx = idx[self.starts[idx] <= self.ends[idx]]
+        order = idx[np.argsort(self.ends[idx], kind="stable")]
+        points = []
+        group_end = group_start = None
+        for start, end in zip(self.starts[order].tolist(), self.ends[order].tolist()):
+            if group_end is not None and start <= group_end:
+                group_start = max(group_start, start)
+                continue
+            if group_end is not None:
+                points.append(group_start)
+            group_start, group_end = start, end
+        if group_end is not None:
+            points.append(group_start)
+        return sorted(set(points))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __repr__(self):
+        return f"<IntervalIndex intervals={len(self)} longest={self.longest}>"
@@ -0,0 +1,190 @@
+# src/utils/kdtree.py
+
+import heapq
+import numpy as np
+
+
+class KDTree:
+    """
+    Static k-d tree over a point set, built with NumPy.
+
+    Points are reordered once so every node covers a contiguous slice of
+    `order`; nodes keep their bounding boxes, so radius and nearest-neighbour
+    queries only touch the leaves that can hold an answer. Leaf contents are
+    compared with vectorized distance computations.
+    """
+
+    def __init__(self, points, leaf_size=16):
+        """
+        :param points: (n, d) coordinates
+        :param leaf_size: Maximum number of points per leaf
+        """
+        self.points = np.asarray(points, dtype=float)
+        if self.points.ndim == 1:
+            self.points = self.points.reshape(-1, 2)
+        self.leaf_size = max(1, leaf_size)
+        self.order = np.arange(len(self.points))
+
+        # Node arrays; children are -1 for leaves
+        self.start, self.end, self.left, self.right, self.parent = [], [], [], [], []
+        lows, highs = [], []
+        if len(self.points):
+            stack = [(0, len(self.points), -1, None)]
+            while stack:
+                start, end, parent, side = stack.pop()
+                node = len(self.start)
+                block = self.points[self.order[start:end]]
+                low, high = block.min(axis=0), block.max(axis=0)
+                self.start.append(start)
+                self.end.append(end)
+                self.left.append(-1)
+                self.right.append(-1)
+                self.parent.append(parent)
+                lows.append(low)
+                highs.append(high)
+                if parent >= 0:
+                    (self.left if side == 0 else self.right)[parent] = node
+
+                if end - start > self.leaf_size:
+                    # Split the widest dimension at the median
+                    axis = int(np.argmax(high - low))
+                    mid = (start + end) // 2
+                    idx = self.order[start:end]
+                    self.order[start:end] = idx[np.argpartition(self.points[idx, axis], mid - start)]
+                    stack.append((mid, end, node, 1))
+                    stack.append((start, mid, node, 0))
+
+        dims = self.points.shape[1]
+        self.low = np.array(lows, dtype=float).reshape(-1, dims)
+        self.high = np.array(highs, dtype=float).reshape(-1, dims)
+        self._boxes = list(zip(self.low.tolist(), self.high.tolist()))
+
+    def query_radius(self, center, radius: float) -> np.ndarray:
+        """
+        Returns the sorted indices of the points within radius (inclusive) of center.
+        """
+        if not len(self.points) or radius < 0:
+            return np.empty(0, dtype=np.int64)
+        center = [float(c) for c in center]
+        point = np.asarray(center)
+        limit = radius * radius
+        found = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            low, high = self._boxes[node]
+            near = far = 0.0
+            for c, lo, hi in zip(center, low, high):
+                gap = lo - c if c < lo else (c - hi if c > hi else 0.0)
+                near += gap * gap
+                reach = max(c - lo, hi - c)
+                far += reach * reach
+            if near > limit:
+                continue
+            start, end = self.start[node], self.end[node]
+            if far <= limit:
+                found.append(self.order[start:end])  # Box entirely inside the ball
+            elif self.left[node] < 0:
+                idx = self.order[start:end]
+                dist = ((self.points[idx] - point) ** 2).sum(axis=1)
+                found.append(idx[dist <= limit])
+            else:
+                stack.append(self.left[node])
+                stack.append(self.right[node])
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(found))
+
+    def query(self, center, k=1) -> tuple:
+        """
+        Returns (distances, indices) of the k points nearest to center, nearest first.
+        """
+        k = min(k, len(self.points))
+        if k <= 0:
+            return np.empty(0), np.empty(0, dtype=np.int64)
+        point = np.asarray(center, dtype=float)
+        best_dist = np.full(k, np.inf)
+        best_idx = np.full(k, -1, dtype=np.int64)
+
+        heap = [(0.0, 0)]
+        while heap:
+            near, node = heapq.heappop(heap)
+            if near > best_dist[-1]:
+                break
+            if self.left[node] < 0:
+                idx = self.order[self.start[node]:self.end[node]]
+                dist = ((self.points[idx] - point) ** 2).sum(axis=1)
+                merged_dist = np.concatenate((best_dist, dist))
+                merged_idx = np.concatenate((best_idx, idx))
+                keep = np.argsort(merged_dist, kind="stable")[:k]
+                best_dist, best_idx = merged_dist[keep], merged_idx[keep]
+                continue
+            for child in (self.left[node], self.right[node]):
+                gap = np.maximum(np.maximum(self.low[child] - point, point - self.high[child]), 0.0)
+                heapq.heappush(heap, (float((gap ** 2).sum()), child))
+        return np.sqrt(best_dist), best_idx
+
+    def neighbors(self, k: int) -> np.ndarray:
+        """
+        Returns an (n, k) array with the indices of each tree point's k nearest other points.
+
+        Queries are answered a leaf at a time: the smallest subtree around the leaf
+        holding more than k points bounds the leaf's k-th neighbour distance, and one
+        distance block against every leaf within that bound finishes the search.
+        """
+        n = len(self.points)
+        k = min(k, n - 1)
+        result = np.empty((n, max(k, 0)), dtype=np.int64)
+        if k <= 0:
+            return result
+
+        for leaf in range(len(self.start)):
+            if self.left[leaf] >= 0:
+                continue
+            queries = self.order[self.start[leaf]:self.end[leaf]]
+            block = self.points[queries]
+
+            # Upper bound on the k-th neighbour distance from a small enclosing subtree
+            node = leaf
+            while self.end[node] - self.start[node] <= k and self.parent[node] >= 0:
+                node = self.parent[node]
+            bound = self._kth_distance(block, queries, self.order[self.start[node]:self.end[node]], k).max()
+
+            # Every leaf whose box lies within the bound of this leaf's box
+            low, high = self.low[leaf], self.high[leaf]
+            candidates = []
+            stack = [0]
+            while stack:
+                other = stack.pop()
+                gap = np.maximum(np.maximum(self.low[other] - high, low - self.high[other]), 0.0)
+                if (gap ** 2).sum() > bound:
+                    continue
+                if self.left[other] < 0:
+                    candidates.append(self.order[self.start[other]:self.end[other]])
+                else:
+                    stack.append(self.left[other])
+                    stack.append(self.right[other])
+            candidates = np.concatenate(candidates)
+
+            dist = self._distances(block, queries, candidates)
+            nearest = np.argpartition(dist, k - 1, axis=1)[:, :k]
+            result[queries] = candidates[nearest]
+        return result
+
+    def _distances(self, block, queries, candidates) -> np.ndarray:
+        """
+        Squared distances from each query point to each candidate, inf against itself.
+        """
+        dist = ((block[:, None, :] - self.points[candidates][None, :, :]) ** 2).sum(axis=2)
+        dist[queries[:, None] == candidates[None, :]] = np.inf
+        return dist
+
+    def _kth_distance(self, block, queries, candidates, k: int) -> np.ndarray:
+        dist = self._distances(block, queries, candidates)
+        return np.partition(dist, k - 1, axis=1)[:, k - 1]
+
+    def __len__(self):
+        return len(self.points)
+
+    def __repr__(self):
+        return f"<KDTree points={len(self.points)} nodes={len(self.start)}>"
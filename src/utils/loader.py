@@ -1,7 +1,23 @@
+# src/utils/loader.py
+
 import json
+import os
+from array import array
+import numpy as np
 from src.models.drone import Drone
 from src.models.delivery import Delivery
 from src.models.noflyzone import NoFlyZone
+from src.utils.timeutils import minutes_to_timestr, to_minutes, to_minutes_window
+
+
+# Per-column numpy dtypes of load_delivery_columns()
+DELIVERY_COLUMNS = {
+    "id": np.int64,
+    "pos": np.float64,          # (n, 2)
+    "weight": np.float64,
+    "priority": np.int8,
+    "time_window": np.int32,    # (n, 2), minutes since midnight
+}
 
 
 def load_json_file(path):
@@ -12,18 +28,88 @@ def load_json_file(path):
         return json.load(f)
 
 
-def minutes_to_timestr(minute_val):
+def iter_json_records(path, chunk_size=1 << 20):
     """
-    Converts an integer minute value to "HH:MM" string format.
+    Yields records one at a time without reading the whole file.
+
+    ".jsonl" / ".ndjson" files hold one JSON object per line; any other file
+    is read as a JSON array, decoded element by element from buffered chunks.
     """
-    hours = minute_val // 60
-    minutes = minute_val % 60
-    return f"{hours:02d}:{minutes:02d}"
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+            return
+        yield from _iter_json_array(f, chunk_size)
+
+
+def _iter_json_array(f, chunk_size):
+    """
+    Incrementally decodes the elements of a top-level JSON array read from f.
+    Missing or trailing commas and data after the array raise json.JSONDecodeError, as in json.load().
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    # "start" expects "[", "opened" a value or "]", "value" a "," or "]",
+    # "comma" a value, and "closed" nothing but whitespace
+    state = "start"
+
+    while True:
+        # Skip whitespace, refilling the buffer when it runs out
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            chunk = f.read(chunk_size)
+            buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+
+        if pos >= len(buffer):
+            if state not in ("start", "closed"):
+                raise json.JSONDecodeError("Unterminated JSON array", buffer, pos)
+            return
+        char = buffer[pos]
+        if state == "start":
+            if char != "[":
+                raise ValueError("Expected a JSON array or a .jsonl file")
+            state, pos = "opened", pos + 1
+            continue
+        if state == "closed":
+            raise json.JSONDecodeError("Extra data", buffer, pos)
+        if char == "]" and state in ("opened", "value"):
+            state, pos = "closed", pos + 1
+            continue
+        if state == "value":
+            if char != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+            state, pos = "comma", pos + 1
+            continue
+        if char in ",]":
+            raise json.JSONDecodeError("Expecting value", buffer, pos)
+
+        try:
+            record, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as error:
+            # Only an error at the end of the buffer (or an unterminated string) can be a chunk boundary
+            if eof or not (error.msg.startswith("Unterminated string") or len(buffer) - error.pos <= 16):
+                raise
+            record, end = None, None
+        # A value ending exactly at the buffer end may be cut off (e.g. a number); read on to be sure
+        if end is None or (end == len(buffer) and not eof):
+            chunk = f.read(chunk_size)
+            buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+            continue
+        yield record
+        state, pos = "value", end
 
 
 def convert_time_window_to_str(time_window):
     """
-    Converts a tuple/list of 2 integers to ("HH:MM", "HH:MM")
+    Converts a tuple/list of 2 integers to ("HH:MM", "HH:MM"), for display only.
     """
     return (
         minutes_to_timestr(time_window[0]),
@@ -33,9 +119,9 @@ def convert_time_window_to_str(time_window):
 
 def load_drones(path):
     """
-    Loads a list of Drone objects from a JSON file.
+    Loads a list of Drone objects from a JSON or JSON Lines file.
     """
-    data = load_json_file(path)
+    data = iter_json_records(path)
     return [
         Drone(
             drone_id=d["id"],
@@ -50,17 +136,17 @@ def load_drones(path):
 
 def load_deliveries(path):
     """
-    Loads a list of Delivery objects from a JSON file.
-    Converts time_window from minutes to "HH:MM".
+    Loads a list of Delivery objects from a JSON or JSON Lines file.
+    time_window is kept in integer minutes.
     """
-    data = load_json_file(path)
+    data = iter_json_records(path)
     return [
         Delivery(
             delivery_id=d["id"],
             pos=tuple(d["pos"]),
             weight=d["weight"],
             priority=d["priority"],
-            time_window=convert_time_window_to_str(d["time_window"])
+            time_window=to_minutes_window(d["time_window"])
         )
         for d in data
     ]
@@ -68,15 +154,125 @@ def load_deliveries(path):
 
 def load_noflyzones(path):
     """
-    Loads a list of NoFlyZone objects from a JSON file.
-    Converts active_time from minutes to "HH:MM".
+    Loads a list of NoFlyZone objects from a JSON or JSON Lines file.
+    active_time is kept in integer minutes.
     """
-    data = load_json_file(path)
+    data = iter_json_records(path)
     return [
         NoFlyZone(
             zone_id=z["id"],
             coordinates=[tuple(coord) for coord in z["coordinates"]],
-            active_time=convert_time_window_to_str(z["active_time"])
+            active_time=to_minutes_window(z["active_time"])
         )
         for z in data
-    ]
\ No newline at end of file
+    ]
+
+
+def _window_minute(value) -> int:
+    # Integer minutes pass through; "HH:MM" strings go through the cached parser
+    return value if isinstance(value, int) else to_minutes(value)
+
+
+def read_delivery_columns(path) -> dict:
+    """
+    Streams deliveries into columnar NumPy arrays (see DELIVERY_COLUMNS) without
+    building Delivery objects; only one parsed record is alive at a time.
+    """
+    ids, xs, ys = array("q"), array("d"), array("d")
+    weights, priorities = array("d"), array("b")
+    starts, ends = array("l"), array("l")
+
+    for d in iter_json_records(path):
+        ids.append(d["id"])
+        x, y = d["pos"]
+        xs.append(x)
+        ys.append(y)
+        weights.append(d["weight"])
+        priorities.append(d["priority"])
+        start, end = d["time_window"]
+        starts.append(_window_minute(start))
+        ends.append(_window_minute(end))
+
+    def column(values, dtype):
+        return np.frombuffer(values, dtype=values.typecode).astype(dtype) if len(values) else np.empty(0, dtype)
+
+    return {
+        "id": column(ids, DELIVERY_COLUMNS["id"]),
+        "pos": np.stack((column(xs, np.float64), column(ys, np.float64)), axis=1),
+        "weight": column(weights, DELIVERY_COLUMNS["weight"]),
+        "priority": column(priorities, DELIVERY_COLUMNS["priority"]),
+        "time_window": np.stack((column(starts, np.int32), column(ends, np.int32)), axis=1),
+    }
+
+
+def save_columns(columns: dict, cache_dir: str, source=None):
+    """
+    Saves columns as one .npy file each (memory-mappable, unlike .npz members),
+    plus a meta.json recording the source file's size and mtime.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    for name, values in columns.items():
+        np.save(os.path.join(cache_dir, f"{name}.npy"), np.ascontiguousarray(values))
+    meta = {"columns": list(columns)}
+    if source is not None:
+        stat = os.stat(source)
+        meta["source"] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    with open(os.path.join(cache_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+
+def load_columns(cache_dir: str, source=None, mmap=True):
+    """
+    Loads columns saved with save_columns(), memory-mapped read-only by default.
+    Returns None if the cache is missing or older than the source file.
+    """
+    meta_path = os.path.join(cache_dir, "meta.json")
+    if not os.path.isfile(meta_path):
+        return None
+    with open(meta_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if source is not None:
+        stat = os.stat(source)
+        if meta.get("source") != {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}:
+            return None
+
+    mode = "r" if mmap else None
+    return {name: np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode=mode) for name in meta["columns"]}
+
+
+def load_delivery_columns(path, cache_dir=None, mmap=True) -> dict:
+    """
+    Loads deliveries as columnar arrays. With cache_dir, the first call writes a
+    binary cache and later calls memory-map it instead of parsing the file again.
+    """
+    if cache_dir is not None:
+        columns = load_columns(cache_dir, source=path, mmap=mmap)
+        if columns is not None:
+            return columns
+
+    columns = read_delivery_columns(path)
+    if cache_dir is not None:
+        save_columns(columns, cache_dir, source=path)
+        if mmap:
+            return load_columns(cache_dir, mmap=True)
+    return columns
+
+
+def deliveries_from_columns(columns: dict, rows=None) -> list:
+    """
+    Builds Delivery objects for the selected rows only (all rows when rows is None).
+    """
+    if rows is None:
+        rows = range(len(columns["id"]))
+    ids, pos, weights = columns["id"], columns["pos"], columns["weight"]
+    priorities, windows = columns["priority"], columns["time_window"]
+    return [
+        Delivery(
+            delivery_id=int(ids[r]),
+            pos=(float(pos[r, 0]), float(pos[r, 1])),
+            weight=float(weights[r]),
+            priority=int(priorities[r]),
+            time_window=(int(windows[r, 0]), int(windows[r, 1]))
+        )
+        for r in rows
+    ]
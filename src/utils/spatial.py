@@ -0,0 +1,121 @@
+# src/utils/spatial.py
+
+import numpy as np
+import shapely
+from shapely.geometry import LineString, Polygon
+from shapely.strtree import STRtree
+from src.utils.timeutils import to_minutes
+
+
+class NoFlyZoneIndex:
+    """
+    Spatial index over no-fly zones.
+
+    Zone polygons are built once and stored in an STRtree (whose predicate
+    queries prepare the tree geometries themselves), and active windows are kept
+    as integer minutes, so a segment is only tested against zones whose bounding
+    boxes it can hit.
+    """
+
+    def __init__(self, noflyzones: list):
+        """
+        :param noflyzones: List of NoFlyZone objects
+        """
+        self.zones = list(noflyzones)
+        self.polygons = [Polygon(zone.coordinates) for zone in self.zones]
+        self.tree = STRtree(self.polygons)
+
+        # Active windows as (start_minute, end_minute), inclusive
+        self.windows = np.array(
+            [(to_minutes(zone.active_time[0]), to_minutes(zone.active_time[1])) for zone in self.zones],
+            dtype=np.int64
+        ).reshape(-1, 2)
+        self._window_list = self.windows.tolist()
+
+    def active_mask(self, current_time) -> np.ndarray:
+        """
+        Returns a boolean array marking the zones active at current_time.
+        If current_time is None every zone counts as active.
+        """
+        if current_time is None:
+            return np.ones(len(self.zones), dtype=bool)
+        now = to_minutes(current_time)
+        return (self.windows[:, 0] <= now) & (now <= self.windows[:, 1])
+
+    def intersects(self, start: tuple, end: tuple, current_time) -> bool:
+        """
+        Checks if the straight segment start → end crosses any zone active at current_time.
+        """
+        hits = self.tree.query(LineString([start, end]), predicate="intersects")
+        if len(hits) == 0:
+            return False
+        return bool(self.active_mask(current_time)[hits].any())
+
+    def intersects_many(self, starts, ends, current_time) -> np.ndarray:
+        """
+        Bulk version of intersects for many segments.
+
+        :param starts: Sequence or (n, 2) array of segment start points
+        :param ends: Sequence or (n, 2) array of segment end points
+        :return: Boolean array of length n
+        """
+        starts = np.asarray(starts, dtype=float).reshape(-1, 2)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 2)
+        result = np.zeros(len(starts), dtype=bool)
+        if len(starts) == 0 or not self.zones:
+            return result
+
+        lines = shapely.linestrings(np.stack((starts, ends), axis=1))
+        segment_idx, zone_idx = self.tree.query(lines, predicate="intersects")
+        active = self.active_mask(current_time)
+        result[segment_idx[active[zone_idx]]] = True
+        return result
+
+    def segment_zones(self, starts, ends) -> list:
+        """
+        Returns, for each segment, the tuple of zone indices it crosses regardless of time.
+        """
+        starts = np.asarray(starts, dtype=float).reshape(-1, 2)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 2)
+        result = [()] * len(starts)
+        if len(starts) == 0 or not self.zones:
+            return result
+
+        lines = shapely.linestrings(np.stack((starts, ends), axis=1))
+        segment_idx, zone_idx = self.tree.query(lines, predicate="intersects")
+        hits = {}
+        for segment, zone in zip(segment_idx.tolist(), zone_idx.tolist()):
+            hits.setdefault(segment, []).append(zone)
+        for segment, zones in hits.items():
+            result[segment] = tuple(zones)
+        return result
+
+    def overlaps(self, zone_ids, start: float, end: float) -> bool:
+        """
+        Checks if any of the given zones is active at some point in [start, end] (minutes).
+        """
+        windows = self._window_list
+        return any(start <= windows[z][1] and end >= windows[z][0] for z in zone_ids)
+
+    def earliest_departure(self, zone_ids, depart: float, duration: float) -> float:
+        """
+        Returns the earliest time >= depart at which a flight of the given duration
+        (minutes) avoids every window of the given zones. Zones stay active through
+        their end minute, so a blocked flight waits until the minute after.
+        """
+        windows = self._window_list
+        moved = True
+        while moved:
+            moved = False
+            for z in zone_ids:
+                start, end = windows[z]
+                if depart <= end and depart + duration >= start:
+                    depart = end + 1
+                    moved = True
+        return depart
+
+    def __len__(self):
+        return len(self.zones)
+
+    def __repr__(self):
+        return f"<NoFlyZoneIndex zones={len(self.zones)}>"
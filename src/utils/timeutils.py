@@ -0,0 +1,46 @@
+# src/utils/timeutils.py
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1024)
+def timestr_to_minutes(time_str: str) -> int:
+    """
+    Converts an "HH:MM" string to minutes since midnight.
+    """
+    hours, minutes = time_str.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+def to_minutes(value) -> int:
+    """
+    Accepts integer minutes, an all-digit string of minutes ("90") or an "HH:MM" string
+    and returns integer minutes.
+    """
+    if isinstance(value, str):
+        value = value.strip()
+        return int(value) if value.isdigit() else timestr_to_minutes(value)
+    return int(value)
+
+
+def minutes_to_timestr(minute_val) -> str:
+    """
+    Converts an integer minute value to "HH:MM" string format.
+    """
+    hours = minute_val // 60
+    minutes = minute_val % 60
+    return f"{hours:02d}:{minutes:02d}"
+
+
+def to_minutes_window(time_window) -> tuple:
+    """
+    Normalizes a (start, end) window given as minutes or "HH:MM" strings to integer minutes.
+    """
+    return to_minutes(time_window[0]), to_minutes(time_window[1])
+
+
+def format_window(time_window) -> str:
+    """
+    Formats a window of integer minutes as "HH:MM – HH:MM" for display.
+    """
+    return f"{minutes_to_timestr(time_window[0])} – {minutes_to_timestr(time_window[1])}"
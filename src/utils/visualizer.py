@@ -1,67 +1,217 @@
 # src/utils/visualizer.py
 
+import math
+import os
+import sys
+import matplotlib
+
+# Without a display (e.g. on a server) fall back to the non-interactive Agg backend before pyplot loads
+if ("MPLBACKEND" not in os.environ and sys.platform.startswith("linux")
+        and not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY")):
+    matplotlib.use("Agg")
+
 import matplotlib.pyplot as plt
+from matplotlib.animation import FuncAnimation, PillowWriter
+from matplotlib.collections import LineCollection, PolyCollection
+from src.utils.timeutils import minutes_to_timestr
+
+DEFAULT_SAVE_PATH = os.path.join("visualization", "delivery_routes.png")
+LABEL_LIMIT = 200  # Text labels per category before labels are thinned out
+
 
-def draw_noflyzones(ax, noflyzones):
+def is_headless() -> bool:
     """
-    Draws no-fly zones as red polygons on the plot.
+    True when the active backend cannot open windows (plt.show() would do nothing useful).
     """
-    for zone in noflyzones:
-        xs, ys = zip(*zone.coordinates)
-        xs += (xs[0],)  # Close the polygon
-        ys += (ys[0],)
-        ax.plot(xs, ys, color='red', linestyle='-', linewidth=2, label="No-Fly Zone")
+    return matplotlib.get_backend().lower() in ("agg", "pdf", "ps", "svg", "cairo", "template")
 
-def plot_delivery_routes(drones, deliveries, positions, assignments, noflyzones=None, save_path=None):
+
+def draw_noflyzones(ax, noflyzones, label="No-Fly Zone"):
     """
-    Plots the delivery routes of drones on a 2D map.
+    Draws no-fly zones as red polygons on the plot (one PolyCollection).
+    """
+    if not noflyzones:
+        return None
+    zones = PolyCollection([zone.coordinates for zone in noflyzones], closed=True, facecolors="none",
+                           edgecolors="red", linewidths=2, label=label)
+    ax.add_collection(zones)
+    return zones
 
-    :param drones: List of Drone objects
-    :param deliveries: List of Delivery objects
-    :param positions: Dict mapping id -> (x, y)
-    :param assignments: List of (drone_id, delivery_id)
-    :param noflyzones: List of NoFlyZone objects (optional)
-    :param save_path: Optional path to save the image
+
+def draw_labels(ax, points, texts, limit=LABEL_LIMIT, fontsize=9):
     """
-    fig, ax = plt.subplots(figsize=(10, 8))
+    Writes texts next to points, keeping every k-th label when there are more than limit.
+    """
+    if not limit:
+        return
+    step = max(1, math.ceil(len(points) / limit))
+    for (x, y), text in list(zip(points, texts))[::step]:
+        ax.text(x + 0.5, y + 0.5, text, fontsize=fontsize)
+
+
+def draw_map(ax, drones, deliveries, positions, routes, noflyzones=None, label_limit=LABEL_LIMIT):
+    """
+    Draws deliveries, drones, routes and zones with one artist per category.
 
+    :param routes: List of ((x1, y1), (x2, y2)) segments
+    :return: (delivery scatter, drone scatter, route LineCollection, zone PolyCollection or None)
+    """
     # Plot delivery points
-    for delivery in deliveries:
-        delivery_key = f"D{delivery.id + 80}"
-        x, y = positions[delivery_key]
-        ax.scatter(x, y, color='blue', label='Delivery' if delivery.id == deliveries[0].id else "")
-        ax.text(x + 0.5, y + 0.5, f"D{delivery.id}", fontsize=9)
+    delivery_points = [positions[f"D{delivery.id + 80}"] for delivery in deliveries]
+    delivery_artist = ax.scatter([p[0] for p in delivery_points], [p[1] for p in delivery_points],
+                                 color='blue', label='Delivery')
+    draw_labels(ax, delivery_points, [f"D{delivery.id}" for delivery in deliveries], label_limit)
 
     # Plot drone start positions
-    for drone in drones:
-        drone_key = f"DR{drone.id}"
-        x, y = positions[drone_key]
-        ax.scatter(x, y, color='green', marker='^', s=100, label='Drone' if drone.id == drones[0].id else "")
-        ax.text(x + 0.5, y + 0.5, f"DR{drone.id}", fontsize=9)
+    drone_points = [positions[f"DR{drone.id}"] for drone in drones]
+    drone_artist = ax.scatter([p[0] for p in drone_points], [p[1] for p in drone_points],
+                              color='green', marker='^', s=100, label='Drone')
+    draw_labels(ax, drone_points, [f"DR{drone.id}" for drone in drones], label_limit)
 
     # Plot delivery routes
-    for idx, (drone_id, delivery_id) in enumerate(assignments):
-        if drone_id in positions and delivery_id in positions:
-            dx, dy = positions[drone_id]
-            tx, ty = positions[delivery_id]
-            ax.plot(
-                [dx, tx], [dy, ty],
-                linestyle='--',
-                color='orange',
-                linewidth=2,
-                label="Route" if idx == 0 else ""
-            )
+    route_artist = LineCollection(routes, linestyles='--', colors='orange', linewidths=2, label="Route")
+    ax.add_collection(route_artist)
 
     # Plot no-fly zones if available
-    if noflyzones:
-        draw_noflyzones(ax, noflyzones)
+    zone_artist = draw_noflyzones(ax, noflyzones)
 
-    ax.set_title("Drone Delivery Assignments")
     ax.set_xlabel("X Position (meters)")
     ax.set_ylabel("Y Position (meters)")
     ax.grid(True)
-    ax.legend()
+    ax.autoscale_view()
+    return delivery_artist, drone_artist, route_artist, zone_artist
 
+
+def finish(fig, save_path=None, show=None, default_path=DEFAULT_SAVE_PATH, animation=None, fps=1):
+    """
+    Saves and/or shows a figure (or an animation of it, as a GIF). Headless, an unsaved
+    figure is written to default_path instead of being shown; the figure is closed unless
+    it was shown.
+    """
+    if show is None:
+        show = not is_headless()
+    if save_path is None and not show:
+        save_path = default_path
     if save_path:
-        plt.savefig(save_path)
-    plt.show()
\ No newline at end of file
+        directory = os.path.dirname(save_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if animation is not None:
+            animation.save(save_path, writer=PillowWriter(fps=fps))
+        else:
+            fig.savefig(save_path)
+    if show:
+        plt.show()
+    else:
+        plt.close(fig)
+    return save_path
+
+
+def plot_delivery_routes(drones, deliveries, positions, assignments, noflyzones=None, save_path=None,
+                         show=None, label_limit=LABEL_LIMIT):
+    """
+    Plots the delivery routes of drones on a 2D map.
+
+    :param drones: List of Drone objects
+    :param deliveries: List of Delivery objects
+    :param positions: Dict mapping id -> (x, y)
+    :param assignments: List of (drone_id, delivery_id)
+    :param noflyzones: List of NoFlyZone objects (optional)
+    :param save_path: Optional path to save the image
+    :param show: Open a window; defaults to True unless the backend is headless
+    :param label_limit: Maximum text labels per category (0 disables labels)
+    :return: Path the image was saved to, or None
+    """
+    fig, ax = plt.subplots(figsize=(10, 8))
+    routes = [(positions[drone_id], positions[delivery_id]) for drone_id, delivery_id in assignments
+              if drone_id in positions and delivery_id in positions]
+    draw_map(ax, drones, deliveries, positions, routes, noflyzones, label_limit)
+    ax.set_title("Drone Delivery Assignments")
+    ax.legend()
+    return finish(fig, save_path, show)
+
+
+def slot_routes(drones, positions, slots) -> list:
+    """
+    Returns (route segments, {"DR<id>": drone position at slot start}) per slot,
+    starting every drone where its previous delivery left it.
+
+    :param slots: Dicts with "assignments" [(drone_id, delivery_id), ...] in slot order,
+                  e.g. RollingHorizonPlanner.slots
+    """
+    location = {drone.id: positions[f"DR{drone.id}"] for drone in drones}
+    result = []
+    for slot in slots:
+        start = {f"DR{drone_id}": point for drone_id, point in location.items()}
+        segments = []
+        for drone_id, delivery_id in slot["assignments"]:
+            target = positions[f"D{delivery_id + 80}"]
+            segments.append((location[drone_id], target))
+            location[drone_id] = target
+        result.append((segments, start))
+    return result
+
+
+def plot_slots(drones, deliveries, positions, slots, noflyzones=None, save_path=None, mode="tiles",
+               columns=3, fps=1, show=None, label_limit=LABEL_LIMIT):
+    """
+    Renders a rolling-horizon plan per time slot, either as a grid of maps ("tiles")
+    or as one frame per slot saved as a GIF ("animation"). Each slot shows its open
+    deliveries, its routes and the zones active at its start.
+
+    :param slots: RollingHorizonPlanner.slots (time, deliveries, zones and assignments per slot)
+    :param mode: "tiles" or "animation"
+    :param label_limit: Maximum text labels per category on tiles (animation frames have none)
+    :return: Path the image or animation was saved to, or None
+    """
+    if mode not in ("tiles", "animation"):
+        raise ValueError(f"Unknown mode {mode!r}, expected 'tiles' or 'animation'")
+
+    delivery_by_id = {delivery.id: delivery for delivery in deliveries}
+    zone_by_id = {zone.id: zone for zone in noflyzones or []}
+    routes = slot_routes(drones, positions, slots)
+
+    def slot_view(k):
+        slot = slots[k]
+        slot_deliveries = [delivery_by_id[d] for d in slot.get("deliveries", []) if d in delivery_by_id]
+        slot_zones = [zone_by_id[z] for z in slot.get("zones", []) if z in zone_by_id]
+        title = f"{minutes_to_timestr(slot['time'])} — {len(slot['assignments'])} atama"
+        return slot_deliveries, slot_zones, title
+
+    if mode == "tiles":
+        rows = max(1, math.ceil(len(slots) / columns))
+        fig, axes = plt.subplots(rows, columns, figsize=(5 * columns, 4 * rows), squeeze=False)
+        for k, ax in enumerate(axes.flat):
+            if k >= len(slots):
+                ax.set_visible(False)
+                continue
+            slot_deliveries, slot_zones, title = slot_view(k)
+            segments, drone_positions = routes[k]
+            draw_map(ax, drones, slot_deliveries, {**positions, **drone_positions}, segments, slot_zones, label_limit)
+            ax.set_title(title)
+        fig.tight_layout()
+        return finish(fig, save_path, show, os.path.join("visualization", "delivery_slots.png"))
+
+    # Animation: one set of artists, updated in place for every slot (text labels would not move, so none)
+    fig, ax = plt.subplots(figsize=(10, 8))
+    delivery_artist, drone_artist, route_artist, _ = draw_map(ax, drones, [], positions, [], None, 0)
+    zone_artist = PolyCollection([], closed=True, facecolors="none", edgecolors="red", linewidths=2,
+                                 label="No-Fly Zone")
+    ax.add_collection(zone_artist)
+    ax.update_datalim(list(positions.values()))
+    ax.autoscale_view()
+    ax.legend(loc="upper right")
+
+    def update(k):
+        slot_deliveries, slot_zones, title = slot_view(k)
+        points = [positions[f"D{delivery.id + 80}"] for delivery in slot_deliveries]
+        segments, drone_positions = routes[k]
+        delivery_artist.set_offsets(points if points else [[math.nan, math.nan]])
+        drone_artist.set_offsets([drone_positions[f"DR{drone.id}"] for drone in drones] or [[math.nan, math.nan]])
+        route_artist.set_segments(segments)
+        zone_artist.set_verts([zone.coordinates for zone in slot_zones])
+        ax.set_title(title)
+        return delivery_artist, drone_artist, route_artist, zone_artist
+
+    animation = FuncAnimation(fig, update, frames=len(slots), blit=False)
+    return finish(fig, save_path, show, os.path.join("visualization", "delivery_slots.gif"), animation, fps)
@@ -0,0 +1,30 @@
+# tests/test_assignment.py
+
+import itertools
+import numpy as np
+import pytest
+from src.algorithms.assignment import hungarian
+
+
+def brute_force(cost):
+    n, m = cost.shape
+    if n <= m:
+        return min(cost[range(n), list(cols)].sum() for cols in itertools.permutations(range(m), n))
+    return min(cost[list(rows), range(m)].sum() for rows in itertools.permutations(range(n), m))
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (3, 3), (4, 6), (6, 4), (5, 5), (2, 7)])
+def test_hungarian_matches_brute_force(shape):
+    rng = np.random.default_rng(sum(shape))
+    for _ in range(20):
+        cost = rng.integers(-20, 50, size=shape).astype(float)
+        rows, cols = hungarian(cost)
+        assert len(rows) == min(shape)
+        assert len(set(rows.tolist())) == len(rows) and len(set(cols.tolist())) == len(cols)
+        assert np.array_equal(rows, np.sort(rows))
+        assert cost[rows, cols].sum() == pytest.approx(brute_force(cost))
+
+
+def test_hungarian_empty():
+    rows, cols = hungarian(np.zeros((0, 3)))
+    assert len(rows) == len(cols) == 0
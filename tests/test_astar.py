@@ -0,0 +1,136 @@
+# tests/test_astar.py
+
+import math
+import random
+import pytest
+from benchmarks.astar_benchmark import complete_graph, grid_graphs, legacy_find_path
+from src.algorithms.astar import AStar
+from src.algorithms.csp import CSP
+from src.models.noflyzone import NoFlyZone
+from src.utils.graph import Graph
+from src.utils.graph_builder import ImplicitCompleteGraph, build_complete_graph, build_visibility_graph
+from src.utils.spatial import NoFlyZoneIndex
+
+
+@pytest.mark.parametrize("builder", [grid_graphs, complete_graph])
+def test_costs_from_matches_legacy_search(builder):
+    rng = random.Random(5)
+    positions, legacy_graph, graph = builder(400, rng)
+    node_ids = list(positions)
+    engine = AStar(graph, positions)
+    for start in rng.sample(node_ids, 3):
+        goals = rng.sample(node_ids, 25)
+        costs = engine.costs_from(start, goals)
+        for goal in goals:
+            assert costs[goal] == pytest.approx(legacy_find_path(legacy_graph, positions, start, goal), rel=1e-9)
+            assert engine.find_path(start, goal)[0] == pytest.approx(costs[goal], rel=1e-9)
+
+
+def test_direct_costs_match_dijkstra():
+    rng = random.Random(6)
+    positions = {f"N{i}": (rng.uniform(0, 1000), rng.uniform(0, 1000)) for i in range(300)}
+    engine = AStar(ImplicitCompleteGraph(positions), positions)
+    reference = AStar(build_complete_graph(positions), positions)
+    costs, expected = engine.costs_from("N0"), reference.costs_from("N0")
+    assert costs.keys() == expected.keys()
+    assert all(math.isclose(costs[node], expected[node], rel_tol=1e-9, abs_tol=1e-9) for node in expected)
+
+
+def test_adding_a_zone_invalidates_cached_paths():
+    positions = {"A": (0.0, 0.0), "B": (100.0, 0.0), "M": (50.0, 40.0)}
+    wall = NoFlyZone(1, [(40, -10), (60, -10), (60, 10), (40, 10)], (0, 600))
+    engine = AStar(build_visibility_graph(dict(positions), k=2), positions)
+    csp = CSP([], [], [], router=engine)
+    assert engine.find_path("A", "B") == (100.0, ["A", "B"])
+
+    # The zone removes the direct edge; the cached path crossing it must not be returned
+    csp.add_noflyzone(wall)
+    assert engine.zone_state == csp.zone_state
+    engine.graph = build_visibility_graph(dict(positions), k=2, noflyzones=csp.noflyzones, current_time=0)
+    engine.refresh()
+    cost, path = engine.find_path("A", "B")
+    assert path == ["A", "M", "B"] and cost == pytest.approx(2 * math.hypot(50, 40))
+
+
+@pytest.mark.parametrize("bidirectional", [False, True])
+def test_point_to_point_costs_match_legacy_search(bidirectional):
+    rng = random.Random(7)
+    positions, legacy_graph, csr = grid_graphs(900, rng)
+    node_ids = list(positions)
+    queries = [(rng.choice(node_ids), rng.choice(node_ids)) for _ in range(30)]
+    for graph in (legacy_graph, csr):
+        engine = AStar(graph, positions, cache_size=0)
+        for start, goal in queries:
+            cost, path = engine.search(start, goal, bidirectional=bidirectional)
+            assert cost == pytest.approx(legacy_find_path(legacy_graph, positions, start, goal), rel=1e-9)
+            assert path[0] == start and path[-1] == goal
+
+
+def test_dense_search_matches_legacy_search():
+    rng = random.Random(8)
+    positions, _, graph = complete_graph(200, rng)
+    legacy_graph = build_complete_graph(positions)
+    engine = AStar(graph, positions, cache_size=0)
+    node_ids = list(positions)
+    for start, goal in [(rng.choice(node_ids), rng.choice(node_ids)) for _ in range(20)]:
+        assert engine.search(start, goal)[0] == pytest.approx(
+            legacy_find_path(legacy_graph, positions, start, goal), rel=1e-9, abs=1e-9)
+
+
+def test_unknown_nodes_are_unreachable():
+    positions, graph, _ = grid_graphs(16, random.Random(9))
+    engine = AStar(graph, positions)
+    assert engine.find_path("N0_0", "missing") == (float('inf'), [])
+    assert engine.costs_from("missing", ["N0_0"]) == {"N0_0": float('inf')}
+
+
+def timed_engine(detour=True):
+    positions = {"A": (0.0, 0.0), "B": (100.0, 0.0), "M": (50.0, 40.0)}
+    graph = Graph()
+    for node_id in positions:
+        graph.add_node(node_id)
+    edges = [("A", "B"), ("A", "M"), ("M", "B")] if detour else [("A", "B")]
+    for a, b in edges:
+        graph.add_edge(a, b, math.dist(positions[a], positions[b]))
+    return AStar(graph, positions)
+
+
+def wall(active_time):
+    return NoFlyZoneIndex([NoFlyZone(1, [(40, -10), (60, -10), (60, 10), (40, 10)], active_time)])
+
+
+DETOUR = 2 * math.hypot(50, 40)
+
+
+def test_timed_route_waits_for_a_zone_to_expire():
+    speed = 100 / 60  # One minute for the direct edge
+    distance, path, arrival = timed_engine(detour=False).find_path_timed("A", "B", 0, speed, wall((0, 30)))
+    assert path == ["A", "B"] and distance == 100.0
+    assert arrival == pytest.approx(31 + 1)
+
+
+def test_timed_route_detours_around_a_zone_activating_mid_flight():
+    speed = 100 / 60
+    # Leaving at 9 the direct flight would still be in the air when the zone activates at 10
+    distance, path, arrival = timed_engine().find_path_timed("A", "B", 9, speed, wall((10, 20)))
+    assert path == ["A", "M", "B"]
+    assert distance == pytest.approx(DETOUR) and arrival == pytest.approx(9 + DETOUR / 100)
+    # Leaving earlier the direct edge is clear, and after the zone expires it is clear again
+    assert timed_engine().find_path_timed("A", "B", 8, speed, wall((10, 20)))[1] == ["A", "B"]
+    assert timed_engine().find_path_timed("A", "B", 21, speed, wall((10, 20)))[1] == ["A", "B"]
+
+
+def test_timed_route_waits_when_the_zone_expires_before_a_detour_would_arrive():
+    speed = 0.2  # Direct edge 8.33 minutes, detour 10.67 minutes
+    distance, path, arrival = timed_engine().find_path_timed("A", "B", 0, speed, wall((0, 0)))
+    assert path == ["A", "B"] and arrival == pytest.approx(1 + 100 / 12)
+    # Active longer, the detour wins
+    assert timed_engine().find_path_timed("A", "B", 0, speed, wall((0, 5)))[1] == ["A", "M", "B"]
+
+
+def test_timed_route_unreachable():
+    inf = float('inf')
+    engine = timed_engine(detour=False)
+    assert engine.find_path_timed("A", "B", 0, 10.0, wall((0, 600)), max_wait=30) == (inf, [], inf)
+    assert engine.find_path_timed("A", "missing", 0, 10.0, wall((0, 600))) == (inf, [], inf)
+    assert engine.find_path_timed("A", "B", 0, 0.0, wall((0, 600))) == (inf, [], inf)
@@ -0,0 +1,52 @@
+# tests/test_csp.py
+
+import numpy as np
+import pytest
+from src.algorithms.csp import CSP
+from src.utils.generator import generate_random_scenario
+
+
+@pytest.fixture(scope="module")
+def scenario():
+    drones, deliveries, zones = generate_random_scenario(12, 150, 6, seed=11)
+    for k, drone in enumerate(drones):
+        drone.remaining_battery = drone.battery * (0.2 + 0.8 * (k % 4) / 3)  # Vary the battery radius
+    return drones, deliveries, zones
+
+
+def scalar_matrix(csp, drones, deliveries, current_time):
+    return np.array([[csp.is_delivery_valid(drone, delivery, current_time) for delivery in deliveries]
+                     for drone in drones], dtype=bool)
+
+
+@pytest.mark.parametrize("current_time", [0, 45, "01:30", 200])
+def test_feasibility_matrix_matches_scalar_checks(scenario, current_time):
+    drones, deliveries, zones = scenario
+    csp = CSP(drones, deliveries, zones)
+    feasible, reasons = csp.feasibility_matrix(drones, deliveries, current_time)
+    assert np.array_equal(feasible, scalar_matrix(csp, drones, deliveries, current_time))
+    assert set(reasons) <= set(CSP.constraints)
+
+
+@pytest.mark.parametrize("current_time", [0, 90])
+def test_candidate_pairs_keep_every_feasible_pair(scenario, current_time):
+    drones, deliveries, zones = scenario
+    csp = CSP(drones, deliveries, zones)
+    rows, cols = csp.candidate_pairs(drones, deliveries)
+    assert np.array_equal(np.lexsort((cols, rows)), np.arange(len(rows)))  # Sorted by row, then column
+
+    feasible = csp.feasibility_pairs(drones, deliveries, rows, cols, current_time)[0]
+    expected = scalar_matrix(csp, drones, deliveries, current_time)
+    pruned = np.zeros_like(expected)
+    pruned[rows[feasible], cols[feasible]] = True
+    assert np.array_equal(pruned, expected)
+    assert np.array_equal(feasible, expected[rows, cols])
+
+
+def test_feasibility_pairs_of_every_pair_match_the_matrix(scenario):
+    drones, deliveries, zones = scenario
+    csp = CSP(drones, deliveries, zones)
+    rows, cols = np.divmod(np.arange(len(drones) * len(deliveries)), len(deliveries))
+    feasible = csp.feasibility_pairs(drones, deliveries, rows, cols, 60)[0]
+    assert np.array_equal(feasible.reshape(len(drones), len(deliveries)),
+                          csp.feasibility_matrix(drones, deliveries, 60)[0])
@@ -0,0 +1,51 @@
+# tests/test_csr_graph.py
+
+import numpy as np
+import pytest
+from src.algorithms.astar import AStar
+from src.utils.csr_graph import CSRGraph
+from src.utils.generator import generate_random_scenario
+from src.utils.graph_builder import build_positions, build_visibility_graph
+
+
+@pytest.fixture(scope="module")
+def scenario():
+    drones, deliveries, zones = generate_random_scenario(5, 80, 4, seed=9)
+    positions = build_positions(drones, deliveries)
+    return positions, build_visibility_graph(dict(positions), k=6, noflyzones=zones, current_time=90), zones
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_and_load_round_trip(tmp_path, scenario, mmap):
+    positions, graph, _ = scenario
+    CSRGraph.from_graph(graph, positions).save(str(tmp_path / "graph"))
+    loaded = CSRGraph.load(str(tmp_path / "graph"), mmap=mmap)
+
+    assert isinstance(loaded.neighbors, np.memmap) == mmap
+    assert loaded.node_ids == list(graph.adjacency_list)
+    assert loaded.positions() == {node_id: tuple(map(float, pos)) for node_id, pos in positions.items()}
+    for node_id, neighbors in graph.adjacency_list.items():
+        assert loaded.get_neighbors(node_id) == neighbors
+
+    node_ids = list(positions)
+    reference, engine = AStar(graph, positions, cache_size=0), AStar(loaded, loaded.positions(), cache_size=0)
+    for start, goal in zip(node_ids[:20], node_ids[::-4][:20]):
+        expected_cost, expected_path = reference.find_path(start, goal)
+        cost, path = engine.find_path(start, goal)
+        assert cost == pytest.approx(expected_cost, rel=1e-12)
+        assert path[:1] == expected_path[:1] and path[-1:] == expected_path[-1:]
+
+
+def test_bulk_construction_matches_graph_builder(scenario):
+    positions, graph, zones = scenario
+    csr = CSRGraph.from_positions(positions, k=6, noflyzones=zones, current_time=90)
+    for node_id, neighbors in graph.adjacency_list.items():
+        assert sorted(csr.get_neighbors(node_id)) == sorted(neighbors)
+
+
+def test_graph_without_coordinates(tmp_path):
+    graph = CSRGraph.from_edges(["a", "b", "c"], [0, 1], [1, 2], [1.0, 2.5])
+    graph.save(str(tmp_path / "graph"))
+    loaded = CSRGraph.load(str(tmp_path / "graph"))
+    assert loaded.coords is None and loaded.positions() == {}
+    assert sorted(loaded.get_neighbors("b")) == [("a", 1.0), ("c", 2.5)]
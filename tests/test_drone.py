@@ -0,0 +1,23 @@
+# tests/test_drone.py
+
+import pytest
+from src.models.drone import Drone
+
+
+def test_new_drone_is_idle_and_charged():
+    drone = Drone(1, 4.0, 12000, 8.0, (10, 10))
+    assert drone.current_pos == drone.start_pos == (10, 10)
+    assert drone.remaining_battery == 12000
+    assert drone.carrying_weight == 0.0 and drone.active
+
+
+def test_reset_restores_the_operational_state():
+    drone = Drone(1, 4.0, 12000, 8.0, (10, 10))
+    drone.current_pos, drone.remaining_battery, drone.carrying_weight, drone.active = (5, 5), 100, 2.0, False
+    drone.reset()
+    assert (drone.current_pos, drone.remaining_battery, drone.carrying_weight, drone.active) == ((10, 10), 12000, 0.0, True)
+
+
+def test_drones_have_no_instance_dict():
+    with pytest.raises(AttributeError):
+        Drone(1, 4.0, 12000, 8.0, (10, 10)).color = "red"
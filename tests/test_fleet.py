@@ -0,0 +1,84 @@
+# tests/test_fleet.py
+
+import numpy as np
+import pytest
+from src.algorithms.csp import CSP
+from src.algorithms.genetic import GeneticOptimizer
+from src.models.fleet import DeliveryBatch, DroneFleet
+from src.utils.generator import generate_random_scenario
+from src.utils.graph_builder import ImplicitCompleteGraph, build_positions
+
+DRONE_FIELDS = ("id", "max_weight", "battery", "speed", "start_pos", "current_pos", "remaining_battery",
+                "carrying_weight", "active")
+DELIVERY_FIELDS = ("id", "pos", "weight", "priority", "time_window", "assigned_drone_id", "delivered")
+
+
+def scenario(seed=4):
+    drones, deliveries, zones = generate_random_scenario(6, 30, 3, seed=seed)
+    drones[1].current_pos, drones[1].remaining_battery, drones[1].carrying_weight = (3.0, 4.0), 1234.5, 1.5
+    drones[2].active = False
+    deliveries[0].assigned_drone_id, deliveries[0].delivered = drones[0].id, True
+    return drones, deliveries, zones
+
+
+def fields(items, names):
+    return [tuple(getattr(item, name) for name in names) for item in items]
+
+
+def test_views_round_trip_to_the_objects():
+    drones, deliveries, _ = scenario()
+    fleet, batch = DroneFleet.from_drones(drones), DeliveryBatch.from_deliveries(deliveries)
+    assert fields(fleet, DRONE_FIELDS) == fields(drones, DRONE_FIELDS)
+    assert fields(batch.views(), DELIVERY_FIELDS) == fields(deliveries, DELIVERY_FIELDS)
+    assert fields(batch.views([5, 2]), DELIVERY_FIELDS) == fields([deliveries[5], deliveries[2]], DELIVERY_FIELDS)
+    assert fleet[-1].id == drones[-1].id and batch.row_of(deliveries[7].id) == 7
+    with pytest.raises(IndexError):
+        fleet[len(drones)]
+
+
+def test_view_writes_go_to_the_arrays():
+    drones, deliveries, _ = scenario()
+    fleet, batch = DroneFleet.from_drones(drones), DeliveryBatch.from_deliveries(deliveries)
+    drone, delivery = fleet[1], batch[3]
+    drone.current_pos, drone.remaining_battery = (7.0, 8.0), 10.0
+    delivery.time_window, delivery.assigned_drone_id = ("09:00", "10:30"), 5
+    assert fleet.current_pos[1].tolist() == [7.0, 8.0] and fleet.remaining_battery[1] == 10.0
+    assert batch.time_window[3].tolist() == [540, 630] and batch.assigned_drone_id[3] == 5
+
+    delivery.assigned_drone_id = None
+    assert batch.assigned_drone_id[3] == -1 and delivery.assigned_drone_id is None
+    fleet.reset()
+    assert fleet[1].current_pos == fleet[1].start_pos and fleet[2].active
+    assert fleet[1].remaining_battery == fleet[1].battery
+
+
+@pytest.mark.parametrize("engine", GeneticOptimizer.engines)
+def test_genetic_results_match_with_views_and_lists(engine):
+    drones, deliveries, zones = scenario()
+
+    def run(drones, deliveries):
+        positions = build_positions(drones, deliveries)
+        return GeneticOptimizer(drones, deliveries, zones, ImplicitCompleteGraph(positions), positions, 60,
+                                engine=engine, seed=4).run(10, 8)
+
+    expected = run(drones, deliveries)
+    fleet, batch = DroneFleet.from_drones(drones), DeliveryBatch.from_deliveries(deliveries)
+    assert expected
+    assert run(fleet, batch) == expected
+    assert run(fleet.views(), batch.views()) == expected
+
+
+def test_csp_results_match_with_views_and_lists():
+    drones, deliveries, zones = scenario()
+    fleet, batch = DroneFleet.from_drones(drones), DeliveryBatch.from_deliveries(deliveries)
+    csp = CSP(drones, deliveries, zones)
+
+    feasible, reasons = csp.feasibility_matrix(drones, deliveries, 60)
+    assert feasible.any()
+    for pair in ((fleet, batch), (fleet.views(), batch.views())):
+        other, other_reasons = CSP(*pair, zones).feasibility_matrix(*pair, 60)
+        assert np.array_equal(other, feasible)
+        assert all(np.array_equal(other_reasons[name], reasons[name]) for name in reasons)
+        rows, cols = CSP(*pair, zones).candidate_pairs(*pair)
+        expected_rows, expected_cols = csp.candidate_pairs(drones, deliveries)
+        assert np.array_equal(rows, expected_rows) and np.array_equal(cols, expected_cols)
@@ -0,0 +1,91 @@
+# tests/test_genetic.py
+
+import numpy as np
+import pytest
+from src.algorithms.evaluation import FitnessTable
+from src.algorithms.genetic import GeneticOptimizer
+from src.algorithms.islands import IslandModel
+from src.algorithms.vectorized import VectorizedGA
+from src.utils.instrumentation import Instrumentation
+from src.utils.generator import generate_random_scenario
+from src.utils.graph_builder import ImplicitCompleteGraph, build_positions
+
+
+def optimizer(seed=7, engine="python", n_drones=8, n_deliveries=40, n_zones=3):
+    drones, deliveries, zones = generate_random_scenario(n_drones, n_deliveries, n_zones, seed=seed)
+    positions = build_positions(drones, deliveries)
+    return GeneticOptimizer(drones, deliveries, zones, ImplicitCompleteGraph(positions), positions, 60,
+                            engine=engine, seed=seed)
+
+
+@pytest.mark.parametrize("engine", GeneticOptimizer.engines)
+def test_seeded_runs_are_deterministic(engine):
+    first = optimizer(engine=engine).run(15, 8)
+    assert optimizer(engine=engine).run(15, 8) == first
+    assert first and optimizer(engine=engine).table.fitness(first) > FitnessTable.infeasible
+
+
+def test_scoring_workers_do_not_change_the_result():
+    assert optimizer().run(10, 8, workers=2) == optimizer().run(10, 8)
+
+
+def test_engines_score_chromosomes_alike():
+    table = optimizer().table
+    engine = VectorizedGA(table, seed=0)
+    rng = np.random.default_rng(0)
+
+    # Random genomes of feasible genes (repeated deliveries likely), idle drones and invalid pairs
+    population = np.full((600, len(table.drones)), -1, dtype=np.int64)
+    for i, candidates in enumerate(table.candidates):
+        picks = rng.choice(candidates[:4] or [-1], size=len(population))
+        population[:, i] = np.where(rng.random(len(population)) < 0.8, picks, -1)
+    population[:100] = rng.integers(-1, len(table.deliveries), size=(100, len(table.drones)))
+    batched = engine.fitness(population)
+    single = [table.fitness(engine.decode(genome)) for genome in population]
+    assert batched == pytest.approx(single)
+
+
+def test_infeasible_ranks_below_every_feasible_solution():
+    table = optimizer().table
+    i = next(i for i, candidates in enumerate(table.candidates) if len(candidates) >= 2)
+    drone_id = table.drones[i].id
+    first, second = (table.deliveries[j].id for j in table.candidates[i][:2])
+
+    worst_feasible = -1e12
+    assert table.fitness([(drone_id, first), (drone_id, second)]) < worst_feasible
+    invalid = next(j for j, ok in enumerate(table.valid[i]) if not ok)
+    assert table.fitness([(drone_id, table.deliveries[invalid].id)]) < worst_feasible
+    assert VectorizedGA(table).fitness(np.array([[-1] * i + [invalid] + [-1] * (len(table.drones) - i - 1)]))[0] < worst_feasible
+
+
+def test_table_from_state_matches_original():
+    source = optimizer()
+    source.table.fill_costs()
+    target = optimizer()
+    target.load_table(source.table.export_state())
+    assert target.table.valid == source.table.valid
+    assert target.table.cost == source.table.cost
+    assert target.table.candidates == source.table.candidates
+    solution = source.run(5, 6)
+    assert target.table.fitness(solution) == source.table.fitness(solution)
+
+
+def test_islands_without_generations_return_the_best_initial_individual():
+    base = optimizer()
+    model = IslandModel(base.drones, base.deliveries, base.noflyzones, base.graph, base.positions, 60,
+                        islands=2, seed=3, workers=1)
+    best = model.run(generations=0, population_size=8)
+    table = model.optimizer.table
+    assert table.fitness(best) == max(table.fitness(solution) for population in model.populations
+                                      for solution in population)
+
+
+def test_cancel_before_run_stops_after_the_first_generation():
+    ga = optimizer()
+    ga.stats = Instrumentation()
+    ga.cancel()
+    ga.run(generations=50, population_size=6)
+    assert len(ga.stats.history) == 1
+
+    ga.run(generations=5, population_size=6)
+    assert len(ga.stats.history) == 5
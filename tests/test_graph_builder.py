@@ -0,0 +1,70 @@
+# tests/test_graph_builder.py
+
+import math
+import numpy as np
+import pytest
+from benchmarks.astar_benchmark import legacy_find_path
+from shapely.geometry import LineString, Polygon
+from src.algorithms.astar import AStar
+from src.utils.generator import generate_random_scenario
+from src.utils.graph_builder import (ImplicitCompleteGraph, build_complete_graph, build_positions,
+                                     build_visibility_graph, nearest_neighbors)
+
+
+@pytest.fixture(scope="module")
+def scenario():
+    drones, deliveries, zones = generate_random_scenario(5, 60, 5, seed=8)
+    return build_positions(drones, deliveries), zones
+
+
+def edges(graph):
+    return {(a, b) for a, neighbors in graph.adjacency_list.items() for b, _ in neighbors}
+
+
+def test_edges_crossing_active_zones_are_excluded(scenario):
+    positions, zones = scenario
+    current_time = 60
+    unblocked = edges(build_visibility_graph(dict(positions), k=8))
+    kept = edges(build_visibility_graph(dict(positions), k=8, noflyzones=zones, current_time=current_time))
+    assert kept < unblocked
+
+    active = [Polygon(zone.coordinates) for zone in zones if zone.active_time[0] <= current_time <= zone.active_time[1]]
+    for a, b in unblocked:
+        crosses = any(LineString([positions[a], positions[b]]).intersects(polygon) for polygon in active)
+        assert ((a, b) in kept) != crosses
+
+    # Without a time, every zone blocks
+    assert edges(build_visibility_graph(dict(positions), k=8, noflyzones=zones)) <= kept
+
+
+@pytest.mark.parametrize("k", [1, 4, 8])
+def test_k_limits_the_degree(scenario, k):
+    positions, _ = scenario
+    graph = build_visibility_graph(dict(positions), k=k)
+    node_ids = list(positions)
+    coords = np.array([positions[node_id] for node_id in node_ids])
+    found = edges(graph)
+
+    assert len(found) <= 2 * k * len(node_ids)  # Each node adds at most k undirected edges
+    for i, nearest in enumerate(nearest_neighbors(coords, k)):
+        assert all((node_ids[i], node_ids[j]) in found for j in nearest)
+    for node_id, neighbors in graph.adjacency_list.items():
+        costs = [cost for _, cost in neighbors]
+        assert costs == pytest.approx([math.dist(positions[node_id], positions[b]) for b, _ in neighbors])
+
+
+def test_path_costs_match_the_complete_graph(scenario):
+    positions, _ = scenario
+    complete = build_complete_graph(positions)
+    node_ids = list(positions)
+    queries = [(node_ids[i], node_ids[-1 - 3 * i]) for i in range(15)]
+    engines = {
+        "implicit": AStar(ImplicitCompleteGraph(positions), positions),
+        "visibility_all": AStar(build_visibility_graph(dict(positions), k=len(positions) - 1), positions),
+    }
+    sparse = AStar(build_visibility_graph(dict(positions), k=8), positions)
+    for start, goal in queries:
+        expected = legacy_find_path(complete, positions, start, goal)
+        for engine in engines.values():
+            assert engine.find_path(start, goal)[0] == pytest.approx(expected, rel=1e-9)
+        assert sparse.find_path(start, goal)[0] >= expected - 1e-9  # Fewer edges never shorten a path
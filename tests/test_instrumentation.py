@@ -0,0 +1,54 @@
+# tests/test_instrumentation.py
+
+import pytest
+from src.algorithms.genetic import GeneticOptimizer
+from src.utils.generator import generate_random_scenario
+from src.utils.graph_builder import ImplicitCompleteGraph, build_positions
+from src.utils.instrumentation import Instrumentation
+
+
+def optimizer(engine="python", stats=None):
+    drones, deliveries, zones = generate_random_scenario(6, 30, 3, seed=5)
+    positions = build_positions(drones, deliveries)
+    return GeneticOptimizer(drones, deliveries, zones, ImplicitCompleteGraph(positions), positions, 60,
+                            engine=engine, seed=5, zone_routing=True, stats=stats)
+
+
+@pytest.mark.parametrize("engine", GeneticOptimizer.engines)
+def test_enabled_instrumentation_records_timers_counters_and_events(engine):
+    stats = Instrumentation()
+    events = []
+    stats.subscribe(lambda event, data: events.append((event, data)))
+    optimizer(engine, stats).run(generations=6, population_size=8)
+
+    for name in ("ga.run", "ga.table", "ga.generation"):
+        total, calls = stats.timers[name]
+        assert total >= 0 and calls >= 1
+    assert stats.timers["ga.generation"][1] == 6 and stats.timers["ga.run"][1] == 1
+    assert stats.counters["ga.fitness.calls"] > 0
+    assert stats.counters["csp.checks"] > 0
+    assert stats.counters["astar.searches"] > 0 and stats.counters["astar.expansions"] > 0
+
+    assert [generation for generation, _, _ in stats.history] == list(range(6))
+    assert [event for event, _ in events] == ["generation"] * 6 + ["run_end"]
+    assert events[-1][1]["engine"] == engine
+
+    snapshot = stats.snapshot()
+    assert snapshot["counters"]["ga.fitness.calls"] == stats.counters["ga.fitness.calls"]
+    assert "ga.run" in stats.report()
+    stats.reset()
+    assert not stats.counters and not stats.timers and not stats.history
+
+
+@pytest.mark.parametrize("engine", GeneticOptimizer.engines)
+def test_disabled_instrumentation_records_nothing(engine, monkeypatch):
+    expected = optimizer(engine, Instrumentation()).run(generations=6, population_size=8)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("instrumentation hook called while disabled")
+
+    for name in ("count", "add_time", "timer", "emit"):
+        monkeypatch.setattr(Instrumentation, name, fail)
+    ga = optimizer(engine)
+    assert ga.stats is None and ga.astar.stats is None and ga.csp.stats is None
+    assert ga.run(generations=6, population_size=8) == expected
@@ -0,0 +1,51 @@
+# tests/test_kdtree.py
+
+import numpy as np
+import pytest
+from src.utils.kdtree import KDTree
+
+
+@pytest.fixture(scope="module")
+def points():
+    rng = np.random.default_rng(4)
+    # Clustered points with exact duplicates stress ties and uneven splits
+    clusters = rng.normal(scale=5.0, size=(400, 2)) + rng.choice([0.0, 50.0, 200.0], size=(400, 1))
+    return np.vstack((clusters, clusters[:20], rng.uniform(0, 300, size=(300, 2))))
+
+
+@pytest.mark.parametrize("leaf_size", [1, 4, 16])
+def test_query_radius_matches_brute_force(points, leaf_size):
+    tree = KDTree(points, leaf_size=leaf_size)
+    rng = np.random.default_rng(leaf_size)
+    for center, radius in zip(rng.uniform(-20, 320, size=(40, 2)), rng.uniform(0, 60, size=40)):
+        expected = np.nonzero(np.hypot(*(points - center).T) <= radius)[0]
+        assert np.array_equal(tree.query_radius(center, radius), expected)
+    assert np.array_equal(tree.query_radius(points[0], 0.0), np.nonzero((points == points[0]).all(axis=1))[0])
+
+
+@pytest.mark.parametrize("k", [1, 5, 30])
+def test_query_matches_brute_force(points, k):
+    tree = KDTree(points, leaf_size=8)
+    for center in np.random.default_rng(k).uniform(-20, 320, size=(30, 2)):
+        distances, indices = tree.query(center, k)
+        expected = np.sort(np.hypot(*(points - center).T))[:k]
+        assert distances == pytest.approx(expected)
+        assert np.hypot(*(points[indices] - center).T) == pytest.approx(distances)
+
+
+def test_neighbors_match_brute_force(points):
+    k = 6
+    neighbors = KDTree(points, leaf_size=8).neighbors(k)
+    distances = np.hypot(points[:, None, 0] - points[None, :, 0], points[:, None, 1] - points[None, :, 1])
+    np.fill_diagonal(distances, np.inf)
+    expected = np.sort(distances, axis=1)[:, :k]
+    found = np.sort(np.take_along_axis(distances, neighbors, axis=1), axis=1)
+    assert neighbors.shape == (len(points), k)
+    assert np.allclose(found, expected)
+    assert not (neighbors == np.arange(len(points))[:, None]).any()
+
+
+def test_empty_tree():
+    tree = KDTree(np.empty((0, 2)))
+    assert len(tree.query_radius((0, 0), 10)) == 0
+    assert len(tree.query((0, 0), 3)[1]) == 0
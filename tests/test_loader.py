@@ -0,0 +1,152 @@
+# tests/test_loader.py
+
+import io
+import json
+import os
+import numpy as np
+import pytest
+from src.utils.generator import generate_random_scenario
+from src.utils.loader import (_iter_json_array, convert_time_window_to_str, deliveries_from_columns,
+                              iter_json_records, load_deliveries, load_delivery_columns, load_drones,
+                              load_noflyzones)
+
+
+RECORDS = [{"id": k, "name": "x" * (k % 7), "pos": [k * 1.5, -k], "ok": k % 2 == 0, "note": None}
+           for k in range(50)]
+
+
+def write(path, records, jsonl):
+    with open(path, "w", encoding="utf-8") as f:
+        if jsonl:
+            f.write("".join(json.dumps(record) + "\n" for record in records))
+        else:
+            json.dump(records, f, indent=2)
+
+
+def scenario_records():
+    drones, deliveries, zones = generate_random_scenario(4, 30, 3, seed=2)
+    return (
+        [{"id": d.id, "max_weight": d.max_weight, "battery": d.battery, "speed": d.speed,
+          "start_pos": list(d.start_pos)} for d in drones],
+        [{"id": d.id, "pos": list(d.pos), "weight": d.weight, "priority": d.priority,
+          "time_window": list(convert_time_window_to_str(d.time_window))} for d in deliveries],
+        [{"id": z.id, "coordinates": [list(c) for c in z.coordinates], "active_time": list(z.active_time)}
+         for z in zones],
+    ), (drones, deliveries, zones)
+
+
+def summary(drones, deliveries, zones):
+    return ([(d.id, d.max_weight, d.battery, d.speed, d.start_pos) for d in drones],
+            [(d.id, d.pos, d.weight, d.priority, d.time_window) for d in deliveries],
+            [(z.id, z.coordinates, z.active_time) for z in zones])
+
+
+@pytest.mark.parametrize("extension", [".json", ".jsonl"])
+def test_scenario_round_trip(tmp_path, extension):
+    (drone_records, delivery_records, zone_records), original = scenario_records()
+    paths = [str(tmp_path / (name + extension)) for name in ("drones", "deliveries", "noflyzones")]
+    for path, records in zip(paths, (drone_records, delivery_records, zone_records)):
+        write(path, records, extension == ".jsonl")
+
+    loaded = load_drones(paths[0]), load_deliveries(paths[1]), load_noflyzones(paths[2])
+    assert summary(*loaded) == summary(*original)
+
+
+@pytest.mark.parametrize("extension", [".json", ".jsonl"])
+def test_delivery_columns_round_trip_through_the_cache(tmp_path, extension):
+    _, delivery_records, _ = scenario_records()[0]
+    path = str(tmp_path / ("deliveries" + extension))
+    write(path, delivery_records, extension == ".jsonl")
+    cache = str(tmp_path / "cache")
+    expected = summary([], load_deliveries(path), [])
+
+    parsed = load_delivery_columns(path, cache_dir=cache)
+    cached = load_delivery_columns(path, cache_dir=cache)
+    assert isinstance(cached["id"], np.memmap)
+    for columns in (parsed, cached, load_delivery_columns(path, cache_dir=cache, mmap=False)):
+        assert summary([], deliveries_from_columns(columns), []) == expected
+    assert summary([], deliveries_from_columns(cached, rows=[3, 1]), [])[1] == [expected[1][3], expected[1][1]]
+
+    # A changed source invalidates the cache
+    write(path, delivery_records[:5], extension == ".jsonl")
+    os.utime(path, ns=(0, 0))
+    assert len(load_delivery_columns(path, cache_dir=cache)["id"]) == 5
+
+
+def test_empty_files(tmp_path):
+    path = tmp_path / "deliveries.jsonl"
+    path.write_text("\n", encoding="utf-8")
+    assert load_deliveries(str(path)) == []
+    assert len(load_delivery_columns(str(path))["id"]) == 0
+
+
+def test_malformed_jsonl_line_raises(tmp_path):
+    path = tmp_path / "drones.jsonl"
+    path.write_text('{"id": 1}\n{"id": \n', encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(iter_json_records(str(path)))
+
+
+def records(text, chunk_size=7):
+    return list(_iter_json_array(io.StringIO(text), chunk_size))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 1 << 20])
+def test_json_array_across_chunk_boundaries(chunk_size):
+    assert records(json.dumps(RECORDS, indent=2), chunk_size) == RECORDS
+
+
+def test_empty_inputs():
+    assert records("") == []
+    assert records(" [ ] ") == []
+
+
+@pytest.mark.parametrize("text", ['[{"id": 1}, {"id": ', '[{"id": 1}, {"id": 2', '[1, tr', '[{"id": "abc'])
+def test_truncated_array_raises(text):
+    with pytest.raises(ValueError):
+        records(text)
+
+
+def test_unterminated_array_raises():
+    with pytest.raises(ValueError, match="Unterminated JSON array"):
+        records('[{"id": 1}, {"id": 2}')
+
+
+@pytest.mark.parametrize("text", ["[@@@]", '[{"id": 1}, garbage, {"id": 2}]', '[{"id" 1}]'])
+def test_garbage_array_raises(text):
+    with pytest.raises(ValueError):
+        records(text)
+
+
+@pytest.mark.parametrize("text", ["[1 2]", "[1,]", "[1,]x", "[1,,2]", "[,1]", '[{"id": 1} {"id": 2}]', "[1] x", "[1]]"])
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 20])
+def test_malformed_array_syntax_raises_like_json_load(text, chunk_size):
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(text)
+    with pytest.raises(json.JSONDecodeError):
+        records(text, chunk_size)
+
+
+def test_whitespace_after_the_array_is_allowed():
+    assert records("[1, 2]\n  \n") == [1, 2]
+
+
+def test_garbage_raises_before_reading_the_rest():
+    class Source(io.StringIO):
+        reads = 0
+
+        def read(self, size=-1):
+            Source.reads += 1
+            return super().read(size)
+
+    source = Source('[{"id": 1}, @@@' + ", 1" * 10_000 + "]")
+    with pytest.raises(json.JSONDecodeError):
+        list(_iter_json_array(source, 64))
+    assert Source.reads < 5
+
+
+def test_not_an_array_raises(tmp_path):
+    path = tmp_path / "records.json"
+    path.write_text('{"id": 1}', encoding="utf-8")
+    with pytest.raises(ValueError, match="Expected a JSON array"):
+        list(iter_json_records(str(path)))
@@ -0,0 +1,113 @@
+# tests/test_planner.py
+
+import numpy as np
+import pytest
+from src.algorithms.genetic import GeneticOptimizer
+from src.algorithms.planner import DispatchPlanner
+from src.models.delivery import Delivery
+from src.models.drone import Drone
+from src.models.noflyzone import NoFlyZone
+from src.utils.generator import generate_random_scenario
+from src.utils.graph_builder import ImplicitCompleteGraph, build_positions
+
+
+def scenario():
+    drones = [Drone(k, 5.0, 10000, 10.0, (10.0 * k, 10.0 * k)) for k in range(3)]
+    deliveries = [Delivery(k, (10.0 * k + 3, 10.0 * k + 4), 1.0, 1 + k % 5, (0, 600)) for k in range(6)]
+    return drones, deliveries
+
+
+def test_deactivated_drone_stays_idle_after_set_time():
+    drones, deliveries = scenario()
+    planner = DispatchPlanner(drones, deliveries, [], current_time=30, seed=1, generations=5, population_size=6)
+    planner.replan()
+    assert any(planner.optimizer.table.valid[0])
+
+    planner.update_drone_state(0, active=False)
+    planner.set_time(60)
+    best = planner.replan()
+
+    table = planner.optimizer.table
+    assert table.current_time == 60
+    assert not any(table.valid[table.drone_index[0]])
+    assert all(drone_id != 0 for drone_id, _ in best)
+
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_streamed_delivery_skips_an_inactive_drone(engine):
+    drones, deliveries = scenario()
+    planner = DispatchPlanner(drones, deliveries, [], current_time=30, engine=engine, seed=2,
+                              generations=5, population_size=6)
+    planner.update_drone_state(0, active=False)
+    planner.replan()
+
+    planner.add_delivery(Delivery(50, (1.0, 1.0), 1.0, 5, (0, 600)))
+    best = planner.replan()
+
+    table = planner.optimizer.table
+    assert not any(table.valid[table.drone_index[0]])
+    assert all(drone_id != 0 for drone_id, _ in best)
+
+
+def fresh_table(planner):
+    positions = build_positions(planner.drones, planner.deliveries)
+    optimizer = GeneticOptimizer(planner.drones, list(planner.deliveries), list(planner.optimizer.noflyzones),
+                                 ImplicitCompleteGraph(positions), positions, planner.optimizer.current_time)
+    return optimizer.table
+
+
+def assert_matches_rebuild(planner):
+    table, expected = planner.optimizer.table, fresh_table(planner)
+    assert [delivery.id for delivery in table.deliveries] == [delivery.id for delivery in expected.deliveries]
+    assert table.valid == expected.valid
+    assert table.candidates == expected.candidates
+    table.fill_costs()
+    expected.fill_costs()
+    for i, row in enumerate(table.valid):
+        columns = [j for j, ok in enumerate(row) if ok]
+        assert [table.cost[i][j] for j in columns] == pytest.approx([expected.cost[i][j] for j in columns])
+    if planner.optimizer.engine == "numpy":
+        valid, score = table.as_arrays()
+        expected_valid, expected_score = expected.as_arrays()
+        assert np.array_equal(valid, expected_valid)
+        assert np.allclose(score, expected_score)
+
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_patches_match_a_fresh_rebuild(engine):
+    drones, deliveries, zones = generate_random_scenario(6, 40, 2, seed=3)
+    planner = DispatchPlanner(drones, deliveries[:30], zones, current_time=60, engine=engine, seed=2,
+                              generations=4, population_size=6)
+    planner.replan()
+
+    for delivery in deliveries[30:35]:
+        planner.add_delivery(delivery)
+    assert_matches_rebuild(planner)
+
+    planner.complete_delivery(deliveries[3].id)
+    planner.complete_delivery(deliveries[31].id)
+    assert_matches_rebuild(planner)
+
+    planner.update_drone_state(drones[0].id, position=deliveries[5].pos, remaining_battery=drones[0].battery / 2)
+    planner.update_drone_state(drones[1].id, carrying_weight=1.0)
+    planner.update_drone_state(drones[2].id, active=False)
+    assert_matches_rebuild(planner)
+
+    planner.add_delivery(deliveries[35])
+    assert_matches_rebuild(planner)
+
+    planner.add_noflyzone(NoFlyZone(99, [(0, 0), (80, 0), (80, 80), (0, 80)], (0, 600)))
+    planner.replan()
+    assert_matches_rebuild(planner)
+
+    planner.set_time(120)
+    planner.replan()
+    assert_matches_rebuild(planner)
+
+
+def test_field_reports_are_written_onto_the_callers_drones():
+    drones, deliveries = scenario()
+    planner = DispatchPlanner(drones, deliveries, [], current_time=30, seed=1, generations=5, population_size=6)
+    planner.update_drone_state(1, position=(50.0, 50.0), remaining_battery=4000)
+    assert planner.drones[1] is drones[1]
+    assert drones[1].start_pos == (50.0, 50.0) and drones[1].remaining_battery == 4000
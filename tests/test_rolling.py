@@ -0,0 +1,24 @@
+# tests/test_rolling.py
+
+from src.algorithms.rolling import RollingHorizonPlanner
+from src.models.delivery import Delivery
+from src.models.drone import Drone
+from src.models.noflyzone import NoFlyZone
+
+WALL = [(40, -10), (60, -10), (60, 10), (40, 10)]  # Between the drone and delivery 1
+
+
+def test_zone_boundaries_start_slots_while_deliveries_are_open():
+    deliveries = [Delivery(1, (100.0, 0.0), 1.0, 3, (0, 100))]
+    zones = [NoFlyZone(1, WALL, (30, 60)), NoFlyZone(2, WALL, (150, 160))]
+    planner = RollingHorizonPlanner([Drone(1, 5.0, 10000, 10.0, (0.0, 0.0))], deliveries, zones)
+    assert planner.slot_times() == [0, 30, 61]
+
+
+def test_delivery_blocked_by_a_zone_is_planned_once_it_expires():
+    drones = [Drone(1, 5.0, 10000, 10.0, (0.0, 0.0))]
+    deliveries = [Delivery(1, (100.0, 0.0), 1.0, 3, (0, 100))]
+    planner = RollingHorizonPlanner(drones, deliveries, [NoFlyZone(1, WALL, (0, 40))], seed=1,
+                                    generations=3, population_size=4)
+    assert planner.run() == [(1, 1)]
+    assert [slot["time"] for slot in planner.slots if slot["assignments"]] == [41]
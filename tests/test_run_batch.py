@@ -0,0 +1,47 @@
+# tests/test_run_batch.py
+
+import json
+from run_batch import build_parser, content_hash, discover, run_scenario
+
+
+def scenario(**settings):
+    base = {"method": "ga", "engine": "python", "current_time": 30, "generations": 30, "population": 10,
+            "seed": 1, "files": None, "generate": {"n_drones": 3, "n_deliveries": 10, "seed": 1}}
+    return {**base, **settings}
+
+
+def test_current_time_is_hashed_in_minutes():
+    assert content_hash(scenario(current_time="00:30")) == content_hash(scenario(current_time=30))
+    assert content_hash(scenario(current_time="00:31")) != content_hash(scenario(current_time=30))
+
+
+def test_only_settings_used_by_the_method_are_hashed():
+    assignment = scenario(method="assignment")
+    assert content_hash(assignment) == content_hash({**assignment, "engine": "numpy", "seed": 7, "generations": 5})
+    assert content_hash(assignment) != content_hash({**assignment, "current_time": 90})
+
+    rolling = scenario(method="rolling")
+    assert content_hash(rolling) == content_hash({**rolling, "current_time": 90})
+    assert content_hash(rolling) != content_hash({**rolling, "seed": 2})
+
+    assert content_hash(scenario()) != content_hash(scenario(engine="numpy"))
+    assert content_hash(scenario()) != content_hash(assignment)
+
+
+def test_time_option_accepts_minutes_and_clock_times():
+    parser = build_parser()
+    assert parser.parse_args(["scenarios", "--time", "90"]).current_time == 90
+    assert parser.parse_args(["scenarios", "--time", "01:30"]).current_time == 90
+    assert parser.parse_args(["scenarios"]).current_time == 30
+
+
+def test_manifest_time_given_as_a_digit_string(tmp_path):
+    generate = {"n_drones": 3, "n_deliveries": 10, "seed": 1}
+    manifest = tmp_path / "manifest.jsonl"
+    manifest.write_text("".join(json.dumps({"name": name, "generate": generate, "current_time": value}) + "\n"
+                                for name, value in (("text", "90"), ("minutes", 90), ("clock", "01:30"))),
+                        encoding="utf-8")
+    defaults = vars(build_parser().parse_args([str(manifest), "--generations", "2", "--population", "4"]))
+    text, minutes, clock = discover(str(manifest), defaults)
+    assert text["hash"] == minutes["hash"] == clock["hash"]
+    assert run_scenario(text)["status"] == "ok"
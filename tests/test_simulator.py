@@ -0,0 +1,101 @@
+# tests/test_simulator.py
+
+import pytest
+from src.algorithms.astar import AStar
+from src.algorithms.simulator import FleetSimulator
+from src.models.delivery import Delivery
+from src.models.drone import Drone
+from src.models.noflyzone import NoFlyZone
+from src.utils.graph_builder import ImplicitCompleteGraph, build_positions
+
+MAH = FleetSimulator.mAh_per_meter
+WALL = [(290, -10), (310, -10), (310, 10), (290, 10)]  # Across the path to delivery 1
+
+
+def drones():
+    # 10 m/s is 600 m per minute
+    return [Drone(1, 5.0, 100000, 10.0, (0.0, 0.0)), Drone(2, 5.0, 100000, 10.0, (0.0, 0.0))]
+
+
+def deliveries():
+    return [
+        Delivery(1, (600.0, 0.0), 1.0, 3, (0, 100)),
+        Delivery(2, (600.0, 1200.0), 1.0, 3, (10, 20)),   # Reached at 3, waits until 10
+        Delivery(3, (600.0, 1800.0), 1.0, 3, (0, 5)),     # Reached at 11, 6 minutes late
+    ]
+
+
+def test_kpis_of_a_fixed_plan():
+    sim = FleetSimulator(drones(), deliveries(), [], start_time=0)
+    sim.add_plan([(1, 1), (1, 2), (1, 3)])
+    kpis = sim.run()
+
+    assert [(minute, event, delivery_id) for minute, event, _, delivery_id in sim.log] == [
+        (0, "depart", 1), (1, "deliver", 1), (1, "depart", 2),
+        (10, "deliver", 2), (10, "depart", 3), (11, "deliver", 3)]
+    assert (kpis["delivered"], kpis["on_time"], kpis["late"], kpis["unserved"]) == (3, 2, 1, 0)
+    assert kpis["mean_lateness"] == pytest.approx(6) and kpis["waiting_minutes"] == pytest.approx(7)
+    assert kpis["distance_m"] == pytest.approx(2400) and kpis["energy_mAh"] == pytest.approx(2400 * MAH)
+    assert kpis["simulated_minutes"] == pytest.approx(11)
+    assert kpis["utilization"] == pytest.approx(0.5)  # Drone 1 busy all the time, drone 2 idle
+    assert kpis["on_time_rate"] == pytest.approx(2 / 3)
+    assert kpis["battery_failures"] == kpis["zone_conflicts"] == kpis["duplicate_assignments"] == 0
+
+
+def test_same_minute_events_run_in_scheduling_order():
+    sim = FleetSimulator(drones(), deliveries()[:1] + [Delivery(4, (0.0, 600.0), 1.0, 3, (0, 100))], [])
+    sim.add_plan([(2, 4), (1, 1), (1, 4)])
+    kpis = sim.run()
+    assert [(minute, event, drone_id) for minute, event, drone_id, _ in sim.log] == [
+        (0, "depart", 2), (0, "depart", 1), (1, "deliver", 2), (1, "deliver", 1)]
+    assert kpis["duplicate_assignments"] == 1
+
+
+@pytest.mark.parametrize("active_time, conflicts", [((5, 20), 1), ((0, 4), 0)])
+def test_zone_switches_run_before_departures_at_the_same_minute(active_time, conflicts):
+    sim = FleetSimulator(drones(), deliveries()[:1], [NoFlyZone(1, WALL, active_time)])
+    sim.add_plan([(1, 1)], depart=5)
+    assert sim.run()["zone_conflicts"] == conflicts
+    assert sim.log[-1][1] == "deliver"  # A conflict is counted, the flight still completes
+
+
+@pytest.mark.parametrize("active_time, conflicts", [((3, 20), 1), ((6, 20), 0)])
+def test_zone_switching_on_ahead_of_an_airborne_drone(active_time, conflicts):
+    # The wall at x = 3000 is passed 5 minutes after departure
+    wall = [(x + 2700, y) for x, y in WALL]
+    sim = FleetSimulator(drones(), [Delivery(5, (6000.0, 0.0), 1.0, 3, (0, 100))], [NoFlyZone(1, wall, active_time)])
+    sim.add_plan([(1, 5)])
+    assert sim.run()["zone_conflicts"] == conflicts
+
+
+def test_battery_runs_out_mid_leg():
+    fleet = drones()
+    fleet[0].remaining_battery = 300 * MAH  # Half of the 600 m leg
+    sim = FleetSimulator(fleet, deliveries(), [])
+    sim.add_plan([(1, 1), (1, 2)])
+    kpis = sim.run()
+
+    assert sim.log == [(0, "depart", 1, 1), (0.5, "depleted", 1, 1)]
+    drone = sim.drone_by_id[1]
+    assert drone.current_pos == pytest.approx((300.0, 0.0)) and drone.remaining_battery == 0 and not drone.active
+    assert sim.delivery_by_id[1].assigned_drone_id is None
+    assert (kpis["battery_failures"], kpis["delivered"], kpis["unserved"]) == (1, 0, 3)
+    assert kpis["distance_m"] == pytest.approx(300) and kpis["energy_mAh"] == pytest.approx(300 * MAH)
+
+
+def test_callers_objects_graph_and_positions_are_not_modified():
+    fleet, orders = drones(), deliveries()
+    positions = build_positions(fleet, orders[:2])
+    graph = ImplicitCompleteGraph(positions)
+    astar = AStar(graph, positions)
+    nodes = list(graph.node_ids)
+
+    sim = FleetSimulator(fleet, orders[:2], [], astar=astar)
+    sim.add_plan([(1, 1)])
+    sim.add_delivery(orders[2], release_time=2, drone_id=2)
+    kpis = sim.run()
+
+    assert kpis["delivered"] == 2 and kpis["orders"] == 1
+    assert graph.node_ids == nodes and "D83" not in positions and "D83" in sim.astar.positions
+    assert fleet[0].current_pos == (0.0, 0.0) and fleet[0].remaining_battery == 100000
+    assert not any(delivery.delivered for delivery in orders)
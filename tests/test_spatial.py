@@ -0,0 +1,47 @@
+# tests/test_spatial.py
+
+import numpy as np
+import pytest
+from shapely.geometry import LineString, Polygon
+from src.models.noflyzone import NoFlyZone
+from src.utils.generator import generate_random_scenario
+from src.utils.spatial import NoFlyZoneIndex
+
+
+def per_pair(zones, start, end, current_time):
+    """
+    The original check: every zone's polygon against the segment, for zones active at current_time.
+    """
+    line = LineString([start, end])
+    return any(zone.active_time[0] <= current_time <= zone.active_time[1] and line.intersects(Polygon(zone.coordinates))
+               for zone in zones)
+
+
+@pytest.mark.parametrize("current_time", [0, 60, 150, 239])
+def test_intersects_many_matches_per_pair_check(current_time):
+    _, _, zones = generate_random_scenario(1, 20, 12, seed=4)
+    assert any(not zone.active_time[0] <= current_time <= zone.active_time[1] for zone in zones)
+    index = NoFlyZoneIndex(zones)
+    rng = np.random.default_rng(current_time)
+    starts, ends = rng.uniform(0, 100, size=(400, 2)), rng.uniform(0, 100, size=(400, 2))
+
+    expected = [per_pair(zones, tuple(a), tuple(b), current_time) for a, b in zip(starts, ends)]
+    assert index.intersects_many(starts, ends, current_time).tolist() == expected
+    assert [index.intersects(tuple(a), tuple(b), current_time) for a, b in zip(starts[:50], ends[:50])] == expected[:50]
+
+
+def test_inactive_zones_do_not_block():
+    index = NoFlyZoneIndex([NoFlyZone(1, [(40, -10), (60, -10), (60, 10), (40, 10)], (30, 60))])
+    segment = ([(0, 0)], [(100, 0)])
+    assert index.intersects_many(*segment, 29).tolist() == [False]
+    assert index.intersects_many(*segment, 30).tolist() == [True]
+    assert index.intersects_many(*segment, 60).tolist() == [True]
+    assert index.intersects_many(*segment, 61).tolist() == [False]
+    assert index.intersects_many(*segment, None).tolist() == [True]
+    assert index.segment_zones(*segment) == [(0,)]
+
+
+def test_empty_index():
+    index = NoFlyZoneIndex([])
+    assert index.intersects_many([(0, 0)], [(1, 1)], 0).tolist() == [False]
+    assert not index.intersects((0, 0), (1, 1), 0)
@@ -0,0 +1,76 @@
+# tests/test_vrp.py
+
+import copy
+import math
+import pytest
+from src.algorithms.vrp import VRPOptimizer
+from src.utils.generator import generate_random_scenario
+
+
+def vrp(seed=3, n_drones=6, n_deliveries=60, n_zones=3, current_time=60):
+    drones, deliveries, zones = generate_random_scenario(n_drones, n_deliveries, n_zones, seed=seed)
+    return VRPOptimizer(drones, deliveries, zones, current_time, seed=seed)
+
+
+def assert_feasible(opt, tours):
+    zone_index = opt.csp.zone_index
+    for tour in tours:
+        drone = opt.drones[tour.row]
+        nodes = [drone.start_pos] + [opt.deliveries[j].pos for j in tour.stops] + [drone.start_pos]
+        distance = sum(math.dist(a, b) for a, b in zip(nodes, nodes[1:]))
+        assert sum(opt.deliveries[j].weight for j in tour.stops) <= drone.max_weight - drone.carrying_weight + 1e-9
+        assert distance * opt.mAh_per_meter <= drone.remaining_battery + 1e-6
+        assert not any(zone_index.intersects(a, b, opt.current_time) for a, b in zip(nodes, nodes[1:]))
+
+        now = opt.current_time
+        for j, a, b in zip(tour.stops, nodes, nodes[1:]):
+            start, end = opt.deliveries[j].time_window
+            arrival = now + math.dist(a, b) / (drone.speed * 60)
+            assert arrival <= end + 1e-6
+            now = max(arrival, start)
+
+
+def assert_caches_match(opt, tours):
+    for tour in tours:
+        fresh = copy.deepcopy(tour)
+        opt.recompute(fresh)
+        assert tour.distance == pytest.approx(fresh.distance)
+        assert tour.load == pytest.approx(fresh.load) and tour.reward == pytest.approx(fresh.reward)
+        for cached, exact in ((tour.arrival, fresh.arrival), (tour.service, fresh.service), (tour.slack, fresh.slack)):
+            assert cached == pytest.approx(exact)
+
+
+@pytest.mark.parametrize("seed", [1, 3, 8])
+def test_tours_stay_feasible_and_the_objective_never_drops(seed):
+    opt = vrp(seed=seed)
+    tours, unassigned = opt.construct()
+    assert any(tour.stops for tour in tours)
+    assert_feasible(opt, tours)
+    start = opt.objective(tours)
+
+    value = start
+    for _ in range(10):
+        tours, unassigned = opt.improve(tours, unassigned, 30)
+        assert opt.value == pytest.approx(opt.objective(tours))
+        assert opt.value >= value - 1e-6
+        value = opt.value
+        assert_feasible(opt, tours)
+        assert_caches_match(opt, tours)
+
+    served = [j for tour in tours for j in tour.stops]
+    assert len(served) == len(set(served)) and not set(served) & set(unassigned)
+
+
+def test_every_stop_is_served_once_by_an_allowed_drone():
+    opt = vrp(seed=5)
+    routes = opt.run(iterations=200)
+    pairs = VRPOptimizer.to_assignments(routes)
+    delivery_ids = [delivery_id for _, delivery_id in pairs]
+    assert len(delivery_ids) == len(set(delivery_ids))
+    for tour in opt.tours:
+        assert set(tour.stops) <= opt._allowed[tour.row]
+    assert_feasible(opt, opt.tours)
+
+
+def test_seeded_runs_are_deterministic():
+    assert vrp(seed=4).run(iterations=100) == vrp(seed=4).run(iterations=100)